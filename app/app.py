@@ -2,49 +2,137 @@ from datetime import timedelta
 
 from flask import Flask
 
+from app.articles.config import ArticleSettings
 from app.articles.dao import ArticleDAO
 from app.articles.services import ArticleService
+from app.auth.cache import VerifiedTokenCache
 from app.auth.config import AuthSettings
+from app.auth.dao import RevokedTokenDAO
 from app.auth.jwt import JwtManager
+from app.auth.revocation import RevocationStore
 from app.auth.services import AuthService
+from app.auth.throttle import LoginThrottle, SharedTokenBuckets
 from app.auth.swagger.securityschema import SECURITY_SCHEMA
+from app.base.cache import MemoryResponseCache, RedisResponseCache, ResponseCache
+from app.base.version import ChangeVersion, CompositeVersion
 from app.db.config import DbSettings
 from app.config import ENV_FILE_PATH
 from app.db.database import Database
+from app.rbac import RBAC_CHANGES_CHANNEL
 from app.rbac.dao.role import RoleDAO
 from app.rbac.rbac import RoleBasedAccessController
 from app.rbac.services.permission import PermissionService
 from app.rbac.services.role import RoleService
 from app.rbac.dao.permission import PermissionDAO
+from app.users import USERS_CHANGES_CHANNEL
+from app.users.config import PwdSettings
 from app.users.dao import UserDAO
+from app.users.pwd import PwdHasher, PwdManagerMixin
 from app.users.services import UserService
 
 
 db_settings = DbSettings(_env_file=ENV_FILE_PATH)
 db = Database(db_settings)
 
+rbac_version = ChangeVersion()
+users_version = ChangeVersion()
+
 permission_dao = PermissionDAO(db.session_factory)
-permission_service = PermissionService(permission_dao)
+permission_service = PermissionService(permission_dao, rbac_version)
 
 role_dao = RoleDAO(db.session_factory)
 role_service = RoleService(
     role_dao=role_dao,
     perm_dao=permission_dao,
     base_roles={"viewer", "editor", "admin"},
+    rbac_version=rbac_version,
     default_role="viewer",
+    build_json_in_db=db_settings.DB_BUILD_JSON,
 )
 
+pwd_settings = PwdSettings(_env_file=ENV_FILE_PATH)
+PwdManagerMixin.pwd_hasher = PwdHasher.from_settings(pwd_settings)
+
 users_dao = UserDAO(db.session_factory)
-user_service = UserService(users_dao, role_service)
+user_service = UserService(users_dao, role_service, users_version)
+
+article_settings = ArticleSettings(_env_file=ENV_FILE_PATH)
+articles_cache: ResponseCache | None = None
+
+if article_settings.ARTICLES_CACHE_REDIS_URL:
+    articles_cache = RedisResponseCache(
+        article_settings.ARTICLES_CACHE_REDIS_URL, article_settings.ARTICLES_CACHE_TTL
+    )
+elif article_settings.ARTICLES_CACHE_BYTES:
+    articles_cache = MemoryResponseCache(
+        article_settings.ARTICLES_CACHE_BYTES, article_settings.ARTICLES_CACHE_TTL
+    )
 
 articles_dao = ArticleDAO(db.session_factory)
-articles_service = ArticleService(articles_dao)
+articles_service = ArticleService(
+    articles_dao, db_settings.DB_BUILD_JSON, cache=articles_cache
+)
 
 auth_settings = AuthSettings(_env_file=ENV_FILE_PATH)
-auth_jwt_manager = JwtManager("HS256", auth_settings.AUTH_SECRET, timedelta(days=1))
-auth_service = AuthService(auth_jwt_manager, user_service)
+auth_jwt_manager = JwtManager(
+    "HS256",
+    auth_settings.AUTH_SECRET,
+    timedelta(minutes=auth_settings.AUTH_ACCESS_TOKEN_MINUTES),
+    cache=(
+        VerifiedTokenCache(auth_settings.AUTH_TOKEN_CACHE_SIZE)
+        if auth_settings.AUTH_TOKEN_CACHE_SIZE
+        else None
+    ),
+)
+revocations = RevocationStore(
+    RevokedTokenDAO(db.session_factory), auth_settings.AUTH_REVOCATION_FILTER_SIZE
+)
+auth_service = AuthService(
+    auth_jwt_manager,
+    user_service,
+    claims_version=(
+        CompositeVersion(rbac_version, users_version)
+        if auth_settings.AUTH_EMBED_CLAIMS
+        else None
+    ),
+    revocations=revocations,
+    refresh_exp_delta=timedelta(days=auth_settings.AUTH_REFRESH_TOKEN_DAYS),
+    login_throttle=LoginThrottle(
+        SharedTokenBuckets(
+            auth_settings.AUTH_LOGIN_THROTTLE_SLOTS,
+            auth_settings.AUTH_LOGIN_THROTTLE_FILE,
+        ),
+        email_attempts=auth_settings.AUTH_LOGIN_EMAIL_ATTEMPTS,
+        ip_attempts=auth_settings.AUTH_LOGIN_IP_ATTEMPTS,
+        window=auth_settings.AUTH_LOGIN_ATTEMPTS_WINDOW,
+    ),
+)
 
-rbac = RoleBasedAccessController(auth_service, user_service)
+rbac = RoleBasedAccessController(auth_service, role_service, rbac_version)
+
+
+def follow_changes(version: ChangeVersion):
+    """
+    Notification handler moving the version to the one of a change committed anywhere.
+    Without a payload (after connecting) it loads the latest version instead.
+    """
+
+    def handler(payload: str | None) -> None:
+        version.advance_to(int(payload) if payload else role_dao.get_change_version())
+
+    return handler
+
+
+# Changes committed by other workers invalidate the caches of this one
+db_listener = db.create_listener()
+db_listener.subscribe(RBAC_CHANGES_CHANNEL, follow_changes(rbac_version))
+db_listener.subscribe(USERS_CHANGES_CHANNEL, follow_changes(users_version))
+db_listener.subscribe(RevocationStore.channel, revocations.handle_notification)
+
+if isinstance(articles_cache, MemoryResponseCache):
+    db_listener.subscribe(
+        ArticleService.cache_channel, articles_cache.handle_notification
+    )
 
 
 def create_app():
@@ -56,6 +144,9 @@ def create_app():
 
     CORS(app)
 
+    db.init_app(app)
+    db_listener.start()
+
     from app.users.routes import router as users_router
     from app.auth.routes import router as auth_router
     from app.articles.routes import router as articles_router
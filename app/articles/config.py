@@ -0,0 +1,17 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ArticleSettings(BaseSettings):
+    """Config data for articles."""
+
+    model_config = SettingsConfigDict(
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    # Max total size of the encoded articles cached per worker, 0 disables the cache
+    ARTICLES_CACHE_BYTES: int = 32 * 1024 * 1024
+    # Seconds a cached response may be served, bounds staleness after racing writes
+    ARTICLES_CACHE_TTL: int = 300
+    # Share the cache between workers in Redis instead, e.g. redis://localhost:6379/0
+    ARTICLES_CACHE_REDIS_URL: str | None = None
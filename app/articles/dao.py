@@ -1,8 +1,13 @@
-from typing import Sequence
-from sqlalchemy import or_, select
+from datetime import datetime
+from typing import Iterator, Sequence
+
+from sqlalchemy import cast, func, literal, or_, select
+from pydantic import BaseModel
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, REGCONFIG
 
 from app.db.dao import BaseDAO
-from .models import Article
+from app.db.pagination import JsonPage, Page
+from .models import SEARCH_CONFIG, Article
 
 
 class ArticleDAO(BaseDAO[Article]):
@@ -11,23 +16,95 @@ class ArticleDAO(BaseDAO[Article]):
     """
 
     model = Article
+    page_keys = ("created_at", "id")
+    page_descending = True
+
+    def get_by_owner_id(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: str | None = None,
+        projection: type[BaseModel] | None = None,
+    ) -> Page[Article]:
+        """Retrieves a page of articles written by a specific user, newest first."""
+
+        query = self._select(projection).where(Article.owner_id == user_id)
+
+        return self._paginate(query, limit, cursor)
+
+    def get_by_owner_id_json(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: str | None,
+        projection: type[BaseModel],
+    ) -> JsonPage:
+        """Retrieves a page of articles of a user encoded as JSON by the database."""
+
+        query = self._select_json(projection).where(Article.owner_id == user_id)
+
+        return self._paginate_json(query, limit, cursor)
 
-    def get_by_owner_id(self, user_id: int) -> Sequence[Article]:
-        """Retrieves all articles written by a specific user."""
+    def search_full_text(
+        self,
+        query: str,
+        limit: int,
+        cursor: str | None = None,
+        projection: type[BaseModel] | None = None,
+    ) -> Page[Article]:
+        """
+        Search for articles by words in title or body, best matches first.
+        Title matches are ranked above body matches. The query supports web search syntax:
+        quoted phrases, `or` and `-word` exclusions.
+        """
 
-        query = select(Article).where(Article.owner_id == user_id)
+        ts_query = func.websearch_to_tsquery(literal(SEARCH_CONFIG, REGCONFIG), query)
+        # float8 so the rank survives the round trip through the cursor unchanged
+        rank = cast(func.ts_rank(Article.search_vector, ts_query), DOUBLE_PRECISION)
+        matches = Article.search_vector.bool_op("@@")(ts_query)
 
-        with self._sf() as session:
-            return session.scalars(query).all()
+        search_query = self._select(projection).where(matches)
 
-    def search_by_title_or_body(self, query: str) -> Sequence[Article]:
-        """Search for articles by a partial match in title or body."""
+        return self._paginate(search_query, limit, cursor, keys=[rank, Article.id])
 
-        search_query = select(Article).where(
+    def search_by_title_or_body(
+        self,
+        query: str,
+        limit: int,
+        cursor: str | None = None,
+        projection: type[BaseModel] | None = None,
+    ) -> Page[Article]:
+        """Search for articles by a partial match in title or body, newest first."""
+
+        search_query = self._select(projection).where(
             or_(
                 Article.title.ilike(f"%{query}%"),
                 Article.body.ilike(f"%{query}%"),
             )
         )
-        with self._sf() as session:
-            return session.scalars(search_query).all()
+
+        return self._paginate(search_query, limit, cursor)
+
+    def stream_filtered(
+        self,
+        owner_id: int | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        chunk_size: int = 1000,
+        projection: type[BaseModel] | None = None,
+    ) -> Iterator[Sequence[Article]]:
+        """
+        Like `stream`, only the articles of the owner created in [created_from, created_to)
+        when these are given.
+        """
+
+        query = self._select(projection)
+
+        if owner_id is not None:
+            query = query.where(Article.owner_id == owner_id)
+        if created_from is not None:
+            query = query.where(Article.created_at >= created_from)
+        if created_to is not None:
+            query = query.where(Article.created_at < created_to)
+
+        return self._stream(query, chunk_size)
@@ -1,6 +1,10 @@
+from enum import StrEnum
+
 from pydantic import BaseModel, ConfigDict, Field, RootModel
 from datetime import datetime
 
+from app.base.dto import ExportParamsDTO, PageDTO, PageParamsDTO
+
 
 class ArticleCreateDTO(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -17,4 +21,45 @@ class ArticleReadDTO(ArticleCreateDTO):
     created_at: datetime
 
 
-ArticlesListReadDTO = RootModel[list[ArticleReadDTO]]
+ArticlesPageReadDTO = PageDTO[ArticleReadDTO]
+
+ArticlesCreateListDTO = RootModel[list[ArticleCreateDTO]]
+
+ArticleUpdatesDTO = RootModel[dict[int, ArticleCreateDTO]]
+
+
+class ArticleImportParamsDTO(BaseModel):
+    """
+    Data Transfer Object (DTO) for article import query parameters.
+    Without `atomic` each batch is committed on its own, so a failed import
+    keeps the batches loaded before the failure.
+    """
+
+    batch_size: int = Field(default=1000, ge=1, le=10000)
+    atomic: bool = True
+
+
+class ArticleExportParamsDTO(ExportParamsDTO):
+    """
+    Data Transfer Object (DTO) for article export query parameters.
+    Only articles of `owner_id` created in [`created_from`, `created_to`) are exported
+    when these are given.
+    """
+
+    owner_id: int | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
+class ArticleSearchMode(StrEnum):
+    FULL_TEXT = "fulltext"
+    SUBSTRING = "substring"
+
+
+class ArticleSearchParamsDTO(PageParamsDTO):
+    """
+    Data Transfer Object (DTO) for article search query parameters.
+    `substring` mode keeps the plain partial match over title and body.
+    """
+
+    mode: ArticleSearchMode = ArticleSearchMode.FULL_TEXT
@@ -1,4 +1,5 @@
-from sqlalchemy import String, Text, DateTime, ForeignKey
+from sqlalchemy import Computed, Index, String, Text, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, relationship
 from sqlalchemy.orm import mapped_column as mc
 from sqlalchemy.sql import func
@@ -6,8 +7,25 @@ from sqlalchemy.sql import func
 from app.db.base import Base
 
 
+SEARCH_CONFIG = "english"
+
+_SEARCH_VECTOR_EXPR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', body), 'B')"
+)
+
+
 class Article(Base):
     __tablename__ = "articles"
+    __table_args__ = (
+        Index("ix_articles_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_articles_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mc(primary_key=True, autoincrement=True)
     title: Mapped[str] = mc(String(length=255), nullable=False)
@@ -15,7 +33,16 @@ class Article(Base):
     created_at: Mapped[DateTime] = mc(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    updated_at: Mapped[DateTime] = mc(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
     owner_id: Mapped[int] = mc(ForeignKey("users.id"), nullable=False)
+    search_vector: Mapped[str] = mc(
+        TSVECTOR, Computed(_SEARCH_VECTOR_EXPR, persisted=True), deferred=True
+    )
 
     owner: Mapped["User"] = relationship("User", back_populates="articles")  # type: ignore
 
@@ -24,3 +51,13 @@ class Article(Base):
 
     def __repr__(self) -> str:
         return f"Article(id={self.id}, title={repr(self.title)}, created_at={repr(self.created_at)})"
+
+
+# Match the keyset pagination order of ArticleDAO: (created_at, id) descending
+Index(
+    "ix_articles_owner_id_created_at_id",
+    Article.owner_id,
+    Article.created_at.desc(),
+    Article.id.desc(),
+)
+Index("ix_articles_created_at_id", Article.created_at.desc(), Article.id.desc())
@@ -1,13 +1,25 @@
-from flask import Blueprint, jsonify, request
+import io
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from flasgger import swag_from
 
+from app.articles.dto import (
+    ArticleExportParamsDTO,
+    ArticleImportParamsDTO,
+    ArticleReadDTO,
+)
 from app.articles.exceptions import ArticleNotFound
 from app.articles.swagger import docs
 from app.app import rbac
-from app.app import articles_service
+from app.app import articles_service, auth_service, db
 from app.articles.permissions import user_is_article_owner
 from app.users.dto import UserReadDTO
-from app.base.response import DtoResponse
+from app.base.representation import Representation
+from app.base.response import (
+    DtoResponse,
+    ExportStreamResponse,
+    conditional_response,
+)
 
 
 router = Blueprint("articles", __name__)
@@ -22,28 +34,39 @@ def handle_article_not_found(e: ArticleNotFound):
 @swag_from(docs.GET_ARTICLES_LIST)
 def get_all_articles():
     search_query = request.args.get("query", None)
+    page_params = request.args.to_dict()
 
     if search_query:
-        articles = articles_service.search_articles(search_query)
+        articles = articles_service.search_articles(search_query, page_params)
     else:
-        articles = articles_service.get_all_articles()
+        articles = articles_service.get_all_articles(page_params)
 
-    return DtoResponse(articles, status=200)
+    return conditional_response(Representation.of_content(articles))
 
 
 @router.get("/users/<int:user_id>/articles")
 @swag_from(docs.GET_USER_ARTICLES)
 def get_user_articles(user_id: int):
-    articles = articles_service.get_user_articles(user_id)
-    return DtoResponse(articles, status=200)
+    articles = articles_service.get_user_articles(user_id, request.args.to_dict())
+    return conditional_response(Representation.of_content(articles))
+
+
+@router.get("/articles/export")
+@rbac.permission_required("articles.can_read")
+@swag_from(docs.GET_ARTICLES_EXPORT)
+def export_articles():
+    params = ArticleExportParamsDTO(**request.args.to_dict())
+    articles = articles_service.export_articles(params)
+
+    return ExportStreamResponse(ArticleReadDTO, articles, params.format, "articles")
 
 
 @router.get("/articles/<int:article_id>")
 @swag_from(docs.GET_ARTICLE)
 def get_article(article_id: int):
-    article = articles_service.get_article_by_id(article_id)
+    article = articles_service.get_article(article_id)
 
-    return DtoResponse(article, status=200)
+    return conditional_response(article)
 
 
 @router.post("/articles")
@@ -54,6 +77,31 @@ def create_article(current_user: UserReadDTO):
     return DtoResponse(created_article, status=201)
 
 
+@router.post("/articles:bulk")
+@rbac.permission_required("articles.can_create")
+@swag_from(docs.POST_ARTICLES_BULK)
+def import_articles():
+    params = ArticleImportParamsDTO(**request.args.to_dict())
+    current_user = auth_service.get_current_user()
+    # The raw stream reads lines byte by byte, a buffer reads them in blocks
+    lines = io.BufferedReader(request.stream, 64 * 1024)
+
+    def import_stream():
+        # The request unit of work commits before the body is sent,
+        # so the import is committed by its own
+        with db.unit_of_work() as uow:
+            yield from articles_service.import_articles(
+                current_user,
+                lines,
+                params.batch_size,
+                on_batch=None if params.atomic else uow.commit,
+            )
+
+    return Response(
+        stream_with_context(import_stream()), mimetype="application/x-ndjson"
+    )
+
+
 @router.delete("/articles/<int:article_id>")
 @rbac.permission_required("articles.can_delete", unless=user_is_article_owner)
 @swag_from(docs.DELETE_ARTICLE)
@@ -1,29 +1,102 @@
+from typing import Callable, Iterable, Iterator, Sequence
+
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+
 from app.articles.dao import ArticleDAO
-from app.articles.dto import ArticleCreateDTO, ArticlesListReadDTO, ArticleReadDTO
+from app.articles.dto import (
+    ArticleCreateDTO,
+    ArticleExportParamsDTO,
+    ArticleReadDTO,
+    ArticleSearchMode,
+    ArticleSearchParamsDTO,
+    ArticleUpdatesDTO,
+    ArticlesCreateListDTO,
+    ArticlesPageReadDTO,
+)
 from app.articles.exceptions import ArticleNotFound
+from app.base.cache import ResponseCache
+from app.base.dto import PageParamsDTO
+from app.base.representation import Representation
+from app.base.serialization import dump_trusted
 from app.users.dto import UserReadDTO
 
 
 class ArticleService:
-    """Service class for handling article-related operations."""
+    """
+    Service class for handling article-related operations.
+    With `build_json_in_db` the hottest list endpoints are encoded by the database.
+
+    With a `cache` the encoded single articles and pages of user articles are kept
+    until a write to the article or to the articles of its owner commits.
+    The invalidated keys are also announced on `cache_channel` for the caches
+    of other workers.
+    """
 
-    def __init__(self, article_dao: ArticleDAO) -> None:
+    cache_channel: str = "articles_cache"
+
+    def __init__(
+        self,
+        article_dao: ArticleDAO,
+        build_json_in_db: bool = False,
+        cache: ResponseCache | None = None,
+    ) -> None:
         self._dao = article_dao
+        self._build_json_in_db = build_json_in_db
+        self._cache = cache
+
+    def get_all_articles(self, page_params: dict) -> bytes:
+        page = PageParamsDTO(**page_params)
 
-    def get_all_articles(self) -> ArticlesListReadDTO:
-        articles = self._dao.get_all()
-        return ArticlesListReadDTO(articles)
+        if self._build_json_in_db:
+            json_page = self._dao.get_page_json(page.limit, page.cursor, ArticleReadDTO)
+            return json_page.to_json()
 
-    def get_user_articles(self, user_id: int) -> ArticlesListReadDTO:
-        user_articles = self._dao.get_by_owner_id(user_id)
+        articles = self._dao.get_page(page.limit, page.cursor, ArticleReadDTO)
 
-        return ArticlesListReadDTO(user_articles)
+        return dump_trusted(ArticlesPageReadDTO, articles)
+
+    def get_user_articles(self, user_id: int, page_params: dict) -> bytes:
+        page = PageParamsDTO(**page_params)
+
+        return self._cached(
+            self._owner_key(user_id),
+            f"{page.limit}:{page.cursor or ''}",
+            lambda: self._encode_user_articles(user_id, page),
+        )
 
     def get_article_by_id(self, article_id: int) -> ArticleReadDTO:
         article = self._get_or_raise(article_id)
 
         return ArticleReadDTO.model_validate(article)
 
+    def get_article(self, article_id: int) -> Representation:
+        """
+        Get the article to send, from the cache when it is there.
+        It is encoded (and cached) only when it is sent, not for unchanged ones.
+        """
+
+        key = self._article_key(article_id)
+
+        if self._cache is not None:
+            cached = self._cache.get(key)
+
+            if cached is not None:
+                return Representation.unpack(cached)
+
+        article = self._get_or_raise(article_id)
+
+        def encode() -> bytes:
+            body = dump_trusted(ArticleReadDTO, article)
+
+            if self._cache is not None:
+                encoded = Representation.of_record(article, lambda: body)
+                self._cache.set(key, encoded.pack())
+
+            return body
+
+        return Representation.of_record(article, encode)
+
     def create_article(
         self, creator: UserReadDTO, article_data: dict
     ) -> ArticleReadDTO:
@@ -32,27 +105,152 @@ class ArticleService:
         article_dict = validated_article.model_dump()
         article_dict["owner_id"] = creator.id
 
-        created_article = self._dao.create(**article_dict)
+        created_article = self._dao.create(ArticleReadDTO, **article_dict)
+        self._invalidate(created_article)
 
         return ArticleReadDTO.model_validate(created_article)
 
-    def search_articles(self, query: str) -> ArticlesListReadDTO:
-        found_articles = self._dao.search_by_title_or_body(query)
+    def create_articles(
+        self, creator: UserReadDTO, articles_data: list[dict]
+    ) -> list[ArticleReadDTO]:
+        """Create the articles in batches, after validating all of them."""
+        validated_articles = ArticlesCreateListDTO(articles_data).root
 
-        return ArticlesListReadDTO.model_validate(found_articles)
+        rows = [
+            {**article.model_dump(), "owner_id": creator.id}
+            for article in validated_articles
+        ]
+        created_articles = self._dao.bulk_create(rows, ArticleReadDTO)
+        self._invalidate(*created_articles)
+
+        return [ArticleReadDTO.model_validate(a) for a in created_articles]
+
+    def import_articles(
+        self,
+        creator: UserReadDTO,
+        lines: Iterable[bytes],
+        batch_size: int = 1000,
+        on_batch: Callable[[], None] | None = None,
+    ) -> Iterator[bytes]:
+        """
+        Import articles from NDJSON lines, validated one line at a time and loaded
+        with COPY in batches, so only one batch is held in memory.
+        Yields an NDJSON line with the errors of each invalid line, which is skipped,
+        and a summary line at the end, also when loading a batch fails and the error
+        is raised. `on_batch` is called after each batch is loaded, e.g. to commit it.
+        """
+        batch = []
+        created = failed = 0
+
+        try:
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+
+                try:
+                    article = ArticleCreateDTO.model_validate_json(line)
+                except ValidationError as e:
+                    failed += 1
+                    errors = e.json(include_url=False, include_input=False)
+                    yield b'{"line":%d,"errors":%s}\n' % (number, errors.encode())
+                    continue
+
+                batch.append((article.title, article.body, creator.id))
+
+                if len(batch) == batch_size:
+                    created += self._load_articles(
+                        creator, batch, on_batch, not created
+                    )
+                    batch = []
+
+            if batch:
+                created += self._load_articles(creator, batch, on_batch, not created)
+        except DBAPIError:
+            # The transaction is rolled back, only committed batches are kept
+            committed = created if on_batch is not None else 0
+            yield b'{"created":%d,"failed":%d,"error":"%s"}\n' % (
+                committed,
+                failed,
+                b"Loading a batch failed, the import was aborted",
+            )
+            raise
+
+        yield b'{"created":%d,"failed":%d}\n' % (created, failed)
+
+    def export_articles(
+        self, export_params: ArticleExportParamsDTO
+    ) -> Iterator[Sequence[ArticleReadDTO]]:
+        """Stream the filtered articles chunk by chunk, to be encoded while they are read."""
+        return self._dao.stream_filtered(
+            export_params.owner_id,
+            export_params.created_from,
+            export_params.created_to,
+            projection=ArticleReadDTO,
+        )
+
+    def search_articles(self, query: str, search_params: dict) -> bytes:
+        params = ArticleSearchParamsDTO(**search_params)
+
+        if params.mode is ArticleSearchMode.SUBSTRING:
+            search = self._dao.search_by_title_or_body
+        else:
+            search = self._dao.search_full_text
+
+        found_articles = search(query, params.limit, params.cursor, ArticleReadDTO)
+
+        return dump_trusted(ArticlesPageReadDTO, found_articles)
 
     def delete_article(self, article_id: int) -> None:
-        self._get_or_raise(article_id)
-        return self._dao.delete(article_id)
+        deleted_article = self._dao.delete(article_id, ArticleReadDTO)
 
-    def update_article(self, article_id: int, update_data: dict) -> ArticleReadDTO:
-        self._get_or_raise(article_id)
+        if deleted_article is None:
+            raise ArticleNotFound
+
+        self._invalidate(deleted_article)
 
+    def update_article(self, article_id: int, update_data: dict) -> ArticleReadDTO:
         validated_article = ArticleCreateDTO(**update_data)
-        updated_article = self._dao.update(article_id, **validated_article.model_dump())
+        updated_article = self._dao.update(
+            article_id, ArticleReadDTO, **validated_article.model_dump()
+        )
+
+        if updated_article is None:
+            raise ArticleNotFound
+
+        self._invalidate(updated_article)
 
         return ArticleReadDTO.model_validate(updated_article)
 
+    def update_articles(self, updates: dict[int, dict]) -> list[ArticleReadDTO]:
+        """
+        Update articles by ID in batches. When any of them does not exist
+        ArticleNotFound is raised, so the transaction doesn't commit a partial update.
+        """
+        validated_updates = ArticleUpdatesDTO(updates).root
+
+        rows = [
+            {"id": article_id, **article.model_dump()}
+            for article_id, article in validated_updates.items()
+        ]
+        updated_articles = self._dao.bulk_update(rows, ArticleReadDTO)
+
+        if len(updated_articles) != len(rows):
+            raise ArticleNotFound
+
+        self._invalidate(*updated_articles)
+
+        return [ArticleReadDTO.model_validate(a) for a in updated_articles]
+
+    def delete_articles(self, article_ids: list[int]) -> None:
+        """Delete articles by ID in batches, raising ArticleNotFound if any is missing."""
+        article_ids = list(dict.fromkeys(article_ids))
+        deleted_articles = self._dao.bulk_delete(article_ids, ArticleReadDTO)
+
+        if len(deleted_articles) != len(article_ids):
+            raise ArticleNotFound
+
+        self._invalidate(*deleted_articles)
+
     def _get_or_raise(self, article_id: int):
         article = self._dao.get_one(article_id)
 
@@ -60,3 +258,72 @@ class ArticleService:
             raise ArticleNotFound
 
         return article
+
+    def _load_articles(
+        self,
+        creator: UserReadDTO,
+        batch: list[tuple],
+        on_batch: Callable[[], None] | None,
+        first: bool,
+    ) -> int:
+        loaded = self._dao.copy(("title", "body", "owner_id"), batch)
+
+        # Within one transaction the owner's pages are invalidated once
+        if first or on_batch is not None:
+            self._invalidate_keys(self._owner_key(creator.id))
+
+        if on_batch is not None:
+            on_batch()
+
+        return loaded
+
+    def _encode_user_articles(self, user_id: int, page: PageParamsDTO) -> bytes:
+        if self._build_json_in_db:
+            json_page = self._dao.get_by_owner_id_json(
+                user_id, page.limit, page.cursor, ArticleReadDTO
+            )
+            return json_page.to_json()
+
+        user_articles = self._dao.get_by_owner_id(
+            user_id, page.limit, page.cursor, ArticleReadDTO
+        )
+
+        return dump_trusted(ArticlesPageReadDTO, user_articles)
+
+    def _cached(self, key: str, variant: str, encode: Callable[[], bytes]) -> bytes:
+        if self._cache is None:
+            return encode()
+
+        cached = self._cache.get(key, variant)
+
+        if cached is None:
+            cached = encode()
+            self._cache.set(key, cached, variant)
+
+        return cached
+
+    def _invalidate(self, *articles) -> None:
+        """Drop the cached responses showing the articles once the write commits."""
+
+        if self._cache is None or not articles:
+            return
+
+        keys = [self._article_key(article.id) for article in articles]
+        keys += dict.fromkeys(self._owner_key(article.owner_id) for article in articles)
+
+        self._invalidate_keys(*keys)
+
+    def _invalidate_keys(self, *keys: str) -> None:
+        if self._cache is None:
+            return
+
+        self._dao.notify(self.cache_channel, " ".join(keys))
+        self._dao.on_commit(lambda: self._cache.delete(*keys))
+
+    @staticmethod
+    def _article_key(article_id: int) -> str:
+        return f"article:{article_id}"
+
+    @staticmethod
+    def _owner_key(owner_id: int) -> str:
+        return f"owner:{owner_id}:articles"
@@ -1,38 +1,69 @@
 GET_ARTICLES_LIST = {
     "tags": ["Articles"],
-    "description": "Get a list of all articles, optionally filtered by a search query.",
+    "description": "Get a page of articles, newest first, optionally filtered by a search query.",
     "parameters": [
         {
             "name": "query",
             "in": "query",
-            "description": "Search query to filter articles by title or body",
+            "description": "Search query to filter articles by title or body. "
+            "In `fulltext` mode results are ranked by relevance and web search syntax "
+            'is supported: `"exact phrase"`, `or`, `-excluded`.',
             "required": False,
             "schema": {"type": "string", "example": "Python"},
-        }
+        },
+        {
+            "name": "mode",
+            "in": "query",
+            "description": "Search mode: `fulltext` (default) or `substring` partial match",
+            "required": False,
+            "schema": {
+                "type": "string",
+                "enum": ["fulltext", "substring"],
+                "example": "fulltext",
+            },
+        },
+        {
+            "name": "limit",
+            "in": "query",
+            "description": "Page size, 20 by default and at most 100",
+            "required": False,
+            "schema": {"type": "integer", "example": 20},
+        },
+        {
+            "name": "cursor",
+            "in": "query",
+            "description": "The `next_cursor` value of the previous page",
+            "required": False,
+            "schema": {"type": "string"},
+        },
     ],
     "responses": {
         "200": {
-            "description": "List of articles",
+            "description": "Page of articles",
             "content": {
                 "application/json": {
-                    "example": [
-                        {
-                            "id": 1,
-                            "title": "Article 1",
-                            "owner_id": 1,
-                            "created_at": "2024-12-01T00:00:00Z",
-                        },
-                        {
-                            "id": 2,
-                            "title": "Article 2",
-                            "owner_id": 2,
-                            "created_at": "2024-12-01T00:00:00Z",
-                        },
-                    ]
+                    "example": {
+                        "items": [
+                            {
+                                "id": 2,
+                                "title": "Article 2",
+                                "owner_id": 2,
+                                "created_at": "2024-12-02T00:00:00Z",
+                            },
+                            {
+                                "id": 1,
+                                "title": "Article 1",
+                                "owner_id": 1,
+                                "created_at": "2024-12-01T00:00:00Z",
+                            },
+                        ],
+                        "next_cursor": "WyIyMDI0LTEyLTAxVDAwOjAwOjAwKzAwOjAwIiwxXQ",
+                    }
                 }
             },
         },
-        "400": {"description": "Invalid search query"},
+        "400": {"description": "Invalid search query or pagination parameters"},
+        "304": {"description": "Page not modified since the `If-None-Match` ETag"},
     },
 }
 
@@ -46,25 +77,98 @@ GET_USER_ARTICLES = {
             "description": "ID of the user to get articles for",
             "required": True,
             "schema": {"type": "integer", "example": 1},
-        }
+        },
+        {
+            "name": "limit",
+            "in": "query",
+            "description": "Page size, 20 by default and at most 100",
+            "required": False,
+            "schema": {"type": "integer", "example": 20},
+        },
+        {
+            "name": "cursor",
+            "in": "query",
+            "description": "The `next_cursor` value of the previous page",
+            "required": False,
+            "schema": {"type": "string"},
+        },
     ],
     "responses": {
         "200": {
-            "description": "List of articles by the user",
+            "description": "Page of articles by the user, newest first",
             "content": {
                 "application/json": {
-                    "example": [
-                        {
-                            "id": 1,
-                            "title": "User's Article",
-                            "owner_id": 1,
-                            "created_at": "2024-12-01T00:00:00Z",
-                        }
-                    ]
+                    "example": {
+                        "items": [
+                            {
+                                "id": 1,
+                                "title": "User's Article",
+                                "owner_id": 1,
+                                "created_at": "2024-12-01T00:00:00Z",
+                            }
+                        ],
+                        "next_cursor": None,
+                    }
                 }
             },
         },
+        "400": {"description": "Invalid pagination parameters"},
         "404": {"description": "User not found"},
+        "304": {"description": "Page not modified since the `If-None-Match` ETag"},
+    },
+}
+
+GET_ARTICLES_EXPORT = {
+    "tags": ["Articles"],
+    "description": "Download all articles, optionally filtered by owner and creation "
+    "time, as NDJSON or CSV. The file is streamed while the articles are read, "
+    "compressed with gzip when the request accepts it.",
+    "produces": ["application/x-ndjson", "text/csv"],
+    "parameters": [
+        {
+            "name": "format",
+            "in": "query",
+            "description": "File format: `ndjson` (default) or `csv`",
+            "required": False,
+            "schema": {"type": "string", "enum": ["ndjson", "csv"]},
+        },
+        {
+            "name": "owner_id",
+            "in": "query",
+            "description": "Only articles of this user",
+            "required": False,
+            "schema": {"type": "integer", "example": 1},
+        },
+        {
+            "name": "created_from",
+            "in": "query",
+            "description": "Only articles created at or after this time",
+            "required": False,
+            "schema": {"type": "string", "example": "2024-12-01T00:00:00Z"},
+        },
+        {
+            "name": "created_to",
+            "in": "query",
+            "description": "Only articles created before this time",
+            "required": False,
+            "schema": {"type": "string", "example": "2025-01-01T00:00:00Z"},
+        },
+    ],
+    "responses": {
+        "200": {
+            "description": "The articles, newest first",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"title":"Article 2","body":"Body","id":2,"owner_id":1,'
+                    '"created_at":"2024-12-02T00:00:00Z"}\n'
+                },
+                "text/csv": {
+                    "example": "title,body,id,owner_id,created_at\r\n"
+                    "Article 2,Body,2,1,2024-12-02T00:00:00Z\r\n"
+                },
+            },
+        },
+        "400": {"description": "Invalid export parameters"},
     },
 }
 
@@ -96,6 +200,9 @@ GET_ARTICLE = {
             },
         },
         "404": {"description": "Article not found"},
+        "304": {
+            "description": "Not modified since the `If-None-Match` ETag or the `If-Modified-Since` date"
+        },
     },
 }
 
@@ -137,6 +244,55 @@ POST_ARTICLE = {
     },
 }
 
+POST_ARTICLES_BULK = {
+    "tags": ["Articles"],
+    "description": "Import articles of the current user from a streamed NDJSON body, "
+    "one article object per line. Invalid lines are skipped and their errors streamed "
+    "back as NDJSON while the import runs, followed by a summary line.",
+    "consumes": ["application/x-ndjson"],
+    "produces": ["application/x-ndjson"],
+    "parameters": [
+        {
+            "name": "batch_size",
+            "in": "query",
+            "description": "Articles loaded per batch, 1000 by default and at most 10000",
+            "required": False,
+            "schema": {"type": "integer", "example": 1000},
+        },
+        {
+            "name": "atomic",
+            "in": "query",
+            "description": "Import everything in one transaction (default), "
+            "or commit each batch on its own with `false`",
+            "required": False,
+            "schema": {"type": "boolean", "example": True},
+        },
+        {
+            "name": "body",
+            "in": "body",
+            "description": "Articles to create, one JSON object per line",
+            "required": True,
+            "schema": {
+                "type": "string",
+                "example": '{"title": "First", "body": "Content"}\n'
+                '{"title": "Second", "body": "Content"}\n',
+            },
+        },
+    ],
+    "responses": {
+        "200": {
+            "description": "Errors of the invalid lines and the import summary",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"line":2,"errors":[{"type":"missing","loc":["body"],'
+                    '"msg":"Field required"}]}\n{"created":1,"failed":1}\n'
+                }
+            },
+        },
+        "400": {"description": "Invalid import parameters"},
+    },
+}
+
 DELETE_ARTICLE = {
     "tags": ["Articles"],
     "description": "Delete an article by its ID.",
@@ -0,0 +1,39 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Compact set membership test without false negatives: `in` is False only for
+    items that were certainly never added, True means "maybe added".
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self.capacity = capacity
+        self._size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray(math.ceil(self._size / 8))
+        self.count = 0
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def _positions(self, item: str):
+        # Double hashing: k positions derived from two halves of a single digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+
+        for i in range(self._hashes):
+            yield (first + i * second) % self._size
@@ -0,0 +1,75 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already verified tokens, so a token reused across requests is
+    decoded and its signature checked only once. Entries are keyed by a digest of
+    the token (the token itself is never kept) and live until the token expires.
+    """
+
+    def __init__(self, max_size: int = 10_000) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[bytes, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """Retrieve the claims of a verified, not yet expired token."""
+
+        key = self._key(token)
+
+        with self._lock:
+            claims = self._entries.get(key)
+
+            if claims is not None and claims["exp"] <= time.time():
+                del self._entries[key]
+                claims = None
+
+            if claims is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        if "exp" not in claims:
+            return
+
+        key = self._key(token)
+
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def evict(self, token: str) -> None:
+        """Forget the token, e.g. on logout, so it is verified from scratch again."""
+
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,3 +13,20 @@ class AuthSettings(BaseSettings):
     )
 
     AUTH_SECRET: str
+    AUTH_ACCESS_TOKEN_MINUTES: int = 15
+    AUTH_REFRESH_TOKEN_DAYS: int = 30
+    # Expected number of active revoked tokens, the filter grows past it when needed
+    AUTH_REVOCATION_FILTER_SIZE: int = 100_000
+    # Embed user data into tokens, so most requests authenticate without a user lookup
+    AUTH_EMBED_CLAIMS: bool = False
+    # Max number of verified tokens kept in memory per worker, 0 disables the cache
+    AUTH_TOKEN_CACHE_SIZE: int = 10_000
+    # Login attempts allowed per email and per client IP within the window (seconds)
+    AUTH_LOGIN_EMAIL_ATTEMPTS: int = 5
+    AUTH_LOGIN_IP_ATTEMPTS: int = 30
+    AUTH_LOGIN_ATTEMPTS_WINDOW: int = 60
+    # File mapped by all workers to share the login attempts budget
+    AUTH_LOGIN_THROTTLE_FILE: str = os.path.join(
+        tempfile.gettempdir(), "chi-blog-login-throttle"
+    )
+    AUTH_LOGIN_THROTTLE_SLOTS: int = 65536
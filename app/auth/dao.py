@@ -0,0 +1,40 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.dao import BaseDAO
+from .models import RevokedToken
+
+
+class RevokedTokenDAO(BaseDAO[RevokedToken]):
+    model = RevokedToken
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        query = (
+            insert(RevokedToken)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+
+        with self._sf() as session:
+            session.execute(query)
+
+    def is_revoked(self, jti: str) -> bool:
+        with self._sf() as session:
+            return session.scalar(select(exists().where(RevokedToken.jti == jti)))
+
+    def get_active_jtis(self) -> list[str]:
+        """Retrieve ids of all revoked tokens that are not expired yet."""
+        query = select(RevokedToken.jti).where(
+            RevokedToken.expires_at > datetime.now(UTC)
+        )
+
+        with self._sf() as session:
+            return list(session.scalars(query))
+
+    def delete_expired(self) -> None:
+        query = delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(UTC))
+
+        with self._sf() as session:
+            session.execute(query)
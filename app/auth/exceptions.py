@@ -8,3 +8,11 @@ class AuthenticationExpired(AuthError):
 
 class NotAuthenticated(AuthError):
     """Error raised when the user is not authenticated"""
+
+
+class LoginThrottled(AuthError):
+    """Error raised when there were too many login attempts"""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(retry_after)
+        self.retry_after = retry_after
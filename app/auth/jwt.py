@@ -1,22 +1,37 @@
 from datetime import UTC, datetime, timedelta
+from typing import Any
+
 import jwt
+
+from .cache import VerifiedTokenCache
 from .exceptions import AuthenticationExpired, NotAuthenticated
 
 
 class JwtManager:
     """Handles JWT creation and decoding for user authentication."""
 
-    def __init__(self, alg: str, secret: str, exp_delta: timedelta) -> None:
+    def __init__(
+        self,
+        alg: str,
+        secret: str,
+        exp_delta: timedelta,
+        cache: VerifiedTokenCache | None = None,
+    ) -> None:
         self._alg = alg
         self._secret = secret
         self._exp_delta = exp_delta
+        self._cache = cache
 
-    def create_token(self, id: int) -> str:
-        """Generates a JWT for a user, embedding the expiration and user ID."""
+    def create_token(self, id: int, claims: dict[str, Any] | None = None) -> str:
+        """
+        Generates a JWT for a user, embedding the expiration, user ID and extra claims.
+        An `exp` passed in claims overrides the default expiration.
+        """
 
         return jwt.encode(
             payload={
                 "exp": self._get_exp_timestamp(),
+                **(claims or {}),
                 "sub": str(id),
             },
             key=self._secret,
@@ -26,9 +41,39 @@ class JwtManager:
     def read_token(self, token: str) -> str:
         """Decodes and verifies the JWT, returning the user ID."""
 
+        return self.read_claims(token)["sub"]
+
+    def read_claims(self, token: str) -> dict[str, Any]:
+        """
+        Decodes and verifies the JWT, returning all of its claims.
+        Claims of cached tokens are shared, they must not be modified.
+        """
+
+        if self._cache is not None and token:
+            claims = self._cache.get(token)
+
+            if claims is not None:
+                return claims
+
+        claims = self._decode(token)
+
+        if self._cache is not None:
+            self._cache.put(token, claims)
+
+        return claims
+
+    def forget_token(self, token: str) -> None:
+        """Drop the token from the verified tokens cache."""
+
+        if self._cache is not None and token:
+            self._cache.evict(token)
+
+    def cache_stats(self) -> dict[str, int] | None:
+        return self._cache.stats() if self._cache is not None else None
+
+    def _decode(self, token: str) -> dict[str, Any]:
         try:
-            decoded = jwt.decode(token, self._secret, algorithms=[self._alg])
-            return decoded["sub"]
+            return jwt.decode(token, self._secret, algorithms=[self._alg])
 
         except jwt.ExpiredSignatureError:
             raise AuthenticationExpired
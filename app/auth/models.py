@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column as mc
+
+from app.db.base import Base
+
+
+class RevokedToken(Base):
+    """Token revoked before its expiration, kept until it would have expired anyway."""
+
+    __tablename__ = "revoked_tokens"
+
+    jti: Mapped[str] = mc(String(length=32), unique=True, nullable=False)
+    expires_at: Mapped[datetime] = mc(
+        DateTime(timezone=True), index=True, nullable=False
+    )
+
+    def __repr__(self):
+        return f"<RevokedToken(jti={self.jti})>"
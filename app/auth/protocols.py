@@ -5,8 +5,15 @@ class SupportsIdProtocol(Protocol):
     id: int
 
 
+class SupportsCurrentVersion(Protocol):
+    @property
+    def current(self) -> int: ...
+
+
 class UserServiceProtocol(Protocol):
 
     def get_by_credentials(self, credentials: Any) -> SupportsIdProtocol: ...
 
     def get_user_by_id(self, id: int) -> SupportsIdProtocol: ...
+
+    def get_user_from_claims(self, claims: dict[str, Any]) -> SupportsIdProtocol: ...
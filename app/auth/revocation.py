@@ -0,0 +1,77 @@
+from datetime import UTC, datetime
+from threading import Lock
+
+from .bloom import BloomFilter
+from .dao import RevokedTokenDAO
+
+
+class RevocationStore:
+    """
+    Revoked token ids of this worker, checked through a Bloom filter of all the
+    active revocations. Only ids the filter matches (revoked or false positives)
+    are looked up in the database, most tokens are accepted without a query.
+
+    Revocations made by other workers arrive as notifications on `channel`,
+    without a payload (after (re)connecting) the filter is reloaded from the database.
+    Until the first load every check goes to the database.
+    """
+
+    channel: str = "token_revocations"
+
+    def __init__(
+        self, dao: RevokedTokenDAO, capacity: int = 100_000, error_rate: float = 0.001
+    ) -> None:
+        self._dao = dao
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._filter: BloomFilter | None = None
+        self._lock = Lock()
+
+    def is_revoked(self, jti: str) -> bool:
+        bloom = self._filter
+
+        if bloom is not None and jti not in bloom:
+            return False
+
+        return self._dao.is_revoked(jti)
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """Revoke the token until its expiration timestamp."""
+
+        self._dao.revoke(jti, datetime.fromtimestamp(expires_at, UTC))
+        self._dao.notify(self.channel, jti)
+        self.add(jti)
+
+    def add(self, jti: str) -> None:
+        """Add a revocation that is already stored to the filter."""
+
+        with self._lock:
+            if self._filter is None:
+                return
+
+            if self._filter.count < self._filter.capacity:
+                self._filter.add(jti)
+                return
+
+        # Full filter would match too many tokens, rebuild it without the expired ones
+        self.reload()
+
+    def reload(self) -> None:
+        """Rebuild the filter from the active revocations in the database."""
+
+        # Revocations added while loading would be lost by the swap, so they wait
+        with self._lock:
+            self._dao.delete_expired()
+            jtis = self._dao.get_active_jtis()
+
+            bloom = BloomFilter(max(self._capacity, 2 * len(jtis)), self._error_rate)
+            for jti in jtis:
+                bloom.add(jti)
+
+            self._filter = bloom
+
+    def handle_notification(self, payload: str | None) -> None:
+        if payload:
+            self.add(payload)
+        else:
+            self.reload()
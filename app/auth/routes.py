@@ -1,8 +1,9 @@
 from flask import jsonify, request, Blueprint
 from flasgger import swag_from
 
-from app.app import auth_service
+from app.app import auth_jwt_manager, auth_service, rbac
 from app.base.response import DtoResponse
+from app.auth.exceptions import AuthError
 from app.users.exceptions import InvalidPassword
 from app.auth.swagger import docs
 
@@ -19,3 +20,32 @@ def login():
 
     except InvalidPassword:
         return jsonify({"error": "Invalid password"}), 401
+
+
+@router.post("/refresh")
+@swag_from(docs.REFRESH_TOKENS)
+def refresh():
+    """Exchanges the refresh token cookie for new auth and refresh tokens."""
+
+    try:
+        return auth_service.refresh_tokens()
+
+    except AuthError:
+        return jsonify({"error": "not authenticated"}), 401
+
+
+@router.post("/logout")
+@swag_from(docs.LOGOUT_USER)
+def logout():
+    """Logs out the current user, removing the auth token cookie."""
+
+    return auth_service.logout_user()
+
+
+@router.get("/token-cache")
+@rbac.permission_required("auth.can_view_stats")
+@swag_from(docs.TOKEN_CACHE_STATS)
+def token_cache_stats():
+    """Returns hit/miss counters of the verified tokens cache of this worker."""
+
+    return jsonify(auth_jwt_manager.cache_stats() or {}), 200
@@ -1,34 +1,98 @@
+from datetime import UTC, datetime, timedelta
 from functools import wraps
-from typing import Callable
+from typing import Any, Callable
+from uuid import uuid4
 
-from flask import request, jsonify, Response
+from flask import after_this_request, request, jsonify, Response
 
 from app.auth.jwt import JwtManager
-from app.auth.exceptions import AuthError
-from app.auth.protocols import SupportsIdProtocol, UserServiceProtocol
+from app.auth.exceptions import AuthError, NotAuthenticated
+from app.auth.protocols import (
+    SupportsCurrentVersion,
+    SupportsIdProtocol,
+    UserServiceProtocol,
+)
+from app.auth.revocation import RevocationStore
+from app.auth.throttle import LoginThrottle
 
 
 class AuthService:
-    """Provides user authentication services"""
+    """
+    Provides user authentication services.
+
+    Login issues a short-lived access token and a long-lived refresh token, which is
+    exchanged for a new pair by `refresh_tokens`. Both carry an id (`jti`), so they
+    can be revoked before they expire when `revocations` are given.
+    With a `login_throttle`, login attempts over its limits are rejected before
+    the credentials are checked.
+
+    When `claims_version` is given, tokens also carry the user data and the version
+    it was issued at, and the current user is built straight from the token claims.
+    Once the version moves (a user or RBAC change was committed), older tokens
+    fall back to the database and are re-issued with fresh claims.
+    """
 
     cookie_name: str = "auth_token"
+    refresh_cookie_name: str = "refresh_token"
+    refresh_cookie_path: str = "/auth"
+    user_claims: tuple[str, ...] = ("username", "email", "role")
 
     def __init__(
         self,
         jwt_manager: JwtManager,
         user_service: UserServiceProtocol,
+        claims_version: SupportsCurrentVersion | None = None,
+        revocations: RevocationStore | None = None,
+        refresh_exp_delta: timedelta = timedelta(days=30),
+        login_throttle: LoginThrottle | None = None,
     ) -> None:
         self._jwt_manager = jwt_manager
         self._user_service = user_service
+        self._claims_version = claims_version
+        self._revocations = revocations
+        self._refresh_exp_delta = refresh_exp_delta
+        self._login_throttle = login_throttle
 
     def login_user(self, credentials: dict) -> Response:
-        """Authenticates a user and returns a response with an auth token cookie."""
+        """Authenticates a user and returns a response with the token cookies."""
+
+        if self._login_throttle is not None:
+            email = str((credentials or {}).get("email", ""))
+            self._login_throttle.check(email, request.remote_addr)
 
         user = self._user_service.get_by_credentials(credentials)
-        token = self._jwt_manager.create_token(user.id)
 
-        resp = jsonify({"token": token})
-        resp.set_cookie(self.cookie_name, token)
+        return self._tokens_response(user)
+
+    def refresh_tokens(self) -> Response:
+        """
+        Exchanges the refresh token cookie for a new pair of tokens.
+        The used refresh token is revoked, so each one works only once.
+        """
+
+        token = request.cookies.get(self.refresh_cookie_name)
+        claims = self._read_claims(token, "refresh")
+        user = self._user_service.get_user_by_id(claims["sub"])
+
+        self._revoke(claims)
+
+        return self._tokens_response(user)
+
+    def logout_user(self) -> Response:
+        """Revokes the current tokens and removes their cookies."""
+
+        for cookie_name in (self.cookie_name, self.refresh_cookie_name):
+            token = request.cookies.get(cookie_name)
+            self._jwt_manager.forget_token(token)
+
+            try:
+                self._revoke(self._jwt_manager.read_claims(token))
+            except AuthError:
+                pass
+
+        resp = jsonify({"message": "Logged out"})
+        resp.delete_cookie(self.cookie_name)
+        resp.delete_cookie(self.refresh_cookie_name, path=self.refresh_cookie_path)
 
         return resp
 
@@ -36,13 +100,94 @@ class AuthService:
         token = request.cookies.get(self.cookie_name)
 
         try:
-            user_id = self._jwt_manager.read_token(token)
-            user = self._user_service.get_user_by_id(user_id)
+            claims = self._read_claims(token, "access")
+
+            if self._claims_version is not None:
+                return self._get_user_from_claims(claims)
+
+            user = self._user_service.get_user_by_id(claims["sub"])
         except AuthError:
             return None
 
         return user
 
+    def _read_claims(self, token: str | None, token_type: str) -> dict[str, Any]:
+        """Verify the token is valid, of the given type and not revoked."""
+
+        claims = self._jwt_manager.read_claims(token)
+
+        # Tokens issued before token types were introduced are access tokens
+        if claims.get("typ", "access") != token_type:
+            raise NotAuthenticated
+
+        if self._revocations is not None and "jti" in claims:
+            if self._revocations.is_revoked(claims["jti"]):
+                raise NotAuthenticated
+
+        return claims
+
+    def _revoke(self, claims: dict[str, Any]) -> None:
+        if self._revocations is not None and "jti" in claims:
+            self._revocations.revoke(claims["jti"], claims["exp"])
+
+    def _tokens_response(self, user: Any) -> Response:
+        token = self._create_token(user)
+        refresh_exp = datetime.now(UTC) + self._refresh_exp_delta
+        refresh_token = self._jwt_manager.create_token(
+            user.id,
+            {"typ": "refresh", "jti": uuid4().hex, "exp": refresh_exp.timestamp()},
+        )
+
+        resp = jsonify({"token": token, "refresh_token": refresh_token})
+        resp.set_cookie(self.cookie_name, token)
+        resp.set_cookie(
+            self.refresh_cookie_name,
+            refresh_token,
+            expires=refresh_exp,
+            path=self.refresh_cookie_path,
+            httponly=True,
+        )
+
+        return resp
+
+    def _get_user_from_claims(self, claims: dict[str, Any]) -> SupportsIdProtocol:
+        version = self._claims_version.current
+
+        # Until the version is loaded (0) claims can't be trusted nor re-issued
+        if version and claims.get("ver", 0) >= version:
+            return self._user_service.get_user_from_claims(claims)
+
+        user = self._user_service.get_user_by_id(claims["sub"])
+
+        if not version:
+            return user
+
+        # Same id, so revoking the original token revokes the fresh one too
+        fresh_token = self._create_token(user, exp=claims["exp"], jti=claims.get("jti"))
+
+        @after_this_request
+        def refresh_token_cookie(response: Response) -> Response:
+            response.set_cookie(self.cookie_name, fresh_token)
+            return response
+
+        return user
+
+    def _create_token(
+        self, user: Any, exp: float | None = None, jti: str | None = None
+    ) -> str:
+        """Create an access token for the user, with user claims if they are enabled."""
+
+        claims = {"typ": "access", "jti": jti or uuid4().hex}
+
+        if self._claims_version is not None:
+            claims.update({name: getattr(user, name) for name in self.user_claims})
+            claims["ver"] = self._claims_version.current
+
+        if exp is not None:
+            claims["exp"] = exp
+
+        return self._jwt_manager.create_token(user.id, claims)
+
     def login_required(self, router: Callable):
         """Decorator to protect routes, requiring a valid auth token to access."""
 
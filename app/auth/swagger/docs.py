@@ -30,6 +30,7 @@ LOGIN_USER = {
                 "application/json": {
                     "example": {
                         "token": "jwt_token_here",
+                        "refresh_token": "refresh_jwt_token_here",
                     }
                 }
             },
@@ -38,6 +39,78 @@ LOGIN_USER = {
             "description": "Invalid credentials or authentication error",
             "content": {"application/json": {"example": {"error": "Invalid password"}}},
         },
+        "429": {
+            "description": "Too many login attempts for the email or client IP, retry after `Retry-After` seconds",
+            "content": {
+                "application/json": {
+                    "example": {"error": "Too many login attempts, try again later"}
+                }
+            },
+        },
+    },
+    "security": [{"JWT Cookie": []}],
+}
+
+REFRESH_TOKENS = {
+    "tags": ["Authentication"],
+    "description": "Exchanges the refresh token cookie for a new pair of tokens. Each refresh token can be used only once.",
+    "responses": {
+        "200": {
+            "description": "New tokens, also set as cookies",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "token": "jwt_token_here",
+                        "refresh_token": "refresh_jwt_token_here",
+                    }
+                }
+            },
+        },
+        "401": {
+            "description": "Missing, expired or revoked refresh token",
+            "content": {
+                "application/json": {"example": {"error": "not authenticated"}}
+            },
+        },
+    },
+}
+
+LOGOUT_USER = {
+    "tags": ["Authentication"],
+    "description": "Logs out the current user, revoking its tokens and removing their cookies.",
+    "responses": {
+        "200": {
+            "description": "Logout successful",
+            "content": {"application/json": {"example": {"message": "Logged out"}}},
+        },
+    },
+    "security": [{"JWT Cookie": []}],
+}
+
+TOKEN_CACHE_STATS = {
+    "tags": ["Authentication"],
+    "description": "Counters of the verified tokens cache of the worker serving the request. Requires the `auth.can_view_stats` permission.",
+    "responses": {
+        "200": {
+            "description": "Cache statistics, empty when the cache is disabled",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "size": 120,
+                        "max_size": 10000,
+                        "hits": 5321,
+                        "misses": 130,
+                        "evictions": 0,
+                    }
+                }
+            },
+        },
+        "403": {
+            "description": "Permission denied",
+            "content": {
+                "application/json": {"example": {"error": "Permission denied"}}
+            },
+        },
     },
     "security": [{"JWT Cookie": []}],
 }
@@ -0,0 +1,142 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from .exceptions import LoginThrottled
+
+
+# Key hash, tokens left, last update timestamp
+_SLOT = struct.Struct("<Qdd")
+
+
+class SharedTokenBuckets:
+    """
+    Token buckets kept in a fixed-size hash table in shared memory.
+
+    With a `path` the table is a memory-mapped file locked with `flock`, so every
+    process mapping the same file (e.g. all gunicorn workers) shares the same buckets.
+    Without it the table is an anonymous mapping private to the process.
+    When all slots a key may use are taken, the least recently updated bucket is reused.
+    """
+
+    probes: int = 8
+
+    def __init__(self, slots: int = 65536, path: str | None = None) -> None:
+        size = slots * _SLOT.size
+        self._slots = slots
+        self._lock = threading.Lock()
+        self._fd = None
+
+        if path is None:
+            self._mmap = mmap.mmap(-1, size)
+            return
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._locked():
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+
+        self._mmap = mmap.mmap(self._fd, size)
+
+    def take(self, key: str, capacity: float, rate: float) -> float:
+        """
+        Take a token from the bucket of the key, which holds up to `capacity` tokens
+        and regains `rate` tokens per second.
+        Returns 0 if a token was taken, otherwise seconds until one is available.
+        """
+
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        key_hash = int.from_bytes(digest, "little") or 1  # 0 marks an empty slot
+        now = time.time()
+
+        with self._locked():
+            offset = self._find_slot(key_hash)
+            stored_hash, tokens, updated_at = _SLOT.unpack_from(self._mmap, offset)
+
+            if stored_hash != key_hash:
+                tokens, updated_at = capacity, now
+
+            tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate
+
+            _SLOT.pack_into(self._mmap, offset, key_hash, tokens, now)
+
+        return wait
+
+    def _find_slot(self, key_hash: int) -> int:
+        """Offset of the slot of the key, or of the stalest slot it may take over."""
+
+        stalest_offset, stalest_time = 0, float("inf")
+
+        for i in range(self.probes):
+            offset = (key_hash + i) % self._slots * _SLOT.size
+            stored_hash, _, updated_at = _SLOT.unpack_from(self._mmap, offset)
+
+            if stored_hash == key_hash:
+                return offset
+
+            if updated_at < stalest_time:
+                stalest_offset, stalest_time = offset, updated_at
+
+        return stalest_offset
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # flock is held per open file, threads of the process also need their own lock
+        with self._lock:
+            if self._fd is None:
+                yield
+                return
+
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+class LoginThrottle:
+    """
+    Limits login attempts per email and per client IP, each bucket is refilled
+    completely within `window` seconds.
+    """
+
+    def __init__(
+        self,
+        buckets: SharedTokenBuckets,
+        email_attempts: int = 5,
+        ip_attempts: int = 30,
+        window: float = 60,
+    ) -> None:
+        self._buckets = buckets
+        self._email_attempts = email_attempts
+        self._ip_attempts = ip_attempts
+        self._window = window
+
+    def check(self, email: str, ip: str | None) -> None:
+        """Count a login attempt, raising `LoginThrottled` if there are too many."""
+
+        wait = self._buckets.take(
+            f"ip:{ip}", self._ip_attempts, self._ip_attempts / self._window
+        )
+
+        if not wait:
+            wait = self._buckets.take(
+                f"email:{email.strip().lower()}",
+                self._email_attempts,
+                self._email_attempts / self._window,
+            )
+
+        if wait:
+            raise LoginThrottled(wait)
@@ -0,0 +1,277 @@
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Protocol
+from urllib.parse import unquote, urlsplit
+
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache(Protocol):
+    """
+    Cache of encoded responses. Each key holds any number of variants
+    (e.g. pages of a list), which are all deleted together with the key.
+    """
+
+    def get(self, key: str, variant: str = "") -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, variant: str = "") -> None: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+
+class MemoryResponseCache:
+    """
+    In-process LRU of encoded responses bounded by the total size of the values.
+    Entries also expire after `ttl` seconds, which bounds how long a response read
+    concurrently with a write may outlive the invalidation.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, ttl: float = 300) -> None:
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], tuple[bytes, float]] = OrderedDict()
+        self._variants: dict[str, set[str]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str, variant: str = "") -> bytes | None:
+        with self._lock:
+            entry = self._entries.get((key, variant))
+
+            if entry is not None and entry[1] <= time.monotonic():
+                self._remove((key, variant))
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end((key, variant))
+            self._hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: bytes, variant: str = "") -> None:
+        if len(value) > self._max_bytes:
+            return
+
+        with self._lock:
+            self._remove((key, variant))
+
+            self._entries[(key, variant)] = (value, time.monotonic() + self._ttl)
+            self._variants.setdefault(key, set()).add(variant)
+            self._size += len(value)
+
+            while self._size > self._max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                for variant in list(self._variants.get(key, ())):
+                    self._remove((key, variant))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._variants.clear()
+            self._size = 0
+
+    def handle_notification(self, payload: str | None) -> None:
+        """
+        Notification handler deleting the space separated keys of the payload.
+        Without a payload (after connecting) notifications may have been missed,
+        so everything is dropped.
+        """
+
+        if payload:
+            self.delete(*payload.split())
+        else:
+            self.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def _remove(self, entry_key: tuple[str, str]) -> None:
+        entry = self._entries.pop(entry_key, None)
+
+        if entry is None:
+            return
+
+        key, variant = entry_key
+        self._size -= len(entry[0])
+        self._variants[key].discard(variant)
+
+        if not self._variants[key]:
+            del self._variants[key]
+
+
+class RedisResponseCache:
+    """
+    Response cache kept in Redis (7.0 or newer), shared by all workers.
+    Keys are hashes of their variants, expiring `ttl` seconds after being created.
+    The size bound and eviction are left to the server `maxmemory` policy.
+
+    The cache is an optimization only: when the server is unreachable
+    reads miss and writes are skipped, the failure is logged.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        ttl: int = 300,
+        prefix: str = "chi-blog:",
+        timeout: float = 0.5,
+    ) -> None:
+        self._client = RespClient(url, timeout)
+        self._ttl = ttl
+        self._prefix = prefix
+
+    def get(self, key: str, variant: str = "") -> bytes | None:
+        try:
+            return self._client.execute("HGET", self._prefix + key, variant)
+        except OSError:
+            logger.exception("Response cache read failed")
+            return None
+
+    def set(self, key: str, value: bytes, variant: str = "") -> None:
+        key = self._prefix + key
+
+        try:
+            self._client.execute_many(
+                ("HSET", key, variant, value),
+                ("EXPIRE", key, str(self._ttl), "NX"),
+            )
+        except OSError:
+            logger.exception("Response cache write failed")
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+
+        try:
+            self._client.execute("DEL", *(self._prefix + key for key in keys))
+        except OSError:
+            logger.exception("Response cache invalidation failed")
+
+
+class RespError(ConnectionError):
+    """Error reply of a server speaking the Redis protocol (RESP)."""
+
+
+class RespClient:
+    """
+    Minimal blocking client of the Redis protocol (RESP 2), enough for the cache.
+    One connection is shared by the threads of the process, commands are pipelined
+    and the connection is reopened after a failure.
+    """
+
+    def __init__(self, url: str, timeout: float = 0.5) -> None:
+        parts = urlsplit(url)
+        self._address = (parts.hostname or "localhost", parts.port or 6379)
+        self._password = unquote(parts.password) if parts.password else None
+        self._db = parts.path.strip("/") or "0"
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._sock: socket.socket | None = None
+        self._reader = None
+
+    def execute(self, *command: str | bytes):
+        return self.execute_many(command)[0]
+
+    def execute_many(self, *commands: tuple[str | bytes, ...]) -> list:
+        """Send the commands at once and read their replies, raising on an error reply."""
+
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._connect()
+
+                self._sock.sendall(b"".join(map(self._encode, commands)))
+                replies = [self._read_reply() for _ in commands]
+            except OSError:
+                self._close()
+                raise
+
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+
+        return replies
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection(self._address, self._timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+
+        setup = []
+        if self._password:
+            setup.append(("AUTH", self._password))
+        if self._db != "0":
+            setup.append(("SELECT", self._db))
+
+        if setup:
+            self._sock.sendall(b"".join(map(self._encode, setup)))
+            for _ in setup:
+                reply = self._read_reply()
+                if isinstance(reply, RespError):
+                    raise reply
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = self._reader = None
+
+    @staticmethod
+    def _encode(command: tuple[str | bytes, ...]) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+
+        for arg in command:
+            data = arg.encode() if isinstance(arg, str) else arg
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+
+        return b"".join(parts)
+
+    def _read_reply(self):
+        line = self._reader.readline()
+
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by the server")
+
+        kind, rest = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            return RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            if int(rest) < 0:
+                return None
+            data = self._reader.read(int(rest) + 2)
+            if len(data) != int(rest) + 2:
+                raise ConnectionError("Connection closed by the server")
+            return data[:-2]
+        if kind == b"*":
+            if int(rest) < 0:
+                return None
+            return [self._read_reply() for _ in range(int(rest))]
+
+        raise ConnectionError(f"Unexpected reply: {line!r}")
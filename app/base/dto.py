@@ -0,0 +1,38 @@
+from enum import StrEnum
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+T = TypeVar("T")
+
+
+class PageParamsDTO(BaseModel):
+    """Data Transfer Object (DTO) for keyset pagination query parameters."""
+
+    limit: int = Field(default=20, ge=1)
+    cursor: str | None = None
+
+
+class PageDTO(BaseModel, Generic[T]):
+    """
+    Data Transfer Object (DTO) for a page of items.
+    `next_cursor` is passed back as the `cursor` parameter to get the following page,
+    it is null on the last page.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    items: list[T]
+    next_cursor: str | None
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExportParamsDTO(BaseModel):
+    """Data Transfer Object (DTO) for export query parameters."""
+
+    format: ExportFormat = ExportFormat.NDJSON
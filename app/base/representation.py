@@ -0,0 +1,53 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+
+@dataclass(frozen=True, slots=True)
+class Representation:
+    """
+    Encoded resource with the validators of conditional requests.
+    The body is encoded by `encode` only when it is sent, not for 304 Not Modified.
+    """
+
+    etag: str
+    last_modified: datetime | None
+    encode: Callable[[], bytes]
+
+    @classmethod
+    def of_record(
+        cls, record: Any, encode: Callable[[], bytes], *parts: Any
+    ) -> "Representation":
+        """
+        Validators of a record from its id and `updated_at`, without encoding it.
+        `parts` are any other data shown by the record that changes without updating it.
+        """
+
+        updated_at = record.updated_at
+        key = repr((record.id, updated_at.isoformat(), *parts)).encode()
+
+        return cls(hashlib.blake2b(key, digest_size=12).hexdigest(), updated_at, encode)
+
+    @classmethod
+    def of_content(cls, body: bytes) -> "Representation":
+        """Validators of already encoded content, e.g. a page of a list, from its hash."""
+
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return cls(etag, None, lambda: body)
+
+    def pack(self) -> bytes:
+        """Encode the representation with its validators, e.g. to cache it."""
+
+        last_modified = self.last_modified.isoformat() if self.last_modified else ""
+        return f"{self.etag}\n{last_modified}\n".encode() + self.encode()
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "Representation":
+        etag, last_modified, body = data.split(b"\n", 2)
+
+        return cls(
+            etag.decode(),
+            datetime.fromisoformat(last_modified.decode()) if last_modified else None,
+            lambda: body,
+        )
@@ -1,15 +1,148 @@
-from flask import Response
+import zlib
+from typing import Any, Iterable, Iterator, Sequence
+
+from flask import Response, request, stream_with_context
 from pydantic import BaseModel
+from werkzeug.http import is_resource_modified
+
+from .dto import ExportFormat
+from .representation import Representation
+from .serialization import dump_trusted, dump_trusted_csv, dump_trusted_lines
 
 
 class DtoResponse(Response):
-    """Shortcut response class for auto serializing pydantic-based DTO objects to json"""
+    """
+    Shortcut response class for auto serializing pydantic-based DTO objects to json.
+    Already encoded json (e.g. from `dump_trusted`) is sent as it is.
+    """
 
     default_mimetype: str = "application/json"
 
-    def __init__(self, response: BaseModel | None = None, *args, **kwargs):
+    def __init__(self, response: BaseModel | bytes | None = None, *args, **kwargs):
 
         if isinstance(response, BaseModel):
             response = response.model_dump_json()
 
         super().__init__(response, *args, **kwargs)
+
+
+def conditional_response(representation: Representation, status: int = 200) -> Response:
+    """
+    Respond with the representation and its validators, or with 304 Not Modified
+    without encoding it when the request `If-None-Match` (or `If-Modified-Since`
+    when there is none) shows the client has it already.
+    Clients and proxies may keep the response but have to revalidate it.
+    """
+
+    if is_resource_modified(
+        request.environ,
+        etag=representation.etag,
+        last_modified=representation.last_modified,
+    ):
+        response = DtoResponse(representation.encode(), status=status)
+    else:
+        response = DtoResponse(status=304)
+
+    response.set_etag(representation.etag, weak=True)
+    response.last_modified = representation.last_modified
+    response.cache_control.no_cache = True
+
+    return response
+
+
+class JsonArrayStreamResponse(Response):
+    """
+    Response streaming trusted rows as a JSON array of DTOs, one chunk of rows at a time,
+    so memory is bounded by the chunk size rather than by the number of rows.
+    The request context (with its database session) is kept until the stream ends.
+    """
+
+    default_mimetype: str = "application/json"
+
+    def __init__(
+        self, dto: type[BaseModel], chunks: Iterable[Sequence[Any]], *args, **kwargs
+    ):
+        super().__init__(
+            stream_with_context(self._encode(dto, chunks)), *args, **kwargs
+        )
+
+    @staticmethod
+    def _encode(
+        dto: type[BaseModel], chunks: Iterable[Sequence[Any]]
+    ) -> Iterator[bytes]:
+        yield b"["
+
+        separator = b""
+        for chunk in chunks:
+            if chunk:
+                yield separator + b",".join(dump_trusted(dto, row) for row in chunk)
+                separator = b","
+
+        yield b"]"
+
+
+class ExportStreamResponse(Response):
+    """
+    Response streaming trusted rows as a downloadable NDJSON or CSV file of DTOs,
+    encoded one chunk of rows at a time. It is compressed on the fly with gzip
+    when the request accepts it. The request context (with its database session)
+    is kept until the stream ends.
+    """
+
+    mimetypes = {
+        ExportFormat.NDJSON: "application/x-ndjson",
+        ExportFormat.CSV: "text/csv",
+    }
+
+    def __init__(
+        self,
+        dto: type[BaseModel],
+        chunks: Iterable[Sequence[Any]],
+        export_format: ExportFormat,
+        filename: str,
+        compress_level: int = 6,
+        **kwargs,
+    ):
+        body = self._encode(dto, chunks, export_format)
+        compress = request.accept_encodings["gzip"] > 0
+
+        if compress:
+            body = self._gzip(body, compress_level)
+
+        super().__init__(
+            stream_with_context(body), mimetype=self.mimetypes[export_format], **kwargs
+        )
+
+        if compress:
+            self.content_encoding = "gzip"
+
+        self.vary.add("Accept-Encoding")
+        self.headers["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{export_format}"'
+        )
+
+    @staticmethod
+    def _encode(
+        dto: type[BaseModel],
+        chunks: Iterable[Sequence[Any]],
+        export_format: ExportFormat,
+    ) -> Iterator[bytes]:
+        if export_format is ExportFormat.CSV:
+            yield dump_trusted_csv(dto, [], header=True)
+
+            for chunk in chunks:
+                yield dump_trusted_csv(dto, chunk)
+        else:
+            for chunk in chunks:
+                yield dump_trusted_lines(dto, chunk)
+
+    @staticmethod
+    def _gzip(parts: Iterable[bytes], level: int) -> Iterator[bytes]:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+        for part in parts:
+            # zlib buffers small inputs, so there isn't output for every part
+            if compressed := compressor.compress(part):
+                yield compressed
+
+        yield compressor.flush()
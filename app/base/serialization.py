@@ -0,0 +1,116 @@
+import csv
+import io
+from functools import cache
+from typing import Any, Callable, Sequence, get_args, get_origin
+
+from pydantic import BaseModel, RootModel, TypeAdapter
+from typing_extensions import TypedDict
+
+
+Reader = Callable[[Any], Any]
+
+
+def dump_trusted(dto: type[BaseModel], data: Any) -> bytes:
+    """
+    Serialize trusted data, e.g. ORM objects, Core rows or pages of them, to JSON bytes
+    shaped like the DTO. Fields are read by attribute and only the DTO's `before`
+    field validators are applied, the data is not validated against the DTO.
+    """
+
+    adapter, read = _dto_serializer(dto)
+    return adapter.dump_json(read(data))
+
+
+def dump_trusted_lines(dto: type[BaseModel], rows: Sequence[Any]) -> bytes:
+    """Serialize trusted rows like `dump_trusted` as JSON lines (NDJSON)."""
+
+    adapter, read = _dto_serializer(dto)
+    return b"".join(adapter.dump_json(read(row)) + b"\n" for row in rows)
+
+
+def dump_trusted_csv(
+    dto: type[BaseModel], rows: Sequence[Any], header: bool = False
+) -> bytes:
+    """
+    Serialize trusted rows to CSV lines with a column per DTO field,
+    values rendered like in JSON. `header` adds the line of field names first.
+    """
+
+    adapter, read = _dto_serializer(dto)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    if header:
+        writer.writerow(dto.model_fields)
+
+    for row in rows:
+        writer.writerow(adapter.dump_python(read(row), mode="json").values())
+
+    return buffer.getvalue().encode()
+
+
+@cache
+def _dto_serializer(dto: type[BaseModel]) -> tuple[TypeAdapter, Reader]:
+    serialized_type, read = _plan(dto)
+    return TypeAdapter(serialized_type), read or (lambda data: data)
+
+
+def _plan(annotation: Any) -> tuple[Any, Reader | None]:
+    """
+    Type to serialize values of the annotation with, and the reader turning
+    trusted values into it (None when they are serialized as they are).
+    """
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _model_plan(annotation)
+
+    if get_origin(annotation) is list:
+        item_type, read_item = _plan(get_args(annotation)[0])
+
+        if read_item is None:
+            return list[item_type], None
+
+        return list[item_type], lambda values: [read_item(v) for v in values]
+
+    return annotation, None
+
+
+@cache
+def _model_plan(dto: type[BaseModel]) -> tuple[Any, Reader]:
+    if issubclass(dto, RootModel):
+        root_type, read_root = _plan(dto.model_fields["root"].annotation)
+        return root_type, read_root or (lambda data: data)
+
+    before_validators: dict[str, list[Callable]] = {}
+    for decorator in dto.__pydantic_decorators__.field_validators.values():
+        if decorator.info.mode == "before":
+            for name in decorator.info.fields:
+                before_validators.setdefault(name, []).append(decorator.func)
+
+    field_types = {}
+    fields = []
+
+    for name, field in dto.model_fields.items():
+        field_types[name], read_field = _plan(field.annotation)
+        fields.append((name, read_field, before_validators.get(name, [])))
+
+    serialized_type = TypedDict(dto.__name__, field_types)
+
+    if not any(read_field or validators for _, read_field, validators in fields):
+        names = list(field_types)
+        return serialized_type, lambda obj: {name: getattr(obj, name) for name in names}
+
+    def read(obj: Any) -> dict[str, Any]:
+        data = {}
+
+        for name, read_field, validators in fields:
+            value = getattr(obj, name)
+
+            for validate in validators:
+                value = validate(value)
+
+            data[name] = value if read_field is None else read_field(value)
+
+        return data
+
+    return serialized_type, read
@@ -0,0 +1,36 @@
+import threading
+
+
+class ChangeVersion:
+    """
+    Process-local view of the version of some shared mutable data.
+
+    Versions are allocated by the database for every committed change, so they are
+    comparable across processes and hosts; a process only ever moves its view forward.
+    0 means the version is not known yet.
+    """
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> int:
+        return self._value
+
+    def advance_to(self, value: int) -> None:
+        """Catch up with a version committed elsewhere, never moving backwards."""
+
+        with self._lock:
+            self._value = max(self._value, value)
+
+
+class CompositeVersion:
+    """Read-only version that moves whenever any of the underlying versions moves."""
+
+    def __init__(self, *versions: ChangeVersion) -> None:
+        self._versions = versions
+
+    @property
+    def current(self) -> int:
+        return max(version.current for version in self._versions)
@@ -2,6 +2,7 @@ from .database import Database
 from .base import Base
 from .dao import BaseDAO
 from .config import DbSettings
+from .uow import UnitOfWork
 
 
 __all__ = (
@@ -9,4 +10,5 @@ __all__ = (
     "Base",
     "BaseDAO",
     "DbSettings",
+    "UnitOfWork",
 )
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer
+from sqlalchemy import Integer, Sequence
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -6,3 +6,7 @@ class Base(DeclarativeBase):
     """Base class for all database models, providing a primary key ID."""
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+# Versions of committed changes of cached data, see `BaseDAO.publish_change`
+change_version_seq = Sequence("change_version_seq", metadata=Base.metadata)
@@ -21,6 +21,8 @@ class DbSettings(BaseSettings):
     DB_NAME: str
     DB_USER: str
     DB_PASS: str
+    # Let Postgres encode the hottest list responses instead of building DTOs
+    DB_BUILD_JSON: bool = False
 
     @computed_field  # type: ignore[misc]
     @property
@@ -0,0 +1,62 @@
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, Sequence
+
+
+_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def copy_value(value: Any) -> str:
+    """Encode a value as a field of the COPY text format."""
+
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, bytes):
+        # bytea hex format, its backslash escaped for COPY
+        return "\\\\x" + value.hex()
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+
+    return str(value).translate(_ESCAPES)
+
+
+def copy_line(values: Sequence[Any]) -> str:
+    """Encode values as a line of the COPY text format."""
+
+    return "\t".join(map(copy_value, values)) + "\n"
+
+
+class CopyStream:
+    """
+    File-like reader of rows encoded in the COPY text format, for `copy_expert`.
+    Rows are encoded as they are read, so the whole load is never held in memory.
+    """
+
+    def __init__(self, rows: Iterable[Sequence[Any]]) -> None:
+        self._lines: Iterator[str] = map(copy_line, rows)
+        self._buffer = b""
+        self.rows = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = [self._buffer]
+        length = len(self._buffer)
+
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+
+            if line is None:
+                break
+
+            data = line.encode()
+            chunks.append(data)
+            length += len(data)
+            self.rows += 1
+
+        data = b"".join(chunks)
+
+        if size < 0:
+            size = len(data)
+
+        self._buffer = data[size:]
+        return data[:size]
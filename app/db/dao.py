@@ -1,22 +1,66 @@
 from abc import ABC
-from typing import Any, Callable, Generic, Iterable, Sequence, TypeVar
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Generic,
+    Iterable,
+    Iterator,
+    Sequence,
+    TypeVar,
+)
 
-from sqlalchemy import delete, select, update
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    cast,
+    column,
+    delete,
+    event,
+    func,
+    insert,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
+from pydantic import BaseModel
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Bundle, Session
 
-from .base import Base
+from app.base.version import ChangeVersion
+
+from .base import Base, change_version_seq
+from .copy import CopyStream
+from .json import json_array_agg, json_object, json_value
+from .pagination import JsonPage, Page, decode_cursor, encode_cursor
 
 
 T = TypeVar("T", bound=Base)
 
 
 class BaseDAO(Generic[T], ABC):
-    """Abstract base class for Data Access Objects with CRUD operations."""
+    """
+    Abstract base class for Data Access Objects with CRUD operations.
+
+    Writes are only flushed: the transaction is committed by whoever owns the session,
+    i.e. the request unit of work or the short-lived session of `Database.session`.
+
+    Read methods taking a `projection` DTO select only the columns the DTO needs
+    and return rows with attributes named like its fields instead of model instances.
+    """
 
     model: type[T]
 
-    def __init__(self, session_factory: Callable[[], Session]) -> None:
+    page_keys: tuple[str, ...] = ("id",)
+    """Unique combination of columns that orders the records for keyset pagination."""
+    page_descending: bool = False
+    max_page_size: int = 100
+
+    def __init__(self, session_factory: Callable[[], ContextManager[Session]]) -> None:
         self._sf = session_factory
+        self._json_documents: dict[type[BaseModel], ColumnElement[str]] = {}
 
     def get_all(self) -> Sequence[T]:
         """Get all records"""
@@ -24,44 +68,420 @@ class BaseDAO(Generic[T], ABC):
         with self._sf() as session:
             return session.scalars(select(self.model)).all()
 
+    def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        projection: type[BaseModel] | None = None,
+    ) -> Page[T]:
+        """Get a page of records following the given cursor."""
+
+        return self._paginate(self._select(projection), limit, cursor)
+
+    def get_page_json(
+        self, limit: int, cursor: str | None, projection: type[BaseModel]
+    ) -> JsonPage:
+        """Get a page of records encoded as JSON by the database."""
+
+        return self._paginate_json(self._select_json(projection), limit, cursor)
+
+    def stream(
+        self, chunk_size: int = 1000, projection: type[BaseModel] | None = None
+    ) -> Iterator[Sequence[T]]:
+        """
+        Yield all records in page order, chunk by chunk, fetched through
+        a server-side cursor. Only one chunk is held in memory at a time.
+        """
+
+        return self._stream(self._select(projection), chunk_size)
+
     def get_one(self, id_: int) -> T | None:
         """Retrieve a single record by ID."""
 
         with self._sf() as session:
             return session.get(self.model, id_)
 
-    def create(self, **fields: Any) -> T:
-        """Create a new record with the given fields."""
+    def create(self, projection: type[BaseModel] | None = None, /, **fields: Any) -> T:
+        """
+        Create a new record with the given fields. A single INSERT returns the record,
+        or only the columns of the projection DTO.
+        """
+
+        stmt = (
+            insert(self.model).values(**fields).returning(self._returning(projection))
+        )
+
+        with self._sf() as session:
+            return session.scalars(stmt).one()
+
+    def delete(self, id_: int, projection: type[BaseModel] | None = None) -> T | None:
+        """Delete a record by ID and return it, None if there is no such record."""
+
+        stmt = (
+            delete(self.model)
+            .where(self.model.id == id_)
+            .returning(self._returning(projection))
+        )
+
+        with self._sf() as session:
+            return session.scalars(stmt).one_or_none()
+
+    def update(
+        self, id_: int, projection: type[BaseModel] | None = None, /, **new_data: Any
+    ) -> T | None:
+        """
+        Update a record by ID with new data and return the updated record
+        (or its projection columns), None if there is no such record.
+        """
+
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id_)
+            .values(**new_data)
+            .returning(self._returning(projection))
+        )
+
+        with self._sf() as session:
+            return session.scalars(stmt).one_or_none()
+
+    def bulk_create(
+        self,
+        rows: Sequence[dict[str, Any]],
+        projection: type[BaseModel] | None = None,
+        batch_size: int = 1000,
+    ) -> Sequence[T]:
+        """
+        Create records from dicts of the same fields and return them in the same order.
+        Each batch of up to `batch_size` rows is a single multi-row INSERT ... RETURNING.
+        """
+
+        if not rows:
+            return []
+
+        options = {"insertmanyvalues_page_size": batch_size}
+
+        with self._sf() as session:
+            if projection is None:
+                stmt = insert(self.model).returning(
+                    self.model, sort_by_parameter_order=True
+                )
+                return session.scalars(stmt, rows, execution_options=options).all()
+
+            # The ORM bulk INSERT adds the primary key to RETURNING,
+            # which would clash with the labeled projection columns
+            stmt = insert(self.model.__table__).returning(
+                *self._returned_columns(projection), sort_by_parameter_order=True
+            )
+            return session.execute(stmt, rows, execution_options=options).all()
+
+    def bulk_update(
+        self,
+        rows: Sequence[dict[str, Any]],
+        projection: type[BaseModel] | None = None,
+        batch_size: int = 1000,
+    ) -> Sequence[T]:
+        """
+        Update records from dicts of their `id` and the same other fields.
+        Each batch of up to `batch_size` rows is a single UPDATE ... FROM (VALUES ...),
+        which returns the updated records in no particular order.
+        IDs without a record are skipped, so fewer records may be returned.
+        """
+
+        if not rows:
+            return []
+
+        table = self.model.__table__
+        names = list(rows[0])
+        target, returning = self.model, [self.model]
+
+        if projection is not None:
+            target, returning = table, self._returned_columns(projection)
+
+        updated = []
+
+        with self._sf() as session:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start : start + batch_size]
+                data = values(
+                    *(column(name, table.c[name].type) for name in names), name="data"
+                ).data([tuple(row[name] for name in names) for row in batch])
+
+                # Casts keep the column types when the first row holds NULLs
+                new_data = {
+                    name: cast(data.c[name], table.c[name].type)
+                    for name in names
+                    if name != "id"
+                }
+                stmt = (
+                    update(target)
+                    .where(self.model.id == cast(data.c.id, table.c.id.type))
+                    .values(new_data)
+                    .returning(*returning)
+                )
+
+                if projection is None:
+                    updated.extend(session.scalars(stmt))
+                else:
+                    updated.extend(session.execute(stmt))
+
+        return updated
+
+    def bulk_delete(
+        self,
+        ids: Sequence[int],
+        projection: type[BaseModel] | None = None,
+        batch_size: int = 1000,
+    ) -> Sequence[T]:
+        """
+        Delete records by IDs in batches of `batch_size` and return the deleted ones.
+        IDs without a record are skipped, so fewer records may be returned.
+        """
+
+        deleted = []
+
+        with self._sf() as session:
+            for start in range(0, len(ids), batch_size):
+                stmt = (
+                    delete(self.model)
+                    .where(self.model.id.in_(ids[start : start + batch_size]))
+                    .returning(self._returning(projection))
+                )
+                deleted.extend(session.scalars(stmt))
+
+        return deleted
+
+    def copy(self, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Load rows of values of the columns with COPY, the fastest way to insert
+        a lot of records. Nothing is returned but the number of loaded rows,
+        and the rows are encoded as they are sent, so they can be a generator.
+        """
+
+        stream = CopyStream(rows)
+        sql = f"COPY {self.model.__tablename__} ({', '.join(columns)}) FROM STDIN"
+
+        with self._sf() as session:
+            # COPY goes through the driver cursor on the session's connection
+            connection = session.connection()
+            dbapi_error = connection.dialect.loaded_dbapi.Error
+            cursor = connection.connection.cursor()
+
+            try:
+                cursor.copy_expert(sql, stream)
+            except dbapi_error as e:
+                # Raised like errors of statements executed by SQLAlchemy
+                raise DBAPIError.instance(sql, None, e, dbapi_error) from e
+            finally:
+                cursor.close()
+
+        return stream.rows
+
+    def publish_change(self, channel: str, version: ChangeVersion) -> None:
+        """
+        Give the change made in the current transaction a new version and announce it
+        on the channel. Both this process and the listeners in other ones move to the
+        version only when the transaction commits, i.e. once the change is visible.
+        """
 
-        instance = self.model(**fields)
         with self._sf() as session:
-            session.add(instance)
-            session.commit()
-            session.refresh(instance)  # needs to load all lazy fields
+            # Publishing transactions are serialized, so versions are committed in order
+            lock_key = func.hashtext(change_version_seq.name)
+            session.execute(select(func.pg_advisory_xact_lock(lock_key)))
+            value = session.scalar(select(change_version_seq.next_value()))
+            self.notify(channel, str(value))
+
+            event.listen(
+                session,
+                "after_commit",
+                lambda _: version.advance_to(value),
+                once=True,
+            )
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Call the callback once the current transaction commits."""
 
-        return instance
+        with self._sf() as session:
+            event.listen(session, "after_commit", lambda _: callback(), once=True)
 
-    def delete(self, id_: int) -> None:
-        """Delete a record by ID."""
+    def notify(self, channel: str, payload: str) -> None:
+        """Send a notification to the listeners of the channel once the transaction commits."""
 
         with self._sf() as session:
-            session.execute(delete(self.model).where(self.model.id == id_))
-            session.commit()
+            session.execute(select(func.pg_notify(channel, payload)))
 
-    def update(self, id_: int, **new_data) -> T:
-        """Update a record by ID with new data and return the updated record."""
+    def get_change_version(self) -> int:
+        """Retrieve the version of the latest published change."""
 
         with self._sf() as session:
-            stmt = (
-                update(self.model)
-                .where(self.model.id == id_)
-                .values(**new_data)
-                .returning(self.model)
+            return session.scalar(
+                text(f"SELECT last_value FROM {change_version_seq.name}")
+            )
+
+    def _select(self, projection: type[BaseModel] | None = None) -> Select:
+        """Select model instances, or only the columns of the projection DTO."""
+
+        if projection is None:
+            return select(self.model)
+
+        columns = [
+            self._projected_column(name).label(name) for name in projection.model_fields
+        ]
+        return select(Bundle(self.model.__tablename__, *columns))
+
+    def _projected_column(self, field: str) -> ColumnElement:
+        """Column providing the value of a projection DTO field."""
+
+        return getattr(self.model, field)
+
+    def _returning(self, projection: type[BaseModel] | None = None) -> Any:
+        """What writes return: model instances, or the columns of the projection DTO."""
+
+        if projection is None:
+            return self.model
+
+        return Bundle(self.model.__tablename__, *self._returned_columns(projection))
+
+    def _returned_columns(self, projection: type[BaseModel]) -> list[ColumnElement]:
+        """Labeled columns of the projection DTO fields returned by writes."""
+
+        return [
+            self._returned_column(name).label(name) for name in projection.model_fields
+        ]
+
+    def _returned_column(self, field: str) -> ColumnElement:
+        """
+        Column providing the value of a projection DTO field in the rows returned
+        by writes, which can't join other tables.
+        """
+
+        return self._projected_column(field)
+
+    def _select_json(self, projection: type[BaseModel]) -> Select:
+        """Select the JSON text of the projection DTO for each record."""
+
+        return select(self._json_document(projection))
+
+    def _json_document(self, projection: type[BaseModel]) -> ColumnElement[str]:
+        """Expression encoding a record as JSON text of the projection DTO."""
+
+        # Building the expression takes longer than running the query, keep it
+        if projection not in self._json_documents:
+            self._json_documents[projection] = json_object(
+                [
+                    (name, self._json_field(name, field.annotation))
+                    for name, field in projection.model_fields.items()
+                ]
             )
-            res = session.execute(stmt)
-            session.commit()
-            updated_obj = res.scalar_one()
 
-            session.refresh(updated_obj)  # needs for load all lazy fields
+        return self._json_documents[projection]
+
+    def _json_field(self, field: str, annotation: Any) -> ColumnElement[str]:
+        """Expression encoding the value of a projection DTO field as JSON."""
+
+        return json_value(self._projected_column(field))
+
+    def _stream(self, query: Select, chunk_size: int) -> Iterator[Sequence[T]]:
+        """Yield chunks of model instances selected by the query, in page order."""
+
+        keys = [getattr(self.model, key) for key in self.page_keys]
+        query = query.order_by(
+            *(key.desc() if self.page_descending else key.asc() for key in keys)
+        )
+
+        with self._sf() as session:
+            result = session.scalars(query.execution_options(yield_per=chunk_size))
+            yield from result.partitions()
+
+    def _paginate(
+        self,
+        query: Select,
+        limit: int,
+        cursor: str | None = None,
+        keys: Sequence[ColumnElement] | None = None,
+        descending: bool | None = None,
+    ) -> Page[T]:
+        """
+        Apply keyset pagination to a query selecting model instances.
+        Rows are ordered by the keys and the cursor is the keys of the last returned row,
+        so each page is an index range scan no matter how deep it is.
+        """
+
+        if keys is None:
+            keys = [getattr(self.model, key) for key in self.page_keys]
+
+        limit = min(limit, self.max_page_size)
+        query, _ = self._page_query(query, limit, cursor, keys, descending)
+
+        with self._sf() as session:
+            rows = session.execute(query).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][-len(keys) :])
+
+        return Page(items=[row[0] for row in rows], next_cursor=next_cursor)
+
+    def _paginate_json(
+        self,
+        query: Select,
+        limit: int,
+        cursor: str | None = None,
+        keys: Sequence[ColumnElement] | None = None,
+        descending: bool | None = None,
+    ) -> JsonPage:
+        """
+        Like `_paginate`, for a query selecting JSON text of records. The database joins
+        the page into a JSON array and returns it with the keys of its last row,
+        so there is one result row per page instead of one per record.
+        """
+
+        if keys is None:
+            keys = [getattr(self.model, key) for key in self.page_keys]
+
+        limit = min(limit, self.max_page_size)
+        query, ordering = self._page_query(query, limit, cursor, keys, descending)
+        page = query.add_columns(func.row_number().over(order_by=ordering)).subquery()
+        document, *key_columns, position = page.c
+
+        summary = select(
+            json_array_agg(document, position, where=position <= limit),
+            func.count() > limit,
+            *(func.max(key).filter(position == limit) for key in key_columns),
+        )
+
+        with self._sf() as session:
+            items, has_more, *last_keys = session.execute(summary).one()
+
+        return JsonPage(
+            items=items, next_cursor=encode_cursor(last_keys) if has_more else None
+        )
+
+    def _page_query(
+        self,
+        query: Select,
+        limit: int,
+        cursor: str | None,
+        keys: Sequence[ColumnElement],
+        descending: bool | None,
+    ) -> tuple[Select, list[ColumnElement]]:
+        """
+        Restrict the query to the page following the cursor, plus one row to tell
+        whether there is a next page. The keys are added as the last columns.
+        Returns the query and its ordering.
+        """
+
+        if descending is None:
+            descending = self.page_descending
+
+        row_keys = tuple_(*keys)
+
+        if cursor:
+            after = tuple_(*decode_cursor(cursor, keys))
+            query = query.where(row_keys < after if descending else row_keys > after)
+
+        key_columns = [key.label(f"_page_key_{i}") for i, key in enumerate(keys)]
+        ordering = [key.desc() if descending else key.asc() for key in keys]
+        query = query.add_columns(*key_columns).order_by(*ordering).limit(limit + 1)
 
-            return updated_obj
+        return query, ordering
@@ -1,19 +1,105 @@
-from typing import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, ContextManager, Iterator
 
+from flask import Flask, Response
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from .config import DbSettings
+from .notify import NotificationListener
+from .uow import UnitOfWork
 
 
 class Database:
     """Manages the database connection and provides a session factory."""
 
     def __init__(self, settings: DbSettings) -> None:
-        self._engine = create_engine(settings.DATABASE_URL)
+        # Timestamps are read in UTC, as the JSON built by the database renders them
+        self._engine = create_engine(
+            settings.DATABASE_URL, connect_args={"options": "-c timezone=UTC"}
+        )
         self._session_factory = sessionmaker(self._engine, expire_on_commit=False)
+        self._current_uow: ContextVar[UnitOfWork | None] = ContextVar(
+            "current_uow", default=None
+        )
 
     @property
-    def session_factory(self) -> Callable[[], Session]:
+    def session_factory(self) -> Callable[[], ContextManager[Session]]:
         """Retrieve a callable session factory for database sessions."""
-        return self._session_factory
+        return self.session
+
+    def create_listener(self) -> NotificationListener:
+        """
+        Create a notification listener. It connects outside the pool,
+        so its long-lived connection doesn't hold one of the pooled slots.
+        """
+
+        dialect = self._engine.dialect
+        cargs, cparams = dialect.create_connect_args(self._engine.url)
+
+        return NotificationListener(lambda: dialect.connect(*cargs, **cparams))
+
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        """
+        Provide the session of the active unit of work, if there is one.
+        Otherwise open a short-lived session that commits on exit.
+        """
+
+        uow = self._current_uow.get()
+
+        if uow is not None:
+            yield uow.session
+            return
+
+        with self._session_factory() as session, session.begin():
+            yield session
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[UnitOfWork]:
+        """Share one session between all DAO calls inside the block and commit at the end."""
+
+        uow = UnitOfWork(self._session_factory)
+        token = self._current_uow.set(uow)
+
+        try:
+            yield uow
+            uow.commit()
+        except Exception:
+            uow.rollback()
+            raise
+        finally:
+            uow.close()
+            self._current_uow.reset(token)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Bind a unit of work to each request. It is committed after a successful response
+        (before the body is sent, so commit errors still turn into a 500),
+        rolled back otherwise and closed in the request teardown.
+        """
+
+        @app.before_request
+        def begin_unit_of_work() -> None:
+            self._current_uow.set(UnitOfWork(self._session_factory))
+
+        @app.after_request
+        def finish_unit_of_work(response: Response) -> Response:
+            uow = self._current_uow.get()
+
+            if uow is not None:
+                if response.status_code < 400:
+                    uow.commit()
+                else:
+                    uow.rollback()
+
+            return response
+
+        @app.teardown_request
+        def close_unit_of_work(exc: BaseException | None) -> None:
+            uow = self._current_uow.get()
+
+            if uow is not None:
+                uow.close()
+                self._current_uow.set(None)
@@ -0,0 +1,6 @@
+class DatabaseError(Exception):
+    """Base class for data access errors"""
+
+
+class InvalidCursor(DatabaseError):
+    """Error raised when a pagination cursor is malformed or does not match the ordering"""
@@ -0,0 +1,57 @@
+import json
+from typing import Sequence
+
+from sqlalchemy import ColumnElement, DateTime, Text, case, cast, func, literal
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+
+def json_value(column: ColumnElement) -> ColumnElement[str]:
+    """
+    Expression encoding the column value as JSON text the way pydantic serializes it.
+    Datetimes are rendered in UTC with a `Z` suffix and microseconds only when
+    there are any, matching DTOs read from a session in the UTC time zone.
+    """
+
+    if isinstance(column.type, DateTime):
+        utc = func.timezone("UTC", column)
+        column = func.concat(
+            func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS'),
+            case(
+                (func.date_trunc("second", column) != column, func.to_char(utc, ".US")),
+                else_="",
+            ),
+            "Z",
+        )
+
+    return func.coalesce(cast(func.to_json(column), Text), "null")
+
+
+def json_object(fields: Sequence[tuple[str, ColumnElement[str]]]) -> ColumnElement[str]:
+    """Expression building compact JSON text of an object from encoded field values."""
+
+    parts = []
+    for i, (name, value) in enumerate(fields):
+        parts.append(literal(("," if i else "{") + json.dumps(name) + ":"))
+        parts.append(value)
+
+    parts.append(literal("}"))
+
+    return func.concat(*parts)
+
+
+def json_array_agg(
+    value: ColumnElement[str],
+    order_by: ColumnElement,
+    where: ColumnElement[bool] | None = None,
+) -> ColumnElement[str]:
+    """
+    Aggregate expression joining encoded values of the rows matching `where`
+    into a JSON array, in the given order.
+    """
+
+    items = func.string_agg(value, aggregate_order_by(literal(","), order_by))
+
+    if where is not None:
+        items = items.filter(where)
+
+    return func.concat("[", func.coalesce(items, ""), "]")
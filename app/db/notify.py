@@ -0,0 +1,97 @@
+import logging
+import select
+import threading
+from collections import defaultdict
+from typing import Any, Callable
+
+
+logger = logging.getLogger(__name__)
+
+NotificationHandler = Callable[[str | None], None]
+
+
+class NotificationListener:
+    """
+    Listens to Postgres `NOTIFY` channels on a dedicated connection in a daemon thread
+    and passes each payload to the handlers subscribed to its channel.
+
+    Notifications sent while the connection was down are lost, so after every
+    (re)connect all handlers are called with `None`, meaning "anything may have changed".
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        poll_timeout: float = 5.0,
+        retry_delay: float = 1.0,
+    ) -> None:
+        self._connect = connect
+        self._poll_timeout = poll_timeout
+        self._retry_delay = retry_delay
+        self._handlers: dict[str, list[NotificationHandler]] = defaultdict(list)
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, channel: str, handler: NotificationHandler) -> None:
+        self._handlers[channel].append(handler)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._run, name="db-notification-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            connection = None
+
+            try:
+                connection = self._connect()
+                connection.autocommit = True
+
+                with connection.cursor() as cursor:
+                    for channel in self._handlers:
+                        cursor.execute(f'LISTEN "{channel}"')
+
+                self._dispatch_to_all(None)
+                self._listen(connection)
+            except Exception:
+                logger.exception("Database notification listener failed, reconnecting")
+                self._stopped.wait(self._retry_delay)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def _listen(self, connection: Any) -> None:
+        while not self._stopped.is_set():
+            readable, _, _ = select.select([connection], [], [], self._poll_timeout)
+
+            if not readable:
+                continue
+
+            connection.poll()
+
+            while connection.notifies:
+                notification = connection.notifies.pop(0)
+                self._dispatch(notification.channel, notification.payload)
+
+    def _dispatch(self, channel: str, payload: str | None) -> None:
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Handler of '%s' notifications failed", channel)
+
+    def _dispatch_to_all(self, payload: str | None) -> None:
+        for channel in self._handlers:
+            self._dispatch(channel, payload)
@@ -0,0 +1,80 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, Sequence, TypeVar
+
+from sqlalchemy import ColumnElement
+
+from .exceptions import InvalidCursor
+
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class Page(Generic[T]):
+    """A slice of an ordered result set and the cursor pointing after its last item."""
+
+    items: Sequence[T]
+    next_cursor: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class JsonPage:
+    """A page whose items were already encoded by the database as a JSON array."""
+
+    items: str
+    next_cursor: str | None
+
+    def to_json(self) -> bytes:
+        """Encode the page like `PageDTO`, embedding the items as they are."""
+
+        return b"".join(
+            (
+                b'{"items":',
+                self.items.encode(),
+                b',"next_cursor":',
+                json.dumps(self.next_cursor).encode(),
+                b"}",
+            )
+        )
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Pack the sort key values of the last item of a page into an opaque url-safe token."""
+
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, keys: Sequence[ColumnElement]) -> tuple[Any, ...]:
+    """Unpack a cursor token into sort key values typed after the given key columns."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(urlsafe_b64decode(padded.encode()))
+
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match the ordering keys")
+
+        return tuple(_load_value(value, key) for value, key in zip(values, keys))
+
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise InvalidCursor from e
+
+
+def _load_value(value: Any, key: ColumnElement) -> Any:
+    python_type = key.type.python_type
+
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+
+    if not isinstance(value, (int, float, str)) or isinstance(value, bool):
+        raise TypeError(f"unexpected cursor value {value!r}")
+
+    return python_type(value)
@@ -0,0 +1,45 @@
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+
+class UnitOfWork:
+    """
+    Holds a single lazily opened session shared by every DAO call within one scope
+    (usually one HTTP request), so the whole scope uses one connection and one transaction.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]) -> None:
+        self._sf = session_factory
+        self._session: Session | None = None
+
+    @property
+    def session(self) -> Session:
+        """Retrieve the scope session, opening it on first access."""
+
+        if self._session is None:
+            self._session = self._sf()
+
+        return self._session
+
+    def commit(self) -> None:
+        """Commit pending changes, or roll back if the transaction already failed."""
+
+        if self._session is None:
+            return
+
+        if self._session.is_active:
+            self._session.commit()
+        else:
+            self._session.rollback()
+
+    def rollback(self) -> None:
+        if self._session is not None:
+            self._session.rollback()
+
+    def close(self) -> None:
+        """Release the connection; anything not committed yet is rolled back."""
+
+        if self._session is not None:
+            self._session.close()
+            self._session = None
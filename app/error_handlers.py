@@ -1,9 +1,13 @@
 """Common application-wide exception handlers"""
 
+import math
+
 from flask import Flask, jsonify
 from pydantic import ValidationError
 
-from app.users.exceptions import UserNotFound
+from app.auth.exceptions import LoginThrottled
+from app.db.exceptions import InvalidCursor
+from app.users.exceptions import PwdHashingOverloaded, UserNotFound
 from app.base.response import DtoResponse
 
 
@@ -13,6 +17,22 @@ def register_error_handlers(app: Flask):
     def handle_user_not_found(e: UserNotFound):
         return jsonify({"error": "User not found"}), 404
 
+    @app.errorhandler(PwdHashingOverloaded)
+    def handle_pwd_hashing_overloaded(e: PwdHashingOverloaded):
+        response = jsonify({"error": "Server is busy, try again later"})
+        response.headers["Retry-After"] = "1"
+        return response, 503
+
+    @app.errorhandler(LoginThrottled)
+    def handle_login_throttled(e: LoginThrottled):
+        response = jsonify({"error": "Too many login attempts, try again later"})
+        response.headers["Retry-After"] = str(math.ceil(e.retry_after))
+        return response, 429
+
     @app.errorhandler(ValidationError)
     def handle_validation_error(e: ValidationError):
         return DtoResponse(e.json(), status=400)
+
+    @app.errorhandler(InvalidCursor)
+    def handle_invalid_cursor(e: InvalidCursor):
+        return jsonify({"error": "Invalid pagination cursor"}), 400
@@ -0,0 +1 @@
+RBAC_CHANGES_CHANNEL = "rbac_changes"
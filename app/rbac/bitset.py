@@ -0,0 +1,37 @@
+import threading
+from typing import Iterable
+
+
+class PermissionRegistry:
+    """
+    Assigns every permission name its own bit, so a set of permissions compiles
+    into a single int mask and a permission check becomes one AND.
+
+    Bits are allocated on first use and never reused within the process,
+    so masks compiled earlier stay valid when permissions are added or renamed.
+    """
+
+    def __init__(self) -> None:
+        self._bits: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bit(self, permission: str) -> int:
+        """Retrieve the bit of the permission, allocating one for a new name."""
+
+        bit = self._bits.get(permission)
+
+        if bit is None:
+            with self._lock:
+                bit = self._bits.setdefault(permission, 1 << len(self._bits))
+
+        return bit
+
+    def mask(self, permissions: Iterable[str]) -> int:
+        """Compile permission names into a mask."""
+
+        mask = 0
+
+        for permission in permissions:
+            mask |= self.bit(permission)
+
+        return mask
@@ -1,8 +1,12 @@
-from sqlalchemy import select
+from typing import Any, get_args
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, select
 from sqlalchemy.orm import selectinload
 
 from app.db.dao import BaseDAO
-from app.rbac.models import Permission, Role
+from app.db.json import json_array_agg, json_object, json_value
+from app.rbac.models import Permission, Role, roles_permissions
 
 
 class RoleDAO(BaseDAO[Role]):
@@ -19,6 +23,14 @@ class RoleDAO(BaseDAO[Role]):
 
             return roles_with_permissions.scalars().all()
 
+    def get_all_json(self, projection: type[BaseModel]) -> str:
+        """Get all roles encoded by the database as a JSON array of the projection DTO."""
+
+        with self._sf() as session:
+            return session.scalar(
+                select(json_array_agg(self._json_document(projection), Role.id))
+            )
+
     def get_one(self, id_: int, load_permissions: bool = False) -> Role | None:
         if not load_permissions:
             return super().get_one(id_)
@@ -43,8 +55,8 @@ class RoleDAO(BaseDAO[Role]):
             permission = session.merge(permission)
 
             role.permissions.add(permission)
+            session.flush()
             session.refresh(role, attribute_names=["permissions"])
-            session.commit()
 
             return role
 
@@ -55,7 +67,33 @@ class RoleDAO(BaseDAO[Role]):
             permission = session.merge(permission)
 
             role.permissions.discard(permission)
+            session.flush()
             session.refresh(role, attribute_names=["permissions"])
-            session.commit()
 
             return role
+
+    def get_permission_names(self, name: str) -> set[str]:
+        """Retrieve names of all permissions assigned to the role with given name."""
+        query = select(Permission.name).join(Permission.roles).where(Role.name == name)
+
+        with self._sf() as session:
+            return set(session.scalars(query))
+
+    def _json_field(self, field: str, annotation: Any) -> ColumnElement[str]:
+        if field != "permissions":
+            return super()._json_field(field, annotation)
+
+        (permission_dto,) = get_args(annotation)
+        permission = json_object(
+            [
+                (name, json_value(getattr(Permission, name)))
+                for name in permission_dto.model_fields
+            ]
+        )
+
+        return (
+            select(json_array_agg(permission, Permission.id))
+            .join(roles_permissions)
+            .where(roles_permissions.c.role_id == Role.id)
+            .scalar_subquery()
+        )
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, ConfigDict, RootModel
+from operator import attrgetter
+
+from pydantic import BaseModel, ConfigDict, RootModel, field_validator
 
 
 class CreateRoleDTO(BaseModel):
@@ -26,6 +28,12 @@ class RoleReadDTO(BaseModel):
 class RoleWithPermsReadDTO(RoleReadDTO):
     permissions: list[PermissionReadDTO]
 
+    @field_validator("permissions", mode="before")
+    @classmethod
+    def sort_permissions(cls, v):
+        # Role permissions are a set, keep the output stable
+        return sorted(v, key=attrgetter("id"))
+
 
 PermissionsListReadDTO = RootModel[list[PermissionReadDTO]]
 
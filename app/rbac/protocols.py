@@ -3,11 +3,17 @@ from typing import Protocol
 
 class SupportsIdentity(Protocol):
     id: int
+    role: str
 
 
 class SupportsGetCurrentUser(Protocol):
     def get_current_user(self) -> SupportsIdentity | None: ...
 
 
-class SupportsPermissionCheck(Protocol):
-    def user_has_permission(self, user_id: int, permission: str) -> bool: ...
+class SupportsRolePermissions(Protocol):
+    def get_permission_names(self, role_name: str) -> frozenset[str]: ...
+
+
+class SupportsCurrentVersion(Protocol):
+    @property
+    def current(self) -> int: ...
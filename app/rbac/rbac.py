@@ -3,21 +3,65 @@ from typing import Callable
 
 from flask import jsonify
 
-from app.rbac.protocols import SupportsGetCurrentUser, SupportsPermissionCheck
+from app.rbac.bitset import PermissionRegistry
+from app.rbac.protocols import (
+    SupportsCurrentVersion,
+    SupportsGetCurrentUser,
+    SupportsRolePermissions,
+)
 
 
 class RoleBasedAccessController:
+    """
+    Guards routes with permission checks.
+    Permissions of each role are compiled into a bitmask cached in process and the whole
+    cache is dropped as soon as the RBAC version changes, so in the steady state a check
+    costs no queries, just an AND of the role mask with the bit of the permission.
+    """
+
     def __init__(
         self,
         current_user_getter: SupportsGetCurrentUser,
-        permission_checker: SupportsPermissionCheck,
+        role_permissions_getter: SupportsRolePermissions,
+        rbac_version: SupportsCurrentVersion,
     ):
         self.current_user_getter = current_user_getter
-        self.permission_checker = permission_checker
+        self.role_permissions_getter = role_permissions_getter
+        self.rbac_version = rbac_version
+        self.permissions = PermissionRegistry()
+        # Version and the masks compiled at it, swapped together as one tuple
+        self._role_masks: tuple[int, dict[str, int]] = (rbac_version.current, {})
+
+    def role_mask(self, role_name: str) -> int:
+        """Retrieve the permissions mask of the role, compiling it on a cache miss."""
+
+        version = self.rbac_version.current
+        cached_version, masks = self._role_masks
+
+        if version != cached_version:
+            masks = {}
+            self._role_masks = (version, masks)
+
+        mask = masks.get(role_name)
+
+        if mask is None:
+            names = self.role_permissions_getter.get_permission_names(role_name)
+            mask = self.permissions.mask(names)
+
+            # A change committed while the names were loading may not be in them,
+            # such a mask is used for this check only and never cached.
+            if self.rbac_version.current == version:
+                masks[role_name] = mask
+
+        return mask
+
+    def role_has_permission(self, role_name: str, permission: str) -> bool:
+        return bool(self.role_mask(role_name) & self.permissions.bit(permission))
 
     def permission_required(
         self, permission: str, unless: Callable[..., bool] | None = None
     ):
+        permission_bit = self.permissions.bit(permission)
 
         def decorator(router_func: Callable):
 
@@ -31,9 +75,7 @@ class RoleBasedAccessController:
                 if unless and unless(current_user, *args, **kwargs):
                     return router_func(current_user, *args, **kwargs)
 
-                if not self.permission_checker.user_has_permission(
-                    current_user.id, permission
-                ):
+                if not self.role_mask(current_user.role) & permission_bit:
                     return jsonify({"error": "Permission denied"}), 403
 
                 return router_func(*args, **kwargs)
@@ -1,17 +1,21 @@
 from sqlalchemy.exc import IntegrityError
 
+from app.base.serialization import dump_trusted
+from app.base.version import ChangeVersion
+from app.rbac import RBAC_CHANGES_CHANNEL
 from app.rbac.dao.permission import PermissionDAO
 from app.rbac.dto import PermissionReadDTO, PermissionsListReadDTO
 from app.rbac.exceptions import PermissionAlreadyExists, PermissionNotFound
 
 
 class PermissionService:
-    def __init__(self, permission_dao: PermissionDAO):
+    def __init__(self, permission_dao: PermissionDAO, rbac_version: ChangeVersion):
         self._permission_dao = permission_dao
+        self._rbac_version = rbac_version
 
-    def get_all_permissions(self) -> PermissionsListReadDTO:
+    def get_all_permissions(self) -> bytes:
         permissions = self._permission_dao.get_all()
-        return PermissionsListReadDTO.model_validate(permissions)
+        return dump_trusted(PermissionsListReadDTO, permissions)
 
     def get_permission_by_id(self, permission_id: int) -> PermissionReadDTO:
         permission = self._get_or_raise(permission_id)
@@ -24,6 +28,8 @@ class PermissionService:
         except IntegrityError:
             raise PermissionAlreadyExists
 
+        self._publish_change()
+
         return PermissionReadDTO.model_validate(permission)
 
     def update_permission(
@@ -37,12 +43,18 @@ class PermissionService:
         if not permission:
             raise PermissionNotFound
 
+        self._publish_change()
+
         return PermissionReadDTO.model_validate(permission)
 
     def delete_permission(self, permission_id: int) -> None:
-        self._get_or_raise(permission_id)
+        if self._permission_dao.delete(permission_id) is None:
+            raise PermissionNotFound
+
+        self._publish_change()
 
-        return self._permission_dao.delete(permission_id)
+    def _publish_change(self) -> None:
+        self._permission_dao.publish_change(RBAC_CHANGES_CHANNEL, self._rbac_version)
 
     def _get_or_raise(self, permission_id: int):
         permission = self._permission_dao.get_one(permission_id)
@@ -1,5 +1,8 @@
 from sqlalchemy.exc import IntegrityError
 
+from app.base.serialization import dump_trusted
+from app.base.version import ChangeVersion
+from app.rbac import RBAC_CHANGES_CHANNEL
 from app.rbac.dao.permission import PermissionDAO
 from app.rbac.dao.role import RoleDAO
 from app.rbac.dto import (
@@ -17,18 +20,25 @@ class RoleService:
         role_dao: RoleDAO,
         perm_dao: PermissionDAO,
         base_roles: set[str],
+        rbac_version: ChangeVersion,
         default_role: str = "viewer",
+        build_json_in_db: bool = False,
     ):
         self._role_dao = role_dao
         self._perm_dao = perm_dao
+        self._rbac_version = rbac_version
         self._base_roles = base_roles
         self._default_role = default_role
         self._base_roles.add(default_role)
+        self._build_json_in_db = build_json_in_db
+
+    def get_all_roles(self) -> bytes:
+        """Get all roles, serialized."""
+        if self._build_json_in_db:
+            return self._role_dao.get_all_json(RoleWithPermsReadDTO).encode()
 
-    def get_all_roles(self) -> RolesWithPermsListReadDTO:
-        """Get all roles."""
         roles = self._role_dao.get_all(load_permissions=True)
-        return RolesWithPermsListReadDTO(roles)
+        return dump_trusted(RolesWithPermsListReadDTO, roles)
 
     def get_role_by_id(self, role_id: int) -> RoleWithPermsReadDTO:
         """Get a single role by ID."""
@@ -46,20 +56,24 @@ class RoleService:
 
     def update_role(self, role_id: int, role_data: dict) -> RoleReadDTO:
         """Update a role."""
-        self._get_or_raise(role_id, load_permissions=True)
-
         try:
             updated_role = self._role_dao.update(role_id, **role_data)
         except IntegrityError:
             raise RoleAlreadyExists
 
+        if updated_role is None:
+            raise RoleNotFound
+
+        self._publish_change()
+
         return RoleReadDTO.model_validate(updated_role)
 
     def delete_role(self, role_id: int) -> None:
         """Delete a role."""
-        self._get_or_raise(role_id)
+        if self._role_dao.delete(role_id) is None:
+            raise RoleNotFound
 
-        self._role_dao.delete(role_id)
+        self._publish_change()
 
     def get_role_permissions(self, role_id: int) -> PermissionsListReadDTO:
         """Retrieves all permissions assigned to a role."""
@@ -75,6 +89,7 @@ class RoleService:
             raise PermissionNotFound
 
         updated_role = self._role_dao.add_permission(role, permission)
+        self._publish_change()
 
         return PermissionsListReadDTO.model_validate(updated_role.permissions)
 
@@ -86,9 +101,18 @@ class RoleService:
             raise PermissionNotFound
 
         updated_role = self._role_dao.remove_permission(role, permission)
+        self._publish_change()
 
         return PermissionsListReadDTO.model_validate(updated_role.permissions)
 
+    def get_permission_names(self, role_name: str) -> frozenset[str]:
+        """Retrieves names of all permissions assigned to a role."""
+        return frozenset(self._role_dao.get_permission_names(role_name))
+
+    def _publish_change(self) -> None:
+        # Caches are invalidated as a whole, so the notification carries no keys
+        self._role_dao.publish_change(RBAC_CHANGES_CHANNEL, self._rbac_version)
+
     def _get_or_raise(self, role_id: int, **kwargs):
         role = self._role_dao.get_one(role_id, **kwargs)
 
@@ -0,0 +1 @@
+USERS_CHANGES_CHANNEL = "users_changes"
@@ -0,0 +1,20 @@
+from typing import Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class PwdSettings(BaseSettings):
+    """Config data for password hashing."""
+
+    model_config = SettingsConfigDict(
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    PWD_HASH_SCHEME: Literal["bcrypt", "argon2id"] = "bcrypt"
+    PWD_HASH_ROUNDS: int = 12
+    PWD_ARGON2_TIME_COST: int = 3
+    PWD_ARGON2_MEMORY_COST: int = 65536
+    PWD_ARGON2_PARALLELISM: int = 4
+    PWD_HASH_WORKERS: int = 2
+    PWD_HASH_MAX_PENDING: int = 8
@@ -1,8 +1,9 @@
-from typing import Sequence
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, Select, cast, func, literal_column, select
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
 
 from app.db.dao import BaseDAO
+from app.db.pagination import Page
 from app.rbac.models import Role
 from .models import User
 
@@ -20,18 +21,54 @@ class UserDAO(BaseDAO[User]):
         with self._sf() as session:
             return session.scalar(select(User).where(User.email == email))
 
-    def search_by_name(self, name: str) -> Sequence[User]:
+    def search_by_name(
+        self,
+        name: str,
+        limit: int,
+        cursor: str | None = None,
+        projection: type[BaseModel] | None = None,
+    ) -> Page[User]:
         """Searches for users by a partial or full name match."""
-        query = select(User).where(User.username.ilike(f"%{name}%"))
+        query = self._select(projection).where(User.username.ilike(f"%{name}%"))
 
-        with self._sf() as session:
-            return session.scalars(query).all()
+        return self._paginate(query, limit, cursor)
+
+    def search_by_name_fuzzy(
+        self,
+        name: str,
+        limit: int,
+        cursor: str | None = None,
+        projection: type[BaseModel] | None = None,
+    ) -> Page[User]:
+        """
+        Searches for users with a name similar to the given one (typo tolerant),
+        most similar first. Uses the trigram index on username.
+        """
+        similarity = cast(func.similarity(User.username, name), DOUBLE_PRECISION)
+        query = self._select(projection).where(User.username.op("%")(name))
 
-    def get_with_permissions(self, user_id: int) -> User | None:
-        query = (
-            select(User)
-            .where(User.id == user_id)
-            .options(joinedload(User.role).selectinload(Role.permissions))
+        return self._paginate(
+            query, limit, cursor, keys=[similarity, User.id], descending=True
         )
-        with self._sf() as session:
-            return session.scalar(query)
+
+    def _select(self, projection: type[BaseModel] | None = None) -> Select:
+        if projection is None:
+            return super()._select()
+
+        # Role name is read from the joined role instead of loading the Role entity
+        return super()._select(projection).join(User.role)
+
+    def _projected_column(self, field: str) -> ColumnElement:
+        if field == "role":
+            return Role.name
+
+        return super()._projected_column(field)
+
+    def _returned_column(self, field: str) -> ColumnElement:
+        if field == "role":
+            # RETURNING of INSERT doesn't correlate subqueries to the inserted table,
+            # the row's role_id is referenced as literal column to not add its FROM
+            role_id = literal_column(f"{User.__tablename__}.role_id")
+            return select(Role.name).where(Role.id == role_id).scalar_subquery()
+
+        return super()._returned_column(field)
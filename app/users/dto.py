@@ -7,6 +7,7 @@ from pydantic import (
     field_validator,
 )
 
+from app.base.dto import PageDTO, PageParamsDTO
 from app.users.exceptions import InvalidPassword
 from app.users.pwd import PwdManagerMixin
 
@@ -21,6 +22,16 @@ class UserLoginDTO(BaseModel, PwdManagerMixin):
         if not self.verify_hash(self.password, pwd_hash):
             raise InvalidPassword
 
+    def upgraded_pwd_hash(self, pwd_hash: bytes) -> bytes | None:
+        """
+        Returns a new hash of the verified password if the stored one was made
+        with outdated hashing parameters, otherwise None.
+        """
+        if not self.pwd_needs_rehash(pwd_hash):
+            return None
+
+        return self.gen_hash(self.password)
+
 
 class UserReadDTO(BaseModel):
     """
@@ -42,7 +53,16 @@ class UserReadDTO(BaseModel):
         return v.name
 
 
-UsersListReadDTO = RootModel[list[UserReadDTO]]
+UsersPageReadDTO = PageDTO[UserReadDTO]
+
+
+class UserSearchParamsDTO(PageParamsDTO):
+    """
+    Data Transfer Object (DTO) for user search query parameters.
+    `fuzzy` switches from partial match to typo tolerant similarity search.
+    """
+
+    fuzzy: bool = False
 
 
 class UserCreateDTO(BaseModel, PwdManagerMixin):
@@ -59,3 +79,8 @@ class UserCreateDTO(BaseModel, PwdManagerMixin):
         dumped = super().model_dump(*args, **kwargs, exclude=["password"])
         dumped["password_hash"] = self.gen_hash(self.password)
         return dumped
+
+
+UsersCreateListDTO = RootModel[list[UserCreateDTO]]
+
+UserUpdatesDTO = RootModel[dict[int, UserCreateDTO]]
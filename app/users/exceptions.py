@@ -30,3 +30,7 @@ class UserEmailAlreadyExists(UserError):
 
 class UsernameAlreadyExists(UserError):
     """Error raised when username is already exists"""
+
+
+class PwdHashingOverloaded(UserError):
+    """Error raised when too many password hashes are already queued"""
@@ -1,10 +1,13 @@
 from sqlalchemy import (
+    DateTime,
     ForeignKey,
+    Index,
     String,
     LargeBinary,
 )
 from sqlalchemy.orm import Mapped, relationship
 from sqlalchemy.orm import mapped_column as mc
+from sqlalchemy.sql import func
 
 from app.articles.models import Article
 from app.db.base import Base
@@ -12,12 +15,32 @@ from app.db.base import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index(
+            "ix_users_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_users_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+    )
 
     username: Mapped[str] = mc(String(length=30), unique=True, nullable=False)
     email: Mapped[str] = mc(String(length=40), unique=True, nullable=False)
     password_hash: Mapped[bytes] = mc(LargeBinary, nullable=False)
-
-    role_id: Mapped[int] = mc(ForeignKey("roles.id"), nullable=False)
+    updated_at: Mapped[DateTime] = mc(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    role_id: Mapped[int] = mc(ForeignKey("roles.id"), nullable=False, index=True)
     role: Mapped["Role"] = relationship(back_populates="users", lazy="joined")  # type: ignore
 
     articles: Mapped[list[Article]] = relationship(back_populates="owner")
@@ -1,20 +1,197 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, ClassVar, Protocol, TypeVar
+
 import bcrypt
 
+from app.users.config import PwdSettings
+from app.users.exceptions import PwdHashingOverloaded
+
+
+try:
+    import argon2
+except ImportError:  # pragma: no cover
+    argon2 = None
+
+
+R = TypeVar("R")
+
+
+class PwdScheme(Protocol):
+    """Password hashing algorithm with its cost parameters."""
+
+    name: str
+
+    def hash(self, password: str) -> bytes: ...
+
+    def verify(self, raw_password: str, hashed_password: bytes) -> bool: ...
+
+    def identifies(self, hashed_password: bytes) -> bool:
+        """Whether the hash was produced by this algorithm."""
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        """Whether the hash was produced with other cost parameters than the current."""
+
+
+class BcryptScheme:
+    name = "bcrypt"
+
+    def __init__(self, rounds: int = 12) -> None:
+        self.rounds = rounds
+
+    def hash(self, password: str) -> bytes:
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds))
+
+    def verify(self, raw_password: str, hashed_password: bytes) -> bool:
+        return bcrypt.checkpw(raw_password.encode(), hashed_password)
+
+    def identifies(self, hashed_password: bytes) -> bool:
+        return hashed_password.startswith((b"$2a$", b"$2b$", b"$2y$"))
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        # bcrypt hash layout: $2b$<cost>$<salt and digest>
+        return int(hashed_password[4:6]) != self.rounds
+
+
+class Argon2idScheme:
+    """argon2id hashing, requires the optional `argon2-cffi` package."""
+
+    name = "argon2id"
+
+    def __init__(
+        self, time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 4
+    ) -> None:
+        if argon2 is None:
+            raise RuntimeError("argon2id hashing requires the argon2-cffi package")
+
+        self._hasher = argon2.PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            type=argon2.Type.ID,
+        )
+
+    def hash(self, password: str) -> bytes:
+        return self._hasher.hash(password).encode()
+
+    def verify(self, raw_password: str, hashed_password: bytes) -> bool:
+        try:
+            return self._hasher.verify(hashed_password.decode(), raw_password)
+        except argon2.exceptions.VerificationError:
+            return False
+
+    def identifies(self, hashed_password: bytes) -> bool:
+        return hashed_password.startswith(b"$argon2id$")
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        return self._hasher.check_needs_rehash(hashed_password.decode())
+
+
+class PwdHasher:
+    """
+    Hashes passwords with the configured scheme in a bounded thread pool
+    (both bcrypt and argon2 release the GIL while hashing).
+
+    Hashes made by previously configured schemes still verify; `needs_rehash`
+    tells when such a hash, or one made with other cost parameters, should be replaced.
+
+    At most `workers` hashes run at once and at most `max_pending` more wait for a
+    worker; anything beyond that fails fast with `PwdHashingOverloaded`, so a login
+    burst gets 503s instead of occupying every request thread.
+    """
+
+    def __init__(
+        self,
+        scheme: PwdScheme | None = None,
+        workers: int = 2,
+        max_pending: int = 8,
+        legacy_schemes: tuple[PwdScheme, ...] = (),
+    ) -> None:
+        self.scheme = scheme or BcryptScheme()
+        self._schemes = (self.scheme, *legacy_schemes)
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="pwd-hasher")
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    @classmethod
+    def from_settings(cls, settings: PwdSettings) -> "PwdHasher":
+        """
+        Create a hasher for the configured scheme. The other scheme, when available,
+        is kept for verification, so switching schemes doesn't lock users out.
+        """
+
+        bcrypt_scheme = BcryptScheme(settings.PWD_HASH_ROUNDS)
+        argon2_scheme = None
+
+        if argon2 is not None or settings.PWD_HASH_SCHEME == "argon2id":
+            argon2_scheme = Argon2idScheme(
+                time_cost=settings.PWD_ARGON2_TIME_COST,
+                memory_cost=settings.PWD_ARGON2_MEMORY_COST,
+                parallelism=settings.PWD_ARGON2_PARALLELISM,
+            )
+
+        if settings.PWD_HASH_SCHEME == "argon2id":
+            scheme, legacy_schemes = argon2_scheme, (bcrypt_scheme,)
+        else:
+            scheme = bcrypt_scheme
+            legacy_schemes = (argon2_scheme,) if argon2_scheme else ()
+
+        return cls(
+            scheme,
+            workers=settings.PWD_HASH_WORKERS,
+            max_pending=settings.PWD_HASH_MAX_PENDING,
+            legacy_schemes=legacy_schemes,
+        )
+
+    def hash(self, password: str) -> bytes:
+        return self._run(self.scheme.hash, password)
+
+    def verify(self, raw_password: str, hashed_password: bytes) -> bool:
+        for scheme in self._schemes:
+            if scheme.identifies(hashed_password):
+                return self._run(scheme.verify, raw_password, hashed_password)
+
+        # A hash no configured scheme can check fails the login instead of a 500
+        return False
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        if not self.scheme.identifies(hashed_password):
+            return True
+
+        return self.scheme.needs_rehash(hashed_password)
+
+    def _run(self, func: Callable[..., R], *args) -> R:
+        if not self._slots.acquire(blocking=False):
+            raise PwdHashingOverloaded
+
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(self._release_slot)
+        return future.result()
+
+    def _release_slot(self, _: Future) -> None:
+        self._slots.release()
+
 
 class PwdManagerMixin:
     """Mixin class providing password hashing and verification methods."""
 
+    pwd_hasher: ClassVar[PwdHasher] = PwdHasher()
+
     def gen_hash(self, password: str) -> bytes:
         """Generates a hash for the provided plaintext password."""
 
-        salt = bcrypt.gensalt()
-        pwd_bytes = password.encode()
-        return bcrypt.hashpw(pwd_bytes, salt)
+        return self.pwd_hasher.hash(password)
 
     def verify_hash(self, raw_password: str, hashed_password: bytes) -> bool:
         """Verifies that a plain text password matches with the given hashed password."""
 
-        return bcrypt.checkpw(
-            password=raw_password.encode(),
-            hashed_password=hashed_password,
-        )
+        return self.pwd_hasher.verify(raw_password, hashed_password)
+
+    def pwd_needs_rehash(self, hashed_password: bytes) -> bool:
+        """Checks if the hash was made with outdated hashing parameters."""
+
+        return self.pwd_hasher.needs_rehash(hashed_password)
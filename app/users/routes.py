@@ -3,7 +3,10 @@ from flasgger import swag_from
 
 from app.app import user_service, rbac
 from app.users.exceptions import UserEmailAlreadyExists, UsernameAlreadyExists
-from app.base.response import DtoResponse
+from app.base.dto import ExportParamsDTO
+from app.base.representation import Representation
+from app.base.response import DtoResponse, ExportStreamResponse, conditional_response
+from app.users.dto import UserReadDTO
 from app.users.swagger import docs
 
 router = Blueprint("users", __name__, url_prefix="/users")
@@ -23,20 +26,31 @@ def handle_username_exists(e: UsernameAlreadyExists):
 @swag_from(docs.GET_USERS_LIST)
 def get_users_list():
     search_query = request.args.get("name", None)
+    page_params = request.args.to_dict()
 
     if search_query:
-        users = user_service.search_users_by_name(search_query)
+        users = user_service.search_users_by_name(search_query, page_params)
     else:
-        users = user_service.get_all_users()
+        users = user_service.get_all_users(page_params)
 
-    return DtoResponse(users)
+    return conditional_response(Representation.of_content(users))
+
+
+@router.get("/export")
+@rbac.permission_required("users.can_read")
+@swag_from(docs.GET_USERS_EXPORT)
+def export_users():
+    params = ExportParamsDTO(**request.args.to_dict())
+    users = user_service.export_users()
+
+    return ExportStreamResponse(UserReadDTO, users, params.format, "users")
 
 
 @router.get("/<int:user_id>")
 @swag_from(docs.GET_USER)
 def get_user(user_id: int):
-    user = user_service.get_user_by_id(user_id)
-    return DtoResponse(user)
+    user = user_service.get_user(user_id)
+    return conditional_response(user)
 
 
 @router.post("")
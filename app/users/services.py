@@ -1,7 +1,22 @@
+from typing import Iterator, Sequence
+
 from sqlalchemy.exc import IntegrityError
 
+from app.base.dto import PageParamsDTO
+from app.base.representation import Representation
+from app.base.serialization import dump_trusted
+from app.base.version import ChangeVersion
+from app.users import USERS_CHANGES_CHANNEL
 from app.users.dao import UserDAO
-from app.users.dto import UserCreateDTO, UserLoginDTO, UserReadDTO, UsersListReadDTO
+from app.users.dto import (
+    UserCreateDTO,
+    UserLoginDTO,
+    UserReadDTO,
+    UserSearchParamsDTO,
+    UserUpdatesDTO,
+    UsersCreateListDTO,
+    UsersPageReadDTO,
+)
 from app.users.exceptions import (
     UserEmailAlreadyExists,
     UserNotFound,
@@ -17,21 +32,53 @@ class UserService:
         self,
         user_dao: UserDAO,
         default_role_id_getter: SupportsDefaultRoleIDAttr,
+        users_version: ChangeVersion,
     ) -> None:
         self._dao = user_dao
         self.roles = default_role_id_getter
+        self._users_version = users_version
 
     def get_user_by_id(self, user_id: int) -> UserReadDTO:
         user = self._get_or_raise(user_id)
         return UserReadDTO.model_validate(user)
 
-    def search_users_by_name(self, name: str) -> UsersListReadDTO:
-        found_users = self._dao.search_by_name(name)
-        return UsersListReadDTO(found_users)
+    def get_user(self, user_id: int) -> Representation:
+        """Get the user to send, encoded only when it is sent."""
+        user = self._get_or_raise(user_id)
+
+        # A renamed role changes the user without updating it
+        return Representation.of_record(
+            user, lambda: dump_trusted(UserReadDTO, user), user.role.name
+        )
+
+    def get_user_from_claims(self, claims: dict) -> UserReadDTO:
+        """Build the user from verified token claims, without a DB lookup."""
+        return UserReadDTO.model_construct(
+            id=int(claims["sub"]),
+            username=claims["username"],
+            email=claims["email"],
+            role=claims["role"],
+        )
+
+    def search_users_by_name(self, name: str, search_params: dict) -> bytes:
+        params = UserSearchParamsDTO(**search_params)
+
+        if params.fuzzy:
+            search = self._dao.search_by_name_fuzzy
+        else:
+            search = self._dao.search_by_name
+
+        found_users = search(name, params.limit, params.cursor, UserReadDTO)
+        return dump_trusted(UsersPageReadDTO, found_users)
+
+    def get_all_users(self, page_params: dict) -> bytes:
+        page = PageParamsDTO(**page_params)
+        users = self._dao.get_page(page.limit, page.cursor, UserReadDTO)
+        return dump_trusted(UsersPageReadDTO, users)
 
-    def get_all_users(self) -> UsersListReadDTO:
-        users = self._dao.get_all()
-        return UsersListReadDTO(users)
+    def export_users(self) -> Iterator[Sequence[UserReadDTO]]:
+        """Stream all users chunk by chunk, to be encoded while they are read."""
+        return self._dao.stream(projection=UserReadDTO)
 
     def get_by_credentials(self, credentials: dict) -> UserReadDTO:
         """Authenticates a user using their login credentials."""
@@ -42,6 +89,11 @@ class UserService:
             raise UserNotFound
 
         validated_creds.verify_pwd(user.password_hash)
+
+        upgraded_hash = validated_creds.upgraded_pwd_hash(user.password_hash)
+        if upgraded_hash:
+            self._dao.update(user.id, password_hash=upgraded_hash)
+
         return UserReadDTO.model_validate(user)
 
     def create(self, user_data: dict) -> UserReadDTO:
@@ -52,40 +104,94 @@ class UserService:
             validated_user.role_id = self.roles.default_role_id
 
         try:
-            user = self._dao.create(**validated_user.model_dump())
+            user = self._dao.create(UserReadDTO, **validated_user.model_dump())
         except IntegrityError as e:
             self._catch_user_constraints_violation(e)
 
         return UserReadDTO.model_validate(user)
 
+    def create_users(self, users_data: list[dict]) -> list[UserReadDTO]:
+        """Creates users in batches, after validating all of them."""
+        validated_users = UsersCreateListDTO(users_data).root
+
+        for validated_user in validated_users:
+            if not validated_user.role_id:
+                validated_user.role_id = self.roles.default_role_id
+
+        rows = [validated_user.model_dump() for validated_user in validated_users]
+
+        try:
+            users = self._dao.bulk_create(rows, UserReadDTO)
+        except IntegrityError as e:
+            self._catch_user_constraints_violation(e)
+
+        return [UserReadDTO.model_validate(user) for user in users]
+
     def update_user(self, user_id: int, user_data: dict) -> UserReadDTO:
         """Updates user with provided update data."""
-        self._get_or_raise(user_id)  # Ensure user exists before update
-
         validated_user = UserCreateDTO(**user_data)
 
         if not validated_user.role_id:
             validated_user.role_id = self.roles.default_role_id
 
         try:
-            updated_user = self._dao.update(user_id, **validated_user.model_dump())
+            updated_user = self._dao.update(
+                user_id, UserReadDTO, **validated_user.model_dump()
+            )
         except IntegrityError as e:
             self._catch_user_constraints_violation(e)
 
+        if updated_user is None:
+            raise UserNotFound
+
+        self._publish_change()
+
         return UserReadDTO.model_validate(updated_user)
 
     def delete_user(self, user_id: int) -> None:
-        self._get_or_raise(user_id)
-        self._dao.delete(user_id)
+        if self._dao.delete(user_id) is None:
+            raise UserNotFound
 
-    def user_has_permission(self, user_id: int, permission: str) -> bool:
-        """Check if a user has a specific permission through their role."""
-        user = self._dao.get_with_permissions(user_id)
+        self._publish_change()
 
-        if not user:
+    def update_users(self, updates: dict[int, dict]) -> list[UserReadDTO]:
+        """
+        Updates users by ID in batches. When any of them does not exist UserNotFound
+        is raised, so the transaction doesn't commit a partial update.
+        """
+        validated_updates = UserUpdatesDTO(updates).root
+
+        rows = []
+        for user_id, validated_user in validated_updates.items():
+            if not validated_user.role_id:
+                validated_user.role_id = self.roles.default_role_id
+
+            rows.append({"id": user_id, **validated_user.model_dump()})
+
+        try:
+            updated_users = self._dao.bulk_update(rows, UserReadDTO)
+        except IntegrityError as e:
+            self._catch_user_constraints_violation(e)
+
+        if len(updated_users) != len(rows):
             raise UserNotFound
 
-        return permission in {perm.name for perm in user.role.permissions}
+        self._publish_change()
+
+        return [UserReadDTO.model_validate(user) for user in updated_users]
+
+    def delete_users(self, user_ids: list[int]) -> None:
+        """Deletes users by ID in batches, raising UserNotFound if any is missing."""
+        user_ids = list(dict.fromkeys(user_ids))
+
+        if len(self._dao.bulk_delete(user_ids)) != len(user_ids):
+            raise UserNotFound
+
+        self._publish_change()
+
+    def _publish_change(self) -> None:
+        """Invalidate cached user data in this and, via notification, other workers."""
+        self._dao.publish_change(USERS_CHANGES_CHANNEL, self._users_version)
 
     def _get_or_raise(self, user_id: int):
         user = self._dao.get_one(user_id)
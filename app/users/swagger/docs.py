@@ -1,7 +1,7 @@
 GET_USERS_LIST = {
     "tags": ["Users"],
     "summary": "Retrieve list of users",
-    "description": "Retrieve all users or search users by name",
+    "description": "Retrieve users page by page or search users by name",
     "parameters": [
         {
             "name": "name",
@@ -9,24 +9,75 @@ GET_USERS_LIST = {
             "type": "string",
             "required": False,
             "description": "Optional search term to filter users by name",
-        }
+        },
+        {
+            "name": "fuzzy",
+            "in": "query",
+            "type": "boolean",
+            "required": False,
+            "description": "Typo tolerant search by name similarity, most similar first",
+        },
+        {
+            "name": "limit",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": "Page size, 20 by default and at most 100",
+        },
+        {
+            "name": "cursor",
+            "in": "query",
+            "type": "string",
+            "required": False,
+            "description": "The `next_cursor` value of the previous page",
+        },
     ],
     "responses": {
         "200": {
-            "description": "Successfully retrieved users list",
+            "description": "Successfully retrieved users page",
             "schema": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "id": {"type": "integer"},
-                        "username": {"type": "string"},
-                        "email": {"type": "string"},
-                        "role": {"type": "string"},
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "integer"},
+                                "username": {"type": "string"},
+                                "email": {"type": "string"},
+                                "role": {"type": "string"},
+                            },
+                        },
                     },
+                    "next_cursor": {"type": "string", "x-nullable": True},
                 },
             },
-        }
+        },
+        "400": {"description": "Invalid pagination parameters"},
+        "304": {"description": "Page not modified since the `If-None-Match` ETag"},
+    },
+}
+
+GET_USERS_EXPORT = {
+    "tags": ["Users"],
+    "summary": "Export users",
+    "description": "Download all users as NDJSON or CSV. The file is streamed while "
+    "the users are read, compressed with gzip when the request accepts it.",
+    "produces": ["application/x-ndjson", "text/csv"],
+    "parameters": [
+        {
+            "name": "format",
+            "in": "query",
+            "type": "string",
+            "enum": ["ndjson", "csv"],
+            "required": False,
+            "description": "File format: `ndjson` (default) or `csv`",
+        },
+    ],
+    "responses": {
+        "200": {"description": "The users, in ID order"},
+        "400": {"description": "Invalid export parameters"},
     },
 }
 
@@ -57,6 +108,9 @@ GET_USER = {
             },
         },
         "404": {"description": "User not found"},
+        "304": {
+            "description": "Not modified since the `If-None-Match` ETag or the `If-Modified-Since` date"
+        },
     },
 }
 
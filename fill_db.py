@@ -9,8 +9,43 @@ from app.users.exceptions import UserEmailAlreadyExists, UsernameAlreadyExists
 
 fake = Faker()
 
-
-def create_mock_users(num_users) -> UserReadDTO:
+PERMISSIONS = [
+    # user entities
+    "users.can_create",
+    "users.can_read",
+    "users.can_update",
+    "users.can_delete",
+    # article entities
+    "articles.can_create",
+    "articles.can_read",
+    "articles.can_update",
+    "articles.can_delete",
+    # role entity
+    "roles.can_view",
+    "roles.can_create",
+    "roles.can_read",
+    "roles.can_update",
+    "roles.can_delete",
+    "roles.can_assign_permissions",
+    "roles.can_remove_permissions",
+    # permission entity
+    "permissions.can_view",
+    "permissions.can_create",
+    "permissions.can_read",
+    "permissions.can_update",
+    "permissions.can_delete",
+    # monitoring
+    "auth.can_view_stats",
+]
+
+# Permissions granted to the base roles
+ROLE_PERMISSIONS = {
+    "admin": PERMISSIONS,
+    "editor": ["articles.can_update"],
+}
+
+
+def create_mock_users(num_users) -> list[UserReadDTO]:
     roles = ["admin", "editor", "viewer"]
 
     base_admin = {
@@ -28,63 +63,33 @@ def create_mock_users(num_users) -> UserReadDTO:
             f"Base admin created: email: '{base_admin['email']}' password: '{base_admin['password']}'"
         )
 
-    users = []
-    for _ in range(num_users):
-        role = random.choice(roles)
-        user_data = {
+    users_data = [
+        {
             "username": fake.user_name(),
             "email": fake.email(),
             "password": "password",
-            "role_id": role_service._role_dao.get_by_name(role).id,
+            "role_id": role_service._role_dao.get_by_name(random.choice(roles)).id,
         }
-        user = user_service.create(user_data)
+        for _ in range(num_users)
+    ]
+    users = user_service.create_users(users_data)
+    for user in users:
         print(f"User created: {user}")
-        users.append(user)
     return users
 
 
 def create_mock_articles(users: list[UserReadDTO]):
     for user in users:
-        num_articles = random.randint(2, 5)
-        for _ in range(num_articles):
-            article_data = {
-                "title": fake.sentence(),
-                "body": fake.text(),
-                "owner_id": user.id,
-            }
-            article = articles_service.create_article(user, article_data)
+        articles_data = [
+            {"title": fake.sentence(), "body": fake.text()}
+            for _ in range(random.randint(2, 5))
+        ]
+        for article in articles_service.create_articles(user, articles_data):
             print(f"Article created: '{article.title}'")
 
 
 def assign_permissions():
-    permissions = [
-        # user entities
-        "users.can_create",
-        "users.can_read",
-        "users.can_update",
-        "users.can_delete",
-        # article entities
-        "articles.can_create",
-        "articles.can_read",
-        "articles.can_update",
-        "articles.can_delete",
-        # role entity
-        "roles.can_view",
-        "roles.can_create",
-        "roles.can_read",
-        "roles.can_update",
-        "roles.can_delete",
-        "roles.can_assign_permissions",
-        "roles.can_remove_permissions",
-        # permission entity
-        "permissions.can_view",
-        "permissions.can_create",
-        "permissions.can_read",
-        "permissions.can_update",
-        "permissions.can_delete",
-    ]
-
-    for permission in permissions:
+    for permission in PERMISSIONS:
         try:
             p = permission_service.create_permission({"name": permission})
         except PermissionAlreadyExists:
@@ -92,16 +97,12 @@ def assign_permissions():
         else:
             print(f"Permission created: {p}")
 
-    admin_role = role_service._role_dao.get_by_name("admin")
-    for permission in permissions:
-        perm = permission_service._permission_dao.get_by_name(permission)
-        role_service.assign_permission_to_role(admin_role.id, perm.id)
-        print(f"Permission {permission} assigned to admin role")
-
-    editor_role = role_service._role_dao.get_by_name("editor")
-    editor_perm = permission_service._permission_dao.get_by_name("articles.can_update")
-    role_service.assign_permission_to_role(editor_role.id, editor_perm.id)
-    print(f"Permission {editor_perm.name} assigned to editor role")
+    for role_name, permissions in ROLE_PERMISSIONS.items():
+        role = role_service._role_dao.get_by_name(role_name)
+        for permission in permissions:
+            perm = permission_service._permission_dao.get_by_name(permission)
+            role_service.assign_permission_to_role(role.id, perm.id)
+            print(f"Permission {permission} assigned to {role_name} role")
 
 
 if __name__ == "__main__":
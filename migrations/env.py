@@ -8,6 +8,7 @@ from alembic import context
 from app.users.models import User  # noqa
 from app.articles.models import Article  # noqa
 from app.rbac.models import Role, Permission, roles_permissions  # noqa
+from app.auth.models import RevokedToken  # noqa
 from app.db.base import Base
 from app.app import db_settings
 
@@ -0,0 +1,37 @@
+"""articles full text search
+
+Revision ID: 3f1c8e9a2b7d
+Revises: af34812e6bc2
+Create Date: 2024-12-05 11:02:37.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c8e9a2b7d'
+down_revision: Union[str, None] = 'af34812e6bc2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('articles', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', title), 'A') || "
+            "setweight(to_tsvector('english', body), 'B')",
+            persisted=True,
+        ),
+        nullable=False,
+    ))
+    op.create_index('ix_articles_search_vector', 'articles', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_articles_search_vector', table_name='articles', postgresql_using='gin')
+    op.drop_column('articles', 'search_vector')
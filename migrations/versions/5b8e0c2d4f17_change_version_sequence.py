@@ -0,0 +1,28 @@
+"""change version sequence
+
+Revision ID: 5b8e0c2d4f17
+Revises: 7e9b41d3c6a8
+Create Date: 2024-12-07 11:03:18.264591
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e0c2d4f17'
+down_revision: Union[str, None] = '7e9b41d3c6a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence('change_version_seq')))
+    # Marks 1 as used, so the first published change gets a version above the initial one
+    op.execute("SELECT setval('change_version_seq', 1)")
+
+
+def downgrade() -> None:
+    op.execute(sa.schema.DropSequence(sa.Sequence('change_version_seq')))
@@ -0,0 +1,52 @@
+"""foreign key and sort indexes
+
+Revision ID: 7e9b41d3c6a8
+Revises: c5d2a7e41f90
+Create Date: 2024-12-06 10:21:44.637015
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e9b41d3c6a8'
+down_revision: Union[str, None] = 'c5d2a7e41f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = ('ix_articles_owner_id_created_at_id', 'ix_articles_created_at_id', 'ix_users_role_id')
+
+
+def drop_invalid_indexes() -> None:
+    """
+    An interrupted CREATE INDEX CONCURRENTLY leaves an INVALID index behind,
+    which IF NOT EXISTS would keep, so such leftovers are dropped before a re-run.
+    """
+    if op.get_context().as_sql:
+        return
+
+    invalid = op.get_bind().scalars(sa.text('SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE NOT i.indisvalid AND c.relname IN :names').bindparams(sa.bindparam('names', expanding=True)), {'names': list(INDEXES)}).all()
+
+    for name in invalid:
+        op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS {name}'))
+
+
+# CREATE INDEX CONCURRENTLY does not block writes but can't run inside a transaction,
+# a re-run after an interrupted build skips the indexes that were already built.
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes()
+        op.create_index('ix_articles_owner_id_created_at_id', 'articles', ['owner_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_articles_created_at_id', 'articles', [sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_users_role_id'), 'users', ['role_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_users_role_id'), table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_articles_created_at_id', table_name='articles', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_articles_owner_id_created_at_id', table_name='articles', postgresql_concurrently=True, if_exists=True)
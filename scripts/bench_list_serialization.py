@@ -0,0 +1,92 @@
+"""
+Compares the ways list endpoints can build their JSON on the configured database:
+validated ORM entities, trusted column projections, and JSON built by Postgres.
+
+    python -m scripts.bench_list_serialization --limit 20 100 --samples 200
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable
+
+from app.app import articles_dao, role_dao
+from app.articles.dto import ArticleReadDTO, ArticlesPageReadDTO
+from app.base.serialization import dump_trusted
+from app.rbac.dto import RolesWithPermsListReadDTO, RoleWithPermsReadDTO
+
+
+def measure(build: Callable[[], bytes], samples: int) -> list[float]:
+    build()  # warm up caches and the connection pool
+    timings = []
+
+    for _ in range(samples):
+        start = time.perf_counter()
+        build()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+def articles_paths(limit: int) -> dict[str, Callable[[], bytes]]:
+    return {
+        "orm validated": lambda: ArticlesPageReadDTO.model_validate(
+            articles_dao.get_page(limit)
+        )
+        .model_dump_json()
+        .encode(),
+        "projection": lambda: dump_trusted(
+            ArticlesPageReadDTO, articles_dao.get_page(limit, None, ArticleReadDTO)
+        ),
+        "db json": lambda: articles_dao.get_page_json(
+            limit, None, ArticleReadDTO
+        ).to_json(),
+    }
+
+
+def roles_paths() -> dict[str, Callable[[], bytes]]:
+    return {
+        "orm validated": lambda: RolesWithPermsListReadDTO(
+            role_dao.get_all(load_permissions=True)
+        )
+        .model_dump_json()
+        .encode(),
+        "projection": lambda: dump_trusted(
+            RolesWithPermsListReadDTO, role_dao.get_all(load_permissions=True)
+        ),
+        "db json": lambda: role_dao.get_all_json(RoleWithPermsReadDTO).encode(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--limit", type=int, nargs="+", default=[20, 100])
+    args = parser.parse_args()
+
+    cases = {
+        f"GET /articles limit={limit}": articles_paths(limit) for limit in args.limit
+    }
+    cases["GET /roles"] = roles_paths()
+
+    print(f"{'endpoint':<28} {'path':<14} {'p50 ms':>8} {'p99 ms':>8} {'bytes':>8}")
+
+    for endpoint, paths in cases.items():
+        outputs = set()
+
+        for path, build in paths.items():
+            timings = sorted(measure(build, args.samples))
+            output = build()
+            outputs.add(output)
+            p99 = timings[min(len(timings) - 1, round(0.99 * (len(timings) - 1)))]
+            print(
+                f"{endpoint:<28} {path:<14} {statistics.median(timings):>8.2f} "
+                f"{p99:>8.2f} {len(output):>8}"
+            )
+
+        if len(outputs) > 1:
+            print(f"{endpoint}: paths produced different output")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measures password hash and verify latency on this host for each cost setting,
+to pick PWD_HASH_* parameters that keep login latency within the SLO.
+
+    python -m scripts.bench_pwd_hashing --rounds 10 11 12 13 --samples 20
+    python -m scripts.bench_pwd_hashing --scheme argon2id --argon2-time-cost 2 3 4
+"""
+
+import argparse
+import statistics
+import time
+from typing import Iterator
+
+from app.users.pwd import Argon2idScheme, BcryptScheme, PwdScheme
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def measure(scheme: PwdScheme, samples: int) -> dict[str, list[float]]:
+    password = "correct horse battery staple"
+    timings: dict[str, list[float]] = {"hash": [], "verify": []}
+
+    for _ in range(samples):
+        start = time.perf_counter()
+        pwd_hash = scheme.hash(password)
+        timings["hash"].append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        scheme.verify(password, pwd_hash)
+        timings["verify"].append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+def schemes(args: argparse.Namespace) -> Iterator[tuple[str, PwdScheme]]:
+    if args.scheme == "bcrypt":
+        for rounds in args.rounds:
+            yield f"bcrypt rounds={rounds}", BcryptScheme(rounds)
+        return
+
+    for time_cost in args.argon2_time_cost:
+        params = (
+            f"t={time_cost} m={args.argon2_memory_cost} p={args.argon2_parallelism}"
+        )
+        yield f"argon2id {params}", Argon2idScheme(
+            time_cost=time_cost,
+            memory_cost=args.argon2_memory_cost,
+            parallelism=args.argon2_parallelism,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2id"], default="bcrypt")
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--argon2-time-cost", type=int, nargs="+", default=[2, 3, 4])
+    parser.add_argument("--argon2-memory-cost", type=int, default=65536)
+    parser.add_argument("--argon2-parallelism", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'parameters':<34} {'op':<7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+
+    for label, scheme in schemes(args):
+        for op, timings in measure(scheme, args.samples).items():
+            print(
+                f"{label:<34} {op:<7} {statistics.median(timings):>8.1f} "
+                f"{percentile(timings, 99):>8.1f} {max(timings):>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,3 @@
 #!/bin/sh
 
-gunicorn 'app.app:create_app()' --bind 0.0.0.0:8080 --workers 1
\ No newline at end of file
+gunicorn 'app.app:create_app()' --bind 0.0.0.0:8080 --workers 1 --threads 4
\ No newline at end of file
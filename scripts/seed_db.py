@@ -0,0 +1,242 @@
+"""
+Seeds the configured database with benchmark-scale fake users and articles.
+
+The data is generated by Faker in worker processes and loaded with COPY in one
+transaction. Each chunk of rows is generated from the seed and its own index, so
+the same seed, counts and chunk size give the same data whatever the number of
+workers; with `--truncate` ids start from 1 and the dataset is reproducible.
+Base roles and permissions are created first, skipping those that exist.
+Every seeded user signs in with the password `password`, hashed once.
+
+Rows are written behind the services, so run it while the application is stopped
+or its caches are empty.
+
+    python -m scripts.seed_db --users 100000 --articles 1000000 --seed 42
+    python -m scripts.seed_db --users 1000000 --articles 10000000 --truncate
+"""
+
+import argparse
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from faker import Faker
+from sqlalchemy import func, select, text
+
+from app.app import articles_dao, db, permission_service, role_service, users_dao
+from app.articles.models import Article
+from app.db.dao import BaseDAO
+from app.rbac.exceptions import PermissionAlreadyExists
+from app.users.models import User
+from app.users.pwd import PwdManagerMixin
+from fill_db import PERMISSIONS, ROLE_PERMISSIONS
+
+
+PASSWORD = "password"
+ROLE_WEIGHTS = {"viewer": 90, "editor": 9, "admin": 1}
+
+USER_COLUMNS = ("id", "username", "email", "password_hash", "role_id", "updated_at")
+ARTICLE_COLUMNS = ("title", "body", "created_at", "updated_at", "owner_id")
+
+# Articles are spread over a fixed period, not around the time of seeding
+CREATED_FROM = datetime(2024, 1, 1, tzinfo=timezone.utc)
+CREATED_SPAN = int(timedelta(days=365).total_seconds())
+
+_fake: Faker | None = None
+
+
+def seeded(seed: int, kind: str, chunk: int) -> tuple[Faker, random.Random]:
+    """Faker of the worker process and a random generator, seeded for the chunk."""
+
+    global _fake
+
+    if _fake is None:
+        _fake = Faker()
+
+    chunk_seed = f"{seed}:{kind}:{chunk}"
+    _fake.seed_instance(chunk_seed)
+
+    return _fake, random.Random(chunk_seed)
+
+
+def generate_users(
+    seed: int,
+    chunk: int,
+    first_id: int,
+    count: int,
+    role_ids: Sequence[int],
+    password_hash: bytes,
+) -> list[tuple]:
+    fake, rng = seeded(seed, "users", chunk)
+    weights = list(ROLE_WEIGHTS.values())
+
+    # The id suffix keeps the unique username and email unique at any scale
+    return [
+        (
+            user_id,
+            f"{fake.user_name()[:18]}_{user_id}",
+            f"u{user_id}@{fake.free_email_domain()}",
+            password_hash,
+            rng.choices(role_ids, weights)[0],
+            CREATED_FROM,
+        )
+        for user_id in range(first_id, first_id + count)
+    ]
+
+
+def generate_articles(
+    seed: int, chunk: int, count: int, first_owner_id: int, owners: int
+) -> list[tuple]:
+    fake, rng = seeded(seed, "articles", chunk)
+    rows = []
+
+    for _ in range(count):
+        created_at = CREATED_FROM + timedelta(seconds=rng.randrange(CREATED_SPAN))
+        owner_id = first_owner_id + rng.randrange(owners)
+        rows.append((fake.sentence(), fake.text(), created_at, created_at, owner_id))
+
+    return rows
+
+
+def chunks(total: int, chunk_size: int) -> Iterator[tuple[int, int, int]]:
+    """Index, offset and size of each chunk of the rows."""
+
+    for index, offset in enumerate(range(0, total, chunk_size)):
+        yield index, offset, min(chunk_size, total - offset)
+
+
+def generate(
+    executor: Executor,
+    workers: int,
+    generate_chunk: Callable[..., list[tuple]],
+    chunks_args: Iterable[tuple],
+) -> Iterator[tuple]:
+    """
+    Rows of the chunks generated by the pool, in order. Only a few chunks per worker
+    are in flight, so memory stays bounded however many rows are seeded.
+    """
+
+    pending: deque[Future] = deque()
+
+    for args in chunks_args:
+        pending.append(executor.submit(generate_chunk, *args))
+
+        if len(pending) >= 2 * workers:
+            yield from pending.popleft().result()
+
+    while pending:
+        yield from pending.popleft().result()
+
+
+def report(phase: str, started: float, rows: int = 0) -> None:
+    elapsed = time.perf_counter() - started
+    line = f"{phase:<10} {elapsed:>8.1f} s"
+
+    if rows:
+        line += f" {rows:>10} rows {rows / elapsed:>10.0f} rows/s"
+
+    print(line)
+
+
+def load(name: str, dao: BaseDAO, columns: Sequence[str], rows: Iterable[Any]) -> None:
+    started = time.perf_counter()
+    report(name, started, dao.copy(columns, rows))
+
+
+def seed_rbac() -> None:
+    """Create the base roles, permissions and grants which don't exist yet."""
+
+    role_service.create_base_roles_if_not_exists()
+
+    for name in PERMISSIONS:
+        try:
+            permission_service.create_permission({"name": name})
+        except PermissionAlreadyExists:
+            pass
+
+    for role_name, permissions in ROLE_PERMISSIONS.items():
+        role = role_service._role_dao.get_by_name(role_name)
+        granted = role_service.get_permission_names(role_name)
+
+        for name in set(permissions) - granted:
+            permission = permission_service._permission_dao.get_by_name(name)
+            role_service.assign_permission_to_role(role.id, permission.id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--articles", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="delete all users and articles first, so ids start from 1",
+    )
+    args = parser.parse_args()
+
+    if args.articles and not args.users:
+        parser.error("articles are owned by the seeded users, --users must be positive")
+
+    seed_rbac()
+    role_ids = [role_service._role_dao.get_by_name(name).id for name in ROLE_WEIGHTS]
+    pwd_hash = PwdManagerMixin.pwd_hasher.hash(PASSWORD)
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(args.workers) as executor:
+        with db.unit_of_work() as uow:
+            users_table, articles_table = User.__tablename__, Article.__tablename__
+
+            if args.truncate:
+                uow.session.execute(
+                    text(
+                        f"TRUNCATE {articles_table}, {users_table} RESTART IDENTITY CASCADE"
+                    )
+                )
+
+            # User ids are assigned here, so the articles can reference their owners
+            uow.session.execute(text(f"LOCK TABLE {users_table} IN EXCLUSIVE MODE"))
+            first_user_id = uow.session.scalar(select(func.max(User.id))) or 0
+            first_user_id += 1
+
+            user_chunks = (
+                (args.seed, chunk, first_user_id + offset, size, role_ids, pwd_hash)
+                for chunk, offset, size in chunks(args.users, args.chunk_size)
+            )
+            users = generate(executor, args.workers, generate_users, user_chunks)
+            load("users", users_dao, USER_COLUMNS, users)
+
+            uow.session.execute(
+                select(
+                    func.setval(
+                        func.pg_get_serial_sequence(users_table, "id"),
+                        first_user_id + args.users,
+                        False,
+                    )
+                )
+            )
+
+            article_chunks = (
+                (args.seed, chunk, size, first_user_id, args.users)
+                for chunk, _, size in chunks(args.articles, args.chunk_size)
+            )
+            articles = generate(
+                executor, args.workers, generate_articles, article_chunks
+            )
+            load("articles", articles_dao, ARTICLE_COLUMNS, articles)
+
+            commit_started = time.perf_counter()
+            uow.commit()
+            report("commit", commit_started)
+
+    report("total", started, args.users + args.articles)
+
+
+if __name__ == "__main__":
+    main()
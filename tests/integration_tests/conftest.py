@@ -0,0 +1,74 @@
+from contextlib import contextmanager
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import Connection, create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.config import ENV_FILE_PATH
+from app.db.config import DbSettings
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """
+    Engine for the migrated test database, tests are skipped when it is
+    not configured or unreachable.
+    """
+
+    try:
+        settings = DbSettings(_env_file=ENV_FILE_PATH)
+    except ValidationError:
+        pytest.skip("test database is not configured")
+
+    engine = create_engine(settings.DATABASE_URL)
+
+    try:
+        engine.connect().close()
+    except OperationalError:
+        pytest.skip("test database is not available")
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_connection(db_engine) -> Connection:
+    """Connection inside a transaction that is rolled back after the test."""
+
+    with db_engine.connect() as connection:
+        transaction = connection.begin()
+        yield connection
+        transaction.rollback()
+
+
+@pytest.fixture
+def session_factory(db_connection: Connection):
+    """DAO session factory bound to the test transaction."""
+
+    @contextmanager
+    def session():
+        with Session(bind=db_connection, join_transaction_mode="create_savepoint") as s:
+            yield s
+
+    return session
+
+
+@pytest.fixture
+def session(db_connection: Connection):
+    """Session bound to the test transaction."""
+
+    with Session(bind=db_connection, join_transaction_mode="create_savepoint") as s:
+        yield s
+
+
+@pytest.fixture
+def shared_session_factory(session: Session):
+    """DAO session factory sharing one session, so DAO calls see each other's writes."""
+
+    @contextmanager
+    def session_factory():
+        yield session
+
+    return session_factory
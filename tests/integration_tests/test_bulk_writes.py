@@ -0,0 +1,89 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+
+from app.articles.dao import ArticleDAO
+from app.articles.dto import ArticleReadDTO
+from app.articles.models import Article
+from app.rbac.models import Role
+from app.users.dao import UserDAO
+from app.users.dto import UserReadDTO
+
+
+def create_users(session_factory, count: int) -> list:
+    with session_factory() as session:
+        roles = session.scalars(select(Role).order_by(Role.id)).all()
+
+    users = UserDAO(session_factory).bulk_create(
+        [
+            {
+                "username": f"bulk{i}",
+                "email": f"bulk{i}@example.com",
+                "password_hash": b"hash",
+                "role_id": roles[i % len(roles)].id,
+            }
+            for i in range(count)
+        ],
+        UserReadDTO,
+    )
+
+    assert [user.role for user in users] == [
+        roles[i % len(roles)].name for i in range(count)
+    ]
+    return users
+
+
+def test_bulk_create_returns_rows_in_order(shared_session_factory):
+    owner = create_users(shared_session_factory, 1)[0]
+    articles = ArticleDAO(shared_session_factory)
+
+    created = articles.bulk_create(
+        [{"title": f"t{i}", "body": "b", "owner_id": owner.id} for i in range(25)],
+        ArticleReadDTO,
+        batch_size=10,
+    )
+    instances = articles.bulk_create(
+        [{"title": "instance", "body": "b", "owner_id": owner.id}]
+    )
+
+    assert [article.title for article in created] == [f"t{i}" for i in range(25)]
+    assert ArticleReadDTO.model_validate(created[0]).owner_id == owner.id
+    assert isinstance(instances[0], Article)
+
+
+def test_bulk_update_and_delete_skip_missing_ids(shared_session_factory):
+    users = create_users(shared_session_factory, 3)
+    dao = UserDAO(shared_session_factory)
+
+    with shared_session_factory() as session:
+        admin_id = session.scalar(select(Role.id).where(Role.name == "admin"))
+
+    updated = dao.bulk_update(
+        [{"id": user.id, "role_id": admin_id} for user in users]
+        + [{"id": 0, "role_id": admin_id}],
+        UserReadDTO,
+        batch_size=2,
+    )
+    deleted = dao.bulk_delete([user.id for user in users] + [0], batch_size=2)
+
+    assert sorted(user.id for user in updated) == [user.id for user in users]
+    assert {user.role for user in updated} == {"admin"}
+    assert sorted(user.id for user in deleted) == [user.id for user in users]
+
+
+def test_copy_loads_rows(shared_session_factory):
+    owner = create_users(shared_session_factory, 1)[0]
+    articles = ArticleDAO(shared_session_factory)
+    created_at = datetime(2020, 1, 1, tzinfo=UTC)
+
+    loaded = articles.copy(
+        ["title", "body", "owner_id", "created_at"],
+        ((f"copy {i}", "tab\tnew\nline", owner.id, created_at) for i in range(1000)),
+    )
+
+    with shared_session_factory() as session:
+        article = session.scalar(select(Article).where(Article.title == "copy 7"))
+
+    assert loaded == 1000
+    assert article.body == "tab\tnew\nline"
+    assert article.created_at == created_at
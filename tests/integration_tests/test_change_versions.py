@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+
+from sqlalchemy import Connection
+from sqlalchemy.orm import Session
+
+from app.base.version import ChangeVersion
+from app.rbac import RBAC_CHANGES_CHANNEL
+from app.rbac.dao.role import RoleDAO
+
+
+def test_published_version_is_applied_on_commit(db_connection: Connection):
+    version = ChangeVersion()
+
+    with Session(bind=db_connection, join_transaction_mode="create_savepoint") as s:
+
+        @contextmanager
+        def session():
+            yield s
+
+        dao = RoleDAO(session)
+        latest = dao.get_change_version()
+
+        dao.publish_change(RBAC_CHANGES_CHANNEL, version)
+        dao.publish_change(RBAC_CHANGES_CHANNEL, version)
+        assert version.current == 0
+
+        s.commit()
+
+    assert version.current == latest + 2
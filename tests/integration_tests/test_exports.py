@@ -0,0 +1,60 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import event, select
+
+from app.articles.dao import ArticleDAO
+from app.articles.dto import ArticleReadDTO
+from app.rbac.models import Role
+from app.users.dao import UserDAO
+
+
+def test_stream_filtered_reads_through_named_cursor(session, shared_session_factory):
+    role_id = session.scalar(select(Role.id).limit(1))
+    owners = UserDAO(shared_session_factory).bulk_create(
+        [
+            {
+                "username": f"export{i}",
+                "email": f"export{i}@example.com",
+                "password_hash": b"hash",
+                "role_id": role_id,
+            }
+            for i in range(2)
+        ]
+    )
+    articles = ArticleDAO(shared_session_factory)
+    articles.bulk_create(
+        [
+            {
+                "title": f"{owner.username} {day}",
+                "body": "Body",
+                "owner_id": owner.id,
+                "created_at": datetime(2024, 12, day, tzinfo=UTC),
+            }
+            for owner in owners
+            for day in range(1, 6)
+        ]
+    )
+    cursors = []
+    event.listen(
+        session.connection(),
+        "before_cursor_execute",
+        lambda conn, cursor, *args: cursors.append(cursor.name),
+    )
+
+    chunks = list(
+        articles.stream_filtered(
+            owners[0].id,
+            datetime(2024, 12, 2, tzinfo=UTC),
+            datetime(2024, 12, 5, tzinfo=UTC),
+            chunk_size=2,
+            projection=ArticleReadDTO,
+        )
+    )
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert [article.title for chunk in chunks for article in chunk] == [
+        "export0 4",
+        "export0 3",
+        "export0 2",
+    ]
+    assert cursors[0] is not None
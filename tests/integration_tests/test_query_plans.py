@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import Connection, event, insert, select, text
+
+from app.articles.dao import ArticleDAO
+from app.articles.models import Article
+from app.rbac.models import Role
+from app.users.models import User
+
+
+USERS_COUNT = 50
+ARTICLES_PER_USER = 40
+
+
+@pytest.fixture
+def seeded(db_connection: Connection) -> dict:
+    role_id = db_connection.scalar(
+        insert(Role).values(name="plans-test-role").returning(Role.id)
+    )
+    user_ids = db_connection.scalars(
+        insert(User).returning(User.id),
+        [
+            {
+                "username": f"plans-user-{i}",
+                "email": f"plans-user-{i}@example.com",
+                "password_hash": b"hash",
+                "role_id": role_id,
+            }
+            for i in range(USERS_COUNT)
+        ],
+    ).all()
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    db_connection.execute(
+        insert(Article),
+        [
+            {
+                "title": f"Article {user_id}-{i}",
+                "body": "body",
+                "owner_id": user_id,
+                "created_at": start + timedelta(minutes=user_id * 1000 + i),
+            }
+            for user_id in user_ids
+            for i in range(ARTICLES_PER_USER)
+        ],
+    )
+    db_connection.execute(text("ANALYZE articles"))
+    db_connection.execute(text("ANALYZE users"))
+    # plans must show the index is usable, not that it wins on a small table
+    db_connection.execute(text("SET LOCAL enable_seqscan = off"))
+
+    return {"role_id": role_id, "user_ids": user_ids}
+
+
+def _explain(connection: Connection, statement: str, params) -> str:
+    plan = connection.exec_driver_sql(f"EXPLAIN {statement}", params).scalars()
+    return "\n".join(plan)
+
+
+def _captured_plans(connection: Connection, call) -> list[str]:
+    """Run the DAO call and return the plans of the statements it executed."""
+
+    statements = []
+
+    def capture(conn, cursor, statement, params, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, params))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    return [_explain(connection, s, p) for s, p in statements]
+
+
+def test_user_articles_use_owner_index(
+    seeded: dict, session_factory, db_connection: Connection
+):
+    dao = ArticleDAO(session_factory)
+    owner_id = seeded["user_ids"][0]
+
+    plans = _captured_plans(db_connection, lambda: dao.get_by_owner_id(owner_id, 20))
+
+    assert "ix_articles_owner_id_created_at_id" in plans[-1]
+    assert "Sort" not in plans[-1]
+
+
+def test_articles_feed_uses_created_at_index(
+    seeded: dict, session_factory, db_connection: Connection
+):
+    dao = ArticleDAO(session_factory)
+    first_page = dao.get_page(20)
+
+    plans = _captured_plans(
+        db_connection, lambda: dao.get_page(20, first_page.next_cursor)
+    )
+
+    assert "ix_articles_created_at_id" in plans[-1]
+    assert "Sort" not in plans[-1]
+
+
+def test_users_by_role_use_role_index(seeded: dict, db_connection: Connection):
+    query = select(User.id).where(User.role_id == seeded["role_id"])
+    compiled = query.compile(db_connection)
+
+    plan = _explain(db_connection, str(compiled), compiled.params)
+
+    assert "ix_users_role_id" in plan
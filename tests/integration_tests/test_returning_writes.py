@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import Connection, event, select
+from sqlalchemy.orm import Session
+
+from app.articles.dao import ArticleDAO
+from app.articles.dto import ArticleReadDTO
+from app.rbac.models import Role
+from app.users.dao import UserDAO
+from app.users.dto import UserReadDTO
+
+
+@pytest.fixture
+def statements(db_connection: Connection) -> list[str]:
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement.split(None, 1)[0])
+
+    event.listen(db_connection, "before_cursor_execute", record)
+    yield executed
+    event.remove(db_connection, "before_cursor_execute", record)
+
+
+def test_writes_take_one_statement(
+    session: Session, shared_session_factory, statements: list[str]
+):
+    role = session.scalar(select(Role).limit(1))
+    users = UserDAO(shared_session_factory)
+    articles = ArticleDAO(shared_session_factory)
+    session.flush()
+    statements.clear()
+
+    user = users.create(
+        UserReadDTO,
+        username="returning",
+        email="returning@example.com",
+        password_hash=b"hash",
+        role_id=role.id,
+    )
+    article = articles.create(
+        ArticleReadDTO, title="Title", body="v1", owner_id=user.id
+    )
+    updated = articles.update(article.id, ArticleReadDTO, body="v2")
+    renamed = users.update(user.id, UserReadDTO, username="returning2")
+
+    assert statements == ["INSERT", "INSERT", "UPDATE", "UPDATE"]
+    assert user.role == renamed.role == role.name
+    assert renamed.username == "returning2"
+    assert UserReadDTO.model_validate(renamed).id == user.id
+    assert ArticleReadDTO.model_validate(updated).body == "v2"
+
+    deleted = articles.delete(article.id, ArticleReadDTO)
+
+    assert deleted.owner_id == user.id
+    assert articles.update(article.id, body="v3") is None
+    assert articles.delete(article.id) is None
+    assert statements[4:] == ["DELETE", "UPDATE", "DELETE"]
+
+
+def test_update_returns_refreshed_instance(session: Session, shared_session_factory):
+    role = session.scalar(select(Role).limit(1))
+    users = UserDAO(shared_session_factory)
+    articles = ArticleDAO(shared_session_factory)
+    user = users.create(
+        username="refreshed",
+        email="refreshed@example.com",
+        password_hash=b"hash",
+        role_id=role.id,
+    )
+    article = articles.create(title="Title", body="v1", owner_id=user.id)
+
+    updated = articles.update(article.id, body="v2")
+
+    assert updated is article
+    assert article.body == "v2"
+    assert article.updated_at is not None
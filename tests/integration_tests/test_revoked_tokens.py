@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import Connection
+from sqlalchemy.orm import Session
+
+from app.auth.dao import RevokedTokenDAO
+
+
+def test_revoked_tokens_until_expiration(db_connection: Connection):
+    now = datetime.now(UTC)
+
+    with Session(bind=db_connection, join_transaction_mode="create_savepoint") as s:
+
+        @contextmanager
+        def session():
+            yield s
+
+        dao = RevokedTokenDAO(session)
+
+        dao.revoke("active", now + timedelta(hours=1))
+        dao.revoke("active", now + timedelta(hours=1))
+        dao.revoke("expired", now - timedelta(hours=1))
+
+        assert dao.is_revoked("active")
+        assert dao.get_active_jtis() == ["active"]
+
+        dao.delete_expired()
+        assert not dao.is_revoked("expired")
@@ -6,6 +6,7 @@ from flask import Flask, json
 
 from app.articles.exceptions import ArticleNotFound
 from app.articles.services import ArticleService
+from app.base.representation import Representation
 from app.users.dto import UserReadDTO
 
 
@@ -58,7 +59,7 @@ def test_get_articles_list_without_search(
     mock_articles = [mock_article, mock_article]
     mock_articles_json = json.dumps(mock_articles)
 
-    articles_service.get_all_articles.return_value = mock_articles_json
+    articles_service.get_all_articles.return_value = mock_articles_json.encode()
 
     response = client.get("/articles")
 
@@ -76,13 +77,15 @@ def test_get_articles_list_with_search(
     mock_articles = [mock_article]
     mock_articles_json = json.dumps(mock_articles)
 
-    articles_service.search_articles.return_value = mock_articles_json
+    articles_service.search_articles.return_value = mock_articles_json.encode()
 
     response = client.get(f"/articles?query={search_q}")
 
     assert response.status_code == 200
     assert response.json == mock_articles
-    articles_service.search_articles.assert_called_once_with(search_q)
+    articles_service.search_articles.assert_called_once_with(
+        search_q, {"query": search_q}
+    )
 
 
 @patch("app.articles.routes.articles_service")
@@ -95,13 +98,13 @@ def test_get_user_articles(
     mock_articles = [mock_article]
     mock_articles_json = json.dumps(mock_articles)
 
-    articles_service.get_user_articles.return_value = mock_articles_json
+    articles_service.get_user_articles.return_value = mock_articles_json.encode()
 
     response = client.get(f"/users/{user_id}/articles")
 
     assert response.status_code == 200
     assert response.json == mock_articles
-    articles_service.get_user_articles.assert_called_once_with(user_id)
+    articles_service.get_user_articles.assert_called_once_with(user_id, {})
 
 
 @patch("app.articles.routes.articles_service")
@@ -112,14 +115,45 @@ def test_get_article_by_id(
     mock_article_json: str,
 ):
     article_id = mock_article["id"]
-    articles_service.get_article_by_id.return_value = mock_article_json
+    articles_service.get_article.return_value = Representation(
+        "etag", None, lambda: mock_article_json.encode()
+    )
 
     response = client.get(f"/articles/{article_id}")
 
     assert response.status_code == 200
     assert response.json == mock_article
 
-    articles_service.get_article_by_id.assert_called_once_with(article_id)
+    articles_service.get_article.assert_called_once_with(article_id)
+
+
+@patch("app.articles.routes.articles_service")
+def test_get_article_not_modified(
+    articles_service: ArticleService,
+    client: FlaskClient,
+):
+    encode = MagicMock()
+    articles_service.get_article.return_value = Representation("etag", None, encode)
+
+    response = client.get("/articles/1", headers={"If-None-Match": 'W/"etag"'})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == 'W/"etag"'
+    encode.assert_not_called()
+
+
+@patch("app.articles.routes.articles_service")
+def test_get_user_articles_not_modified(
+    articles_service: ArticleService,
+    client: FlaskClient,
+):
+    articles_service.get_user_articles.return_value = b"[]"
+    etag = client.get("/users/1/articles").headers["ETag"]
+
+    response = client.get("/users/1/articles", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
 
 
 @patch("app.articles.routes.articles_service")
@@ -128,9 +162,56 @@ def test_get_article_not_found(
     client: FlaskClient,
 ):
     article_id = 999
-    articles_service.get_article_by_id.side_effect = ArticleNotFound
+    articles_service.get_article.side_effect = ArticleNotFound
 
     response = client.get(f"/articles/{article_id}")
 
     assert response.status_code == 404
     assert response.json == {"error": "Article not found"}
+
+
+@patch("app.articles.routes.db")
+@patch("app.articles.routes.auth_service")
+@patch("app.articles.routes.articles_service")
+def test_import_articles_streams_results(
+    articles_service: ArticleService,
+    auth_service: MagicMock,
+    db: MagicMock,
+    client: FlaskClient,
+    mock_current_user: MagicMock,
+):
+    auth_service.get_current_user.return_value = mock_current_user
+    uow = db.unit_of_work.return_value.__enter__.return_value
+
+    def import_articles(creator, lines, batch_size, on_batch):
+        assert list(lines) == [b'{"title": "A", "body": "1"}\n', b"{}\n"]
+        yield b'{"created":1,"failed":1}\n'
+
+    articles_service.import_articles.side_effect = import_articles
+
+    response = client.post(
+        "/articles:bulk?batch_size=10&atomic=false",
+        data=b'{"title": "A", "body": "1"}\n{}\n',
+        content_type="application/x-ndjson",
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.data == b'{"created":1,"failed":1}\n'
+    args = articles_service.import_articles.call_args.args
+    assert args[0] is mock_current_user
+    assert args[2] == 10
+    assert articles_service.import_articles.call_args.kwargs == {"on_batch": uow.commit}
+
+
+@patch("app.articles.routes.articles_service")
+def test_export_articles(articles_service: ArticleService, client: FlaskClient):
+    articles_service.export_articles.return_value = iter([])
+
+    response = client.get("/articles/export?format=csv&owner_id=2")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert response.data == b"title,body,id,owner_id,created_at\r\n"
+    (params,), _ = articles_service.export_articles.call_args
+    assert params.owner_id == 2
@@ -1,10 +1,17 @@
+import json
+from datetime import UTC, datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
 
+from app.articles.dto import ArticleExportParamsDTO, ArticleReadDTO
 from app.articles.exceptions import ArticleNotFound
 from app.articles.services import ArticleService
 from app.articles.dao import ArticleDAO
+from app.base.cache import MemoryResponseCache
+from app.db.pagination import JsonPage, Page
 
 
 @pytest.fixture
@@ -36,7 +43,9 @@ def test_create_article(
     assert result.title == mock_article_data["title"]
     assert result.body == mock_article_data["body"]
 
-    article_service._dao.create.assert_called_once_with(**mock_article_data, owner_id=1)
+    article_service._dao.create.assert_called_once_with(
+        ArticleReadDTO, **mock_article_data, owner_id=1
+    )
 
 
 def test_get_article_by_id(
@@ -72,7 +81,9 @@ def test_create_article_success(
 
     assert result.title == mock_article_data["title"]
     assert result.body == mock_article_data["body"]
-    article_service._dao.create.assert_called_once_with(**mock_article_data, owner_id=1)
+    article_service._dao.create.assert_called_once_with(
+        ArticleReadDTO, **mock_article_data, owner_id=1
+    )
 
 
 def test_create_article_missing_field(article_service: ArticleService):
@@ -86,65 +97,375 @@ def test_create_article_missing_field(article_service: ArticleService):
 def test_delete_article_success(article_service: ArticleService) -> None:
     article_id = 1
 
-    article_service._dao.get_one.return_value = MagicMock(id=article_id)
-    article_service._dao.delete.return_value = None
+    article_service._dao.delete.return_value = MagicMock(id=article_id)
 
     article_service.delete_article(article_id)
 
-    article_service._dao.delete.assert_called_once_with(article_id)
+    article_service._dao.delete.assert_called_once_with(article_id, ArticleReadDTO)
+    article_service._dao.get_one.assert_not_called()
 
 
 def test_delete_article_not_found(article_service: ArticleService) -> None:
     article_id = 999
-    article_service._dao.get_one.return_value = None
+    article_service._dao.delete.return_value = None
 
     with pytest.raises(ArticleNotFound):
         article_service.delete_article(article_id)
 
-    article_service._dao.get_one.assert_called_once_with(article_id)
+    article_service._dao.get_one.assert_not_called()
+
+
+def test_create_articles_in_bulk(
+    article_service: ArticleService, stored_article: MagicMock
+) -> None:
+    article_service._dao.bulk_create.return_value = [stored_article]
+
+    result = article_service.create_articles(
+        MagicMock(id=2), [{"title": "Title", "body": "Body"}]
+    )
+
+    assert [article.id for article in result] == [1]
+    article_service._dao.bulk_create.assert_called_once_with(
+        [{"title": "Title", "body": "Body", "owner_id": 2}], ArticleReadDTO
+    )
+
+
+def test_create_articles_validates_all_before_writing(
+    article_service: ArticleService,
+) -> None:
+    with pytest.raises(ValidationError) as error:
+        article_service.create_articles(
+            MagicMock(id=2), [{"title": "Title", "body": "Body"}, {"title": "Title"}]
+        )
+
+    assert error.value.errors()[0]["loc"] == (1, "body")
+    article_service._dao.bulk_create.assert_not_called()
+
+
+def test_update_articles_in_bulk(
+    article_service: ArticleService, stored_article: MagicMock
+) -> None:
+    article_service._dao.bulk_update.return_value = [stored_article]
+
+    result = article_service.update_articles({1: {"title": "Title", "body": "Body"}})
+
+    assert result[0].title == "Title"
+    article_service._dao.bulk_update.assert_called_once_with(
+        [{"id": 1, "title": "Title", "body": "Body"}], ArticleReadDTO
+    )
+
+
+def test_update_articles_not_found(
+    article_service: ArticleService, stored_article: MagicMock
+) -> None:
+    article_service._dao.bulk_update.return_value = [stored_article]
+
+    with pytest.raises(ArticleNotFound):
+        article_service.update_articles(
+            {1: {"title": "Title", "body": "Body"}, 999: {"title": "T", "body": "B"}}
+        )
+
+
+def test_delete_articles_not_found(
+    article_service: ArticleService, stored_article: MagicMock
+) -> None:
+    article_service._dao.bulk_delete.return_value = [stored_article]
+
+    with pytest.raises(ArticleNotFound):
+        article_service.delete_articles([1, 999, 1])
+
+    article_service._dao.bulk_delete.assert_called_once_with([1, 999], ArticleReadDTO)
+
+
+def test_import_articles_in_batches(article_service: ArticleService) -> None:
+    article_service._dao.copy.side_effect = lambda columns, rows: len(rows)
+    on_batch = MagicMock()
+    lines = [
+        b'{"title": "A", "body": "1"}\n',
+        b'{"title": "B"}\n',
+        b"\n",
+        b'{"title": "C", "body": "2"}\n',
+        b'{"title": "D", "body": "3"}',
+    ]
+
+    result = list(article_service.import_articles(MagicMock(id=2), lines, 2, on_batch))
+
+    assert [json.loads(line) for line in result] == [
+        {
+            "line": 2,
+            "errors": [{"type": "missing", "loc": ["body"], "msg": "Field required"}],
+        },
+        {"created": 3, "failed": 1},
+    ]
+    assert article_service._dao.copy.call_args_list[0].args == (
+        ("title", "body", "owner_id"),
+        [("A", "1", 2), ("C", "2", 2)],
+    )
+    assert article_service._dao.copy.call_args_list[1].args[1] == [("D", "3", 2)]
+    assert on_batch.call_count == 2
+
+
+def test_import_articles_reads_lines_lazily(article_service: ArticleService) -> None:
+    article_service._dao.copy.side_effect = lambda columns, rows: len(rows)
+    lines = iter([b"{}\n", b'{"title": "A", "body": "1"}\n'])
+
+    result = article_service.import_articles(MagicMock(id=2), lines, 1)
+
+    assert json.loads(next(result))["line"] == 1
+    assert next(lines, None) is not None
+
+
+def test_import_articles_reports_aborted_import(
+    article_service: ArticleService,
+) -> None:
+    article_service._dao.copy.side_effect = [
+        1,
+        DBAPIError("COPY", None, Exception("invalid byte sequence")),
+    ]
+    lines = [b'{"title": "A", "body": "1"}', b'{"title": "B", "body": "2"}']
+
+    result = article_service.import_articles(MagicMock(id=2), lines, 1, MagicMock())
+
+    assert json.loads(next(result)) == {
+        "created": 1,
+        "failed": 0,
+        "error": "Loading a batch failed, the import was aborted",
+    }
+    with pytest.raises(DBAPIError):
+        next(result)
+
+
+def test_export_articles_streams_filtered_articles(
+    article_service: ArticleService,
+) -> None:
+    created_from = datetime(2024, 12, 1, tzinfo=UTC)
+    params = ArticleExportParamsDTO(owner_id=2, created_from=created_from)
+
+    chunks = article_service.export_articles(params)
+
+    assert chunks is article_service._dao.stream_filtered.return_value
+    article_service._dao.stream_filtered.assert_called_once_with(
+        2, created_from, None, projection=ArticleReadDTO
+    )
 
 
 def test_get_user_articles_success(article_service: ArticleService) -> None:
     user_id = 1
+    created_at = datetime(2024, 12, 1, tzinfo=UTC)
     mock_articles = [
         MagicMock(id=1, title="Article 1", body="Body 1", owner_id=user_id),
         MagicMock(id=2, title="Article 2", body="Body 2", owner_id=user_id),
     ]
-    article_service._dao.get_by_owner_id.return_value = mock_articles
+    for article in mock_articles:
+        article.created_at = created_at
+    article_service._dao.get_by_owner_id.return_value = Page(mock_articles, "next")
+
+    result = json.loads(article_service.get_user_articles(user_id, {"limit": "2"}))
+
+    assert len(result["items"]) == 2
+    assert result["items"][0]["title"] == "Article 1"
+    assert result["items"][1]["title"] == "Article 2"
+    assert result["items"][0]["created_at"] == "2024-12-01T00:00:00Z"
+    assert result["next_cursor"] == "next"
+    article_service._dao.get_by_owner_id.assert_called_once_with(
+        user_id, 2, None, ArticleReadDTO
+    )
+
+
+def test_get_all_articles_default_page(article_service: ArticleService) -> None:
+    article_service._dao.get_page.return_value = Page([], None)
+
+    result = json.loads(article_service.get_all_articles({}))
+
+    assert result == {"items": [], "next_cursor": None}
+    article_service._dao.get_page.assert_called_once_with(20, None, ArticleReadDTO)
+
+
+def test_get_user_articles_built_in_db() -> None:
+    mock_dao = MagicMock(ArticleDAO)
+    mock_dao.get_by_owner_id_json.return_value = JsonPage('[{"id":1}]', "next")
+    article_service = ArticleService(mock_dao, build_json_in_db=True)
 
-    result = article_service.get_user_articles(user_id)
+    result = article_service.get_user_articles(1, {"limit": "2"})
 
-    assert len(result.root) == 2
-    assert result.root[0].title == "Article 1"
-    assert result.root[1].title == "Article 2"
-    article_service._dao.get_by_owner_id.assert_called_once_with(user_id)
+    assert result == b'{"items":[{"id":1}],"next_cursor":"next"}'
+    mock_dao.get_by_owner_id_json.assert_called_once_with(1, 2, None, ArticleReadDTO)
+    mock_dao.get_by_owner_id.assert_not_called()
+
+
+def test_get_all_articles_invalid_limit(article_service: ArticleService) -> None:
+    with pytest.raises(ValueError):
+        article_service.get_all_articles({"limit": "0"})
 
 
 def test_update_article_success(
     article_service: ArticleService, mock_article: MagicMock, mock_article_data: dict
 ) -> None:
-    with patch.object(article_service, "_get_or_raise", return_value=None):
-        article_id = 1
-        article_service._dao.update.return_value = mock_article
+    article_id = 1
+    article_service._dao.update.return_value = mock_article
 
-        result = article_service.update_article(article_id, mock_article_data)
+    result = article_service.update_article(article_id, mock_article_data)
 
-        assert result.title == mock_article_data["title"]
-        assert result.body == mock_article_data["body"]
+    assert result.title == mock_article_data["title"]
+    assert result.body == mock_article_data["body"]
 
-        article_service._dao.update.assert_called_once_with(
-            article_id, **mock_article_data
-        )
-        article_service._get_or_raise.assert_called_once_with(article_id)
+    article_service._dao.update.assert_called_once_with(
+        article_id, ArticleReadDTO, **mock_article_data
+    )
+    article_service._dao.get_one.assert_not_called()
 
 
 def test_update_article_not_found(
     article_service: ArticleService, mock_article_data: dict
 ) -> None:
     article_id = 999
-    article_service._dao.get_one.return_value = None
+    article_service._dao.update.return_value = None
 
     with pytest.raises(ArticleNotFound):
         article_service.update_article(article_id, mock_article_data)
 
-    article_service._dao.get_one.assert_called_once_with(article_id)
+    article_service._dao.get_one.assert_not_called()
+
+
+def test_search_articles_full_text_by_default(article_service: ArticleService) -> None:
+    article_service._dao.search_full_text.return_value = Page([], None)
+
+    result = json.loads(article_service.search_articles("python", {"query": "python"}))
+
+    assert result["items"] == []
+    article_service._dao.search_full_text.assert_called_once_with(
+        "python", 20, None, ArticleReadDTO
+    )
+    article_service._dao.search_by_title_or_body.assert_not_called()
+
+
+def test_search_articles_substring_mode(article_service: ArticleService) -> None:
+    article_service._dao.search_by_title_or_body.return_value = Page([], None)
+
+    article_service.search_articles("pyth", {"mode": "substring", "limit": "5"})
+
+    article_service._dao.search_by_title_or_body.assert_called_once_with(
+        "pyth", 5, None, ArticleReadDTO
+    )
+    article_service._dao.search_full_text.assert_not_called()
+
+
+def test_search_articles_unknown_mode(article_service: ArticleService) -> None:
+    with pytest.raises(ValueError):
+        article_service.search_articles("python", {"mode": "regex"})
+
+
+@pytest.fixture
+def cached_article_service() -> ArticleService:
+    return ArticleService(MagicMock(ArticleDAO), cache=MemoryResponseCache())
+
+
+@pytest.fixture
+def stored_article() -> MagicMock:
+    return MagicMock(
+        id=1,
+        title="Title",
+        body="Body",
+        owner_id=2,
+        created_at=datetime(2024, 12, 1, tzinfo=UTC),
+        updated_at=datetime(2024, 12, 2, tzinfo=UTC),
+    )
+
+
+def test_get_article_not_encoded_until_sent(
+    article_service: ArticleService, stored_article: MagicMock
+) -> None:
+    article_service._dao.get_one.return_value = stored_article
+
+    with patch("app.articles.services.dump_trusted") as dump:
+        article = article_service.get_article(1)
+
+        dump.assert_not_called()
+
+    assert article.last_modified == stored_article.updated_at
+    assert json.loads(article.encode())["title"] == "Title"
+
+
+def test_get_article_is_cached_when_sent(
+    cached_article_service: ArticleService, stored_article: MagicMock
+) -> None:
+    dao = cached_article_service._dao
+    dao.get_one.return_value = stored_article
+
+    first = cached_article_service.get_article(1)
+    assert cached_article_service.get_article(1).etag == first.etag
+    assert dao.get_one.call_count == 2
+
+    body = first.encode()
+    cached = cached_article_service.get_article(1)
+
+    assert dao.get_one.call_count == 2
+    assert (cached.etag, cached.last_modified) == (first.etag, first.last_modified)
+    assert cached.encode() == body
+
+
+def test_get_user_articles_cached_per_page(
+    cached_article_service: ArticleService,
+) -> None:
+    dao = cached_article_service._dao
+    dao.get_by_owner_id.return_value = Page([], None)
+
+    cached_article_service.get_user_articles(2, {"limit": "5"})
+    cached_article_service.get_user_articles(2, {"limit": "5"})
+    cached_article_service.get_user_articles(2, {"limit": "5", "cursor": "next"})
+
+    assert dao.get_by_owner_id.call_count == 2
+
+
+def test_update_article_invalidates_cache_on_commit(
+    cached_article_service: ArticleService,
+    stored_article: MagicMock,
+    mock_article_data: dict,
+) -> None:
+    dao = cached_article_service._dao
+    dao.get_one.return_value = dao.update.return_value = stored_article
+    dao.get_by_owner_id.return_value = Page([], None)
+    cached_article_service.get_article(1).encode()
+    cached_article_service.get_user_articles(2, {})
+
+    cached_article_service.update_article(1, mock_article_data)
+
+    dao.notify.assert_called_once_with("articles_cache", "article:1 owner:2:articles")
+    cached_article_service.get_article(1)
+    assert dao.get_one.call_count == 1
+
+    (on_commit,), _ = dao.on_commit.call_args
+    on_commit()
+    cached_article_service.get_article(1)
+    cached_article_service.get_user_articles(2, {})
+
+    assert dao.get_one.call_count == 2
+    assert dao.get_by_owner_id.call_count == 2
+
+
+def test_bulk_writes_invalidate_each_article_and_owner_once(
+    cached_article_service: ArticleService,
+) -> None:
+    dao = cached_article_service._dao
+    dao.bulk_delete.return_value = [
+        MagicMock(id=1, owner_id=2),
+        MagicMock(id=3, owner_id=2),
+    ]
+
+    cached_article_service.delete_articles([1, 3])
+
+    dao.notify.assert_called_once_with(
+        "articles_cache", "article:1 article:3 owner:2:articles"
+    )
+
+
+def test_import_articles_invalidates_owner_once_per_transaction(
+    cached_article_service: ArticleService,
+) -> None:
+    dao = cached_article_service._dao
+    dao.copy.side_effect = lambda columns, rows: len(rows)
+    lines = [b'{"title": "A", "body": "1"}'] * 3
+
+    list(cached_article_service.import_articles(MagicMock(id=2), lines, 1))
+
+    dao.notify.assert_called_once_with("articles_cache", "owner:2:articles")
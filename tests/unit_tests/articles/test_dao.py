@@ -1,8 +1,14 @@
+from datetime import datetime
 from unittest.mock import MagicMock
 
 import pytest
 
 from app.articles.dao import ArticleDAO
+from app.articles.models import Article
+from app.db.exceptions import InvalidCursor
+from app.db.pagination import decode_cursor
+from app.rbac.models import Role  # noqa: F401, models needed to configure mappers
+from app.users.models import User  # noqa: F401
 
 
 @pytest.fixture
@@ -11,29 +17,78 @@ def article_dao() -> ArticleDAO:
     return ArticleDAO(mock_session_factory)
 
 
+def _row(article: MagicMock) -> tuple:
+    return (article, article.created_at, article.id)
+
+
 def test_get_by_owner_id(article_dao: ArticleDAO):
     mock_session = MagicMock()
     article_dao._sf.return_value.__enter__.return_value = mock_session
-    mock_session.scalars.return_value.all.return_value = [
-        MagicMock(id=1, title="Article 1", body="Body of article 1", owner_id=1),
-        MagicMock(id=2, title="Article 2", body="Body of article 2", owner_id=1),
+    mock_session.execute.return_value.all.return_value = [
+        _row(MagicMock(id=2, title="Article 2", created_at=datetime(2024, 12, 2))),
+        _row(MagicMock(id=1, title="Article 1", created_at=datetime(2024, 12, 1))),
+    ]
+
+    result = article_dao.get_by_owner_id(1, limit=2)
+
+    assert len(result.items) == 2
+    assert result.items[0].title == "Article 2"
+    assert result.items[1].title == "Article 1"
+    assert result.next_cursor is None
+
+
+def test_get_by_owner_id_next_cursor(article_dao: ArticleDAO):
+    mock_session = MagicMock()
+    article_dao._sf.return_value.__enter__.return_value = mock_session
+    mock_session.execute.return_value.all.return_value = [
+        _row(MagicMock(id=3, title="Article 3", created_at=datetime(2024, 12, 3))),
+        _row(MagicMock(id=2, title="Article 2", created_at=datetime(2024, 12, 2))),
     ]
 
-    result = article_dao.get_by_owner_id(1)
+    result = article_dao.get_by_owner_id(1, limit=1)
+
+    assert len(result.items) == 1
+    assert result.items[0].title == "Article 3"
+    assert decode_cursor(result.next_cursor, [Article.created_at, Article.id]) == (
+        datetime(2024, 12, 3),
+        3,
+    )
 
-    assert len(result) == 2
-    assert result[0].title == "Article 1"
-    assert result[1].title == "Article 2"
+    query = mock_session.execute.call_args.args[0]
+    assert query._limit_clause.value == 2
+
+
+def test_get_by_owner_id_invalid_cursor(article_dao: ArticleDAO):
+    with pytest.raises(InvalidCursor):
+        article_dao.get_by_owner_id(1, limit=1, cursor="not a cursor")
 
 
 def test_search_by_title_or_body(article_dao: ArticleDAO):
     mock_session = MagicMock()
     article_dao._sf.return_value.__enter__.return_value = mock_session
-    mock_session.scalars.return_value.all.return_value = [
-        MagicMock(id=1, title="Article 1", body="Search body", owner_id=1)
+    mock_session.execute.return_value.all.return_value = [
+        _row(MagicMock(id=1, title="Article 1", created_at=datetime(2024, 12, 1)))
+    ]
+
+    result = article_dao.search_by_title_or_body("Search", limit=20)
+
+    assert len(result.items) == 1
+    assert result.items[0].title == "Article 1"
+
+
+def test_search_full_text_ranked_cursor(article_dao: ArticleDAO):
+    mock_session = MagicMock()
+    article_dao._sf.return_value.__enter__.return_value = mock_session
+    mock_session.execute.return_value.all.return_value = [
+        (MagicMock(id=7, title="Python"), 0.6079271, 7),
+        (MagicMock(id=3, title="Python tips"), 0.0607927, 3),
     ]
 
-    result = article_dao.search_by_title_or_body("Search")
+    result = article_dao.search_full_text("python", limit=1)
+
+    assert [article.id for article in result.items] == [7]
+    assert result.next_cursor is not None
 
-    assert len(result) == 1
-    assert result[0].title == "Article 1"
+    query = str(mock_session.execute.call_args.args[0])
+    assert "websearch_to_tsquery" in query
+    assert "ts_rank" in query
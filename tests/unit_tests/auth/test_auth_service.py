@@ -12,6 +12,7 @@ from app.auth.services import AuthService
 def jwt_manager() -> JwtManager:
     manager = MagicMock()
     manager.create_token.return_value = "jwt token"
+    manager.read_claims.return_value = {"sub": "1"}
     return manager
 
 
@@ -69,3 +70,218 @@ def test_login_required(auth_service: AuthService, test_app: Flask):
             response, status_code = protected_route()
             assert status_code == 401
             assert response.get_json() == {"error": "not authenticated"}
+
+
+@pytest.fixture
+def claims_auth_service(mock_user_service) -> AuthService:
+    jwt_manager = JwtManager("HS256", "secret", timedelta(minutes=1))
+    return AuthService(jwt_manager, mock_user_service, MagicMock(current=10))
+
+
+@pytest.fixture
+def user_with_claims() -> MagicMock:
+    return MagicMock(id=1, username="andry", email="andry@mail.com", role="editor")
+
+
+def test_login_embeds_user_claims(
+    claims_auth_service: AuthService,
+    mock_user_service: MagicMock,
+    user_with_claims: MagicMock,
+    test_app: Flask,
+):
+    mock_user_service.get_by_credentials.return_value = user_with_claims
+
+    with test_app.test_request_context():
+        response = claims_auth_service.login_user({})
+
+    claims = claims_auth_service._jwt_manager.read_claims(response.get_json()["token"])
+    assert claims["sub"] == "1"
+    assert claims["role"] == "editor"
+    assert claims["ver"] == 10
+
+
+def test_get_current_user_from_fresh_claims(
+    claims_auth_service: AuthService,
+    mock_user_service: MagicMock,
+    user_with_claims: MagicMock,
+    test_app: Flask,
+):
+    token = claims_auth_service._create_token(user_with_claims)
+
+    with test_app.test_request_context(
+        headers={"Cookie": f"{claims_auth_service.cookie_name}={token}"}
+    ):
+        claims_auth_service.get_current_user()
+
+    mock_user_service.get_user_by_id.assert_not_called()
+    claims = mock_user_service.get_user_from_claims.call_args.args[0]
+    assert claims["username"] == "andry"
+
+
+def test_get_current_user_with_stale_claims_reissues_token(
+    claims_auth_service: AuthService,
+    mock_user_service: MagicMock,
+    user_with_claims: MagicMock,
+    test_app: Flask,
+):
+    token = claims_auth_service._create_token(user_with_claims)
+    claims_auth_service._claims_version.current = 11
+    mock_user_service.get_user_by_id.return_value = user_with_claims
+
+    @test_app.get("/me")
+    def me():
+        user = claims_auth_service.get_current_user()
+        return {"id": user.id}
+
+    client = test_app.test_client()
+    client.set_cookie(claims_auth_service.cookie_name, token)
+    response = client.get("/me")
+
+    mock_user_service.get_user_by_id.assert_called_once_with("1")
+    fresh_token = client.get_cookie(claims_auth_service.cookie_name).value
+    fresh_claims = claims_auth_service._jwt_manager.read_claims(fresh_token)
+    old_claims = claims_auth_service._jwt_manager.read_claims(token)
+    assert response.status_code == 200
+    assert fresh_claims["ver"] == 11
+    assert fresh_claims["exp"] == old_claims["exp"]
+
+
+def test_get_current_user_ignores_claims_until_version_is_loaded(
+    claims_auth_service: AuthService,
+    mock_user_service: MagicMock,
+    user_with_claims: MagicMock,
+    test_app: Flask,
+):
+    token = claims_auth_service._create_token(user_with_claims)
+    claims_auth_service._claims_version.current = 0
+    mock_user_service.get_user_by_id.return_value = user_with_claims
+
+    @test_app.get("/me")
+    def me():
+        user = claims_auth_service.get_current_user()
+        return {"id": user.id}
+
+    client = test_app.test_client()
+    client.set_cookie(claims_auth_service.cookie_name, token)
+    response = client.get("/me")
+
+    assert response.status_code == 200
+    mock_user_service.get_user_by_id.assert_called_once_with("1")
+    mock_user_service.get_user_from_claims.assert_not_called()
+    assert "Set-Cookie" not in response.headers
+
+
+def test_logout_user_forgets_token(
+    auth_service: AuthService, jwt_manager: MagicMock, test_app: Flask
+):
+    with test_app.test_request_context(
+        headers={"Cookie": f"{auth_service.cookie_name}=some-token"}
+    ):
+        response = auth_service.logout_user()
+
+    jwt_manager.forget_token.assert_any_call("some-token")
+    assert f"{auth_service.cookie_name}=;" in response.headers["Set-Cookie"]
+
+
+@pytest.fixture
+def revocations() -> MagicMock:
+    store = MagicMock()
+    store.is_revoked.return_value = False
+    return store
+
+
+@pytest.fixture
+def revoking_auth_service(mock_user_service, revocations) -> AuthService:
+    jwt_manager = JwtManager("HS256", "secret", timedelta(minutes=1))
+    return AuthService(jwt_manager, mock_user_service, revocations=revocations)
+
+
+def test_login_issues_access_and_refresh_tokens(
+    revoking_auth_service: AuthService, test_app: Flask
+):
+    with test_app.test_request_context():
+        response = revoking_auth_service.login_user({})
+
+    body = response.get_json()
+    read_claims = revoking_auth_service._jwt_manager.read_claims
+    assert read_claims(body["token"])["typ"] == "access"
+    assert read_claims(body["refresh_token"])["typ"] == "refresh"
+    assert (
+        read_claims(body["token"])["jti"] != read_claims(body["refresh_token"])["jti"]
+    )
+
+
+def test_get_current_user_rejects_refresh_token(
+    revoking_auth_service: AuthService, test_app: Flask
+):
+    with test_app.test_request_context():
+        refresh_token = revoking_auth_service.login_user({}).get_json()["refresh_token"]
+
+    with test_app.test_request_context(
+        headers={"Cookie": f"{revoking_auth_service.cookie_name}={refresh_token}"}
+    ):
+        assert revoking_auth_service.get_current_user() is None
+
+
+def test_get_current_user_rejects_revoked_token(
+    revoking_auth_service: AuthService, revocations: MagicMock, test_app: Flask
+):
+    token = revoking_auth_service._create_token(MagicMock(id=1))
+    revocations.is_revoked.return_value = True
+
+    with test_app.test_request_context(
+        headers={"Cookie": f"{revoking_auth_service.cookie_name}={token}"}
+    ):
+        assert revoking_auth_service.get_current_user() is None
+
+    jti = revoking_auth_service._jwt_manager.read_claims(token)["jti"]
+    revocations.is_revoked.assert_called_once_with(jti)
+
+
+def test_refresh_tokens_rotates_refresh_token(
+    revoking_auth_service: AuthService, revocations: MagicMock, test_app: Flask
+):
+    with test_app.test_request_context():
+        refresh_token = revoking_auth_service.login_user({}).get_json()["refresh_token"]
+
+    with test_app.test_request_context(
+        headers={
+            "Cookie": f"{revoking_auth_service.refresh_cookie_name}={refresh_token}"
+        }
+    ):
+        response = revoking_auth_service.refresh_tokens()
+
+    old_claims = revoking_auth_service._jwt_manager.read_claims(refresh_token)
+    new_refresh_token = response.get_json()["refresh_token"]
+    revocations.revoke.assert_called_once_with(old_claims["jti"], old_claims["exp"])
+    assert new_refresh_token != refresh_token
+
+
+def test_refresh_tokens_rejects_access_token(
+    revoking_auth_service: AuthService, revocations: MagicMock, test_app: Flask
+):
+    token = revoking_auth_service._create_token(MagicMock(id=1))
+
+    with test_app.test_request_context(
+        headers={"Cookie": f"{revoking_auth_service.refresh_cookie_name}={token}"}
+    ):
+        with pytest.raises(NotAuthenticated):
+            revoking_auth_service.refresh_tokens()
+
+    revocations.revoke.assert_not_called()
+
+
+def test_logout_user_revokes_tokens(
+    revoking_auth_service: AuthService, revocations: MagicMock, test_app: Flask
+):
+    with test_app.test_request_context():
+        body = revoking_auth_service.login_user({}).get_json()
+
+    cookies = (
+        f"{revoking_auth_service.cookie_name}={body['token']}; "
+        f"{revoking_auth_service.refresh_cookie_name}={body['refresh_token']}"
+    )
+    with test_app.test_request_context(headers={"Cookie": cookies}):
+        revoking_auth_service.logout_user()
+
+    assert revocations.revoke.call_count == 2
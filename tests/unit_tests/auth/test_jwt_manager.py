@@ -4,6 +4,7 @@ import pytest
 import jwt
 from unittest.mock import patch
 
+from app.auth.cache import VerifiedTokenCache
 from app.auth.exceptions import AuthenticationExpired, NotAuthenticated
 from app.auth.jwt import JwtManager
 
@@ -85,3 +86,40 @@ def test_read_token_invalid_signature(mock_decode, jwt_manager: JwtManager):
 def test_read_token_invalid_token(jwt_manager: JwtManager):
     with pytest.raises(NotAuthenticated):
         jwt_manager.read_token("invalid.token.data")
+
+
+def test_create_token_with_claims(jwt_manager: JwtManager, user_id):
+    token = jwt_manager.create_token(user_id, {"role": "admin", "exp": 2000000000})
+
+    claims = jwt_manager.read_claims(token)
+
+    assert claims == {"sub": str(user_id), "role": "admin", "exp": 2000000000}
+
+
+def test_read_claims_verifies_cached_token_once(user_id):
+    jwt_manager = JwtManager(
+        "HS256", "test_secret", timedelta(minutes=1), cache=VerifiedTokenCache()
+    )
+    token = jwt_manager.create_token(user_id)
+
+    with patch("app.auth.jwt.jwt.decode", wraps=jwt.decode) as mock_decode:
+        assert jwt_manager.read_token(token) == str(user_id)
+        assert jwt_manager.read_token(token) == str(user_id)
+
+    mock_decode.assert_called_once()
+    assert jwt_manager.cache_stats()["hits"] == 1
+
+
+def test_forgotten_token_is_verified_again(user_id):
+    jwt_manager = JwtManager(
+        "HS256", "test_secret", timedelta(minutes=1), cache=VerifiedTokenCache()
+    )
+    token = jwt_manager.create_token(user_id)
+    jwt_manager.read_token(token)
+
+    jwt_manager.forget_token(token)
+
+    with patch("app.auth.jwt.jwt.decode", wraps=jwt.decode) as mock_decode:
+        jwt_manager.read_token(token)
+
+    mock_decode.assert_called_once()
@@ -0,0 +1,84 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.auth.bloom import BloomFilter
+from app.auth.revocation import RevocationStore
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    items = [f"token-{i}" for i in range(1000)]
+
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(1000, error_rate=0.01)
+
+    for i in range(1000):
+        bloom.add(f"token-{i}")
+
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+@pytest.fixture
+def dao() -> MagicMock:
+    dao = MagicMock()
+    dao.get_active_jtis.return_value = ["revoked"]
+    dao.is_revoked.return_value = True
+    return dao
+
+
+@pytest.fixture
+def store(dao: MagicMock) -> RevocationStore:
+    return RevocationStore(dao, capacity=10)
+
+
+def test_is_revoked_queries_database_until_loaded(store: RevocationStore, dao):
+    dao.is_revoked.return_value = False
+
+    assert not store.is_revoked("token")
+    dao.is_revoked.assert_called_once_with("token")
+
+
+def test_is_revoked_skips_query_for_tokens_outside_filter(store: RevocationStore, dao):
+    store.handle_notification(None)
+
+    assert not store.is_revoked("token")
+    assert store.is_revoked("revoked")
+    dao.is_revoked.assert_called_once_with("revoked")
+
+
+def test_notified_revocation_is_added_to_filter(store: RevocationStore, dao):
+    store.handle_notification(None)
+    store.handle_notification("other")
+
+    assert store.is_revoked("other")
+    dao.is_revoked.assert_called_once_with("other")
+
+
+def test_revoke_stores_and_announces_token(store: RevocationStore, dao):
+    store.handle_notification(None)
+    exp = datetime(2030, 1, 1, tzinfo=UTC)
+
+    store.revoke("token", exp.timestamp())
+
+    dao.revoke.assert_called_once_with("token", exp)
+    dao.notify.assert_called_once_with(RevocationStore.channel, "token")
+    assert store.is_revoked("token")
+
+
+def test_full_filter_is_reloaded(store: RevocationStore, dao):
+    store.handle_notification(None)
+
+    for i in range(10):
+        store.handle_notification(f"token-{i}")
+
+    assert dao.get_active_jtis.call_count == 2
+    dao.delete_expired.assert_called()
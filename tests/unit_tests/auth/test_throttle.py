@@ -0,0 +1,103 @@
+import multiprocessing
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from app.auth.exceptions import LoginThrottled
+from app.auth.services import AuthService
+from app.auth.throttle import LoginThrottle, SharedTokenBuckets
+
+
+def test_bucket_runs_out_of_tokens():
+    buckets = SharedTokenBuckets(slots=64)
+
+    with patch("app.auth.throttle.time.time", return_value=1000.0):
+        waits = [buckets.take("key", capacity=3, rate=0.5) for _ in range(4)]
+
+    assert waits == [0, 0, 0, 2.0]
+
+
+def test_bucket_is_refilled_over_time():
+    buckets = SharedTokenBuckets(slots=64)
+
+    with patch("app.auth.throttle.time.time", return_value=1000.0):
+        buckets.take("key", capacity=1, rate=0.5)
+        assert buckets.take("key", capacity=1, rate=0.5)
+
+    with patch("app.auth.throttle.time.time", return_value=1002.0):
+        assert buckets.take("key", capacity=1, rate=0.5) == 0
+
+
+def test_buckets_of_different_keys_are_independent():
+    buckets = SharedTokenBuckets(slots=64)
+
+    buckets.take("first", capacity=1, rate=0.01)
+
+    assert buckets.take("first", capacity=1, rate=0.01)
+    assert buckets.take("second", capacity=1, rate=0.01) == 0
+
+
+def test_stalest_bucket_is_reused_when_table_is_full():
+    buckets = SharedTokenBuckets(slots=1)
+    buckets.probes = 1
+
+    buckets.take("first", capacity=1, rate=0.01)
+    buckets.take("second", capacity=1, rate=0.01)
+
+    assert buckets.take("second", capacity=1, rate=0.01)
+    assert buckets.take("first", capacity=1, rate=0.01) == 0
+
+
+def _take_in_child(path: str, results) -> None:
+    results.put(SharedTokenBuckets(slots=64, path=path).take("key", 1, 0.01))
+
+
+def test_file_buckets_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / "buckets")
+    SharedTokenBuckets(slots=64, path=path).take("key", 1, 0.01)
+
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    child = ctx.Process(target=_take_in_child, args=(path, results))
+    child.start()
+    child.join(timeout=5)
+
+    assert results.get(timeout=5) > 0
+
+
+def test_throttle_counts_attempts_per_email():
+    throttle = LoginThrottle(SharedTokenBuckets(slots=64), email_attempts=2)
+
+    throttle.check("user@mail.com", "10.0.0.1")
+    throttle.check("USER@mail.com ", "10.0.0.2")
+
+    with pytest.raises(LoginThrottled):
+        throttle.check("user@mail.com", "10.0.0.3")
+
+    throttle.check("other@mail.com", "10.0.0.1")
+
+
+def test_throttle_counts_attempts_per_ip():
+    throttle = LoginThrottle(SharedTokenBuckets(slots=64), ip_attempts=1)
+
+    throttle.check("first@mail.com", "10.0.0.1")
+
+    with pytest.raises(LoginThrottled) as exc_info:
+        throttle.check("second@mail.com", "10.0.0.1")
+
+    assert exc_info.value.retry_after > 0
+
+
+def test_throttled_login_does_not_check_credentials(test_app: Flask):
+    user_service = MagicMock()
+    throttle = MagicMock()
+    throttle.check.side_effect = LoginThrottled(30)
+    auth_service = AuthService(MagicMock(), user_service, login_throttle=throttle)
+
+    with test_app.test_request_context(environ_base={"REMOTE_ADDR": "10.0.0.1"}):
+        with pytest.raises(LoginThrottled):
+            auth_service.login_user({"email": "user@mail.com", "password": "x"})
+
+    throttle.check.assert_called_once_with("user@mail.com", "10.0.0.1")
+    user_service.get_by_credentials.assert_not_called()
@@ -0,0 +1,51 @@
+import time
+
+from app.auth.cache import VerifiedTokenCache
+
+
+def test_hit_after_put_and_miss_after_evict():
+    cache = VerifiedTokenCache()
+    claims = {"sub": "1", "exp": time.time() + 60}
+
+    assert cache.get("token") is None
+    cache.put("token", claims)
+    assert cache.get("token") is claims
+
+    cache.evict("token")
+    assert cache.get("token") is None
+    assert cache.stats() == {
+        "size": 0,
+        "max_size": 10_000,
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+    }
+
+
+def test_expired_token_is_dropped():
+    cache = VerifiedTokenCache()
+    cache.put("token", {"sub": "1", "exp": time.time() - 1})
+
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_token_is_evicted():
+    cache = VerifiedTokenCache(max_size=2)
+    exp = time.time() + 60
+
+    cache.put("first", {"sub": "1", "exp": exp})
+    cache.put("second", {"sub": "2", "exp": exp})
+    cache.get("first")
+    cache.put("third", {"sub": "3", "exp": exp})
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_tokens_are_not_kept_in_plain_text():
+    cache = VerifiedTokenCache()
+    cache.put("secret.jwt.token", {"sub": "1", "exp": time.time() + 60})
+
+    assert "secret.jwt.token" not in cache._entries
@@ -0,0 +1,168 @@
+import socketserver
+import threading
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from app.base.cache import MemoryResponseCache, RedisResponseCache, RespClient
+
+
+def test_memory_cache_evicts_least_recently_used_by_size():
+    cache = MemoryResponseCache(max_bytes=10)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    cache.get("a")
+
+    cache.set("c", b"cccc")
+
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"cccc"
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_cache_replaces_value_and_skips_oversized():
+    cache = MemoryResponseCache(max_bytes=4)
+    cache.set("a", b"aa")
+    cache.set("a", b"aaa")
+    cache.set("b", b"bbbbb")
+
+    assert cache.get("a") == b"aaa"
+    assert cache.get("b") is None
+    assert cache.stats()["bytes"] == 3
+
+
+def test_memory_cache_deletes_all_variants_of_key():
+    cache = MemoryResponseCache()
+    cache.set("owner:1", b"page 1", "20:")
+    cache.set("owner:1", b"page 2", "20:next")
+    cache.set("owner:2", b"page", "20:")
+
+    cache.delete("owner:1")
+
+    assert cache.get("owner:1", "20:") is None
+    assert cache.get("owner:1", "20:next") is None
+    assert cache.get("owner:2", "20:") == b"page"
+    assert cache.stats()["bytes"] == 4
+
+
+def test_memory_cache_entries_expire():
+    cache = MemoryResponseCache(ttl=10)
+
+    with patch("app.base.cache.time.monotonic", return_value=100):
+        cache.set("a", b"a")
+
+    with patch("app.base.cache.time.monotonic", return_value=109):
+        assert cache.get("a") == b"a"
+
+    with patch("app.base.cache.time.monotonic", return_value=110):
+        assert cache.get("a") is None
+
+
+def test_memory_cache_notifications():
+    cache = MemoryResponseCache()
+    cache.set("a", b"a")
+    cache.set("b", b"b")
+    cache.set("c", b"c")
+
+    cache.handle_notification("a b")
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == b"c"
+
+    cache.handle_notification(None)
+
+    assert cache.get("c") is None
+    assert cache.stats()["bytes"] == 0
+
+
+class _RespStandIn(socketserver.StreamRequestHandler):
+    """The few commands of the Redis protocol used by the cache, over plain dicts."""
+
+    def handle(self) -> None:
+        store: dict[bytes, dict[bytes, bytes]] = self.server.store
+
+        while line := self.rfile.readline():
+            args = []
+            for _ in range(int(line[1:])):
+                size = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(size + 2)[:-2])
+
+            command, *args = args
+            self.server.commands.append(command)
+
+            if command == b"HGET":
+                value = store.get(args[0], {}).get(args[1])
+                reply = b"$-1\r\n" if value is None else self._bulk(value)
+            elif command == b"HSET":
+                store.setdefault(args[0], {})[args[1]] = args[2]
+                reply = b":1\r\n"
+            elif command == b"EXPIRE":
+                reply = b":1\r\n"
+            elif command == b"DEL":
+                reply = b":%d\r\n" % sum(store.pop(k, None) is not None for k in args)
+            else:
+                reply = b"-ERR unknown command\r\n"
+
+            self.wfile.write(reply)
+
+    @staticmethod
+    def _bulk(value: bytes) -> bytes:
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+@pytest.fixture
+def resp_server() -> Iterator[socketserver.ThreadingTCPServer]:
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _RespStandIn)
+    server.daemon_threads = True
+    server.store, server.commands = {}, []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_redis_cache(resp_server):
+    host, port = resp_server.server_address
+    cache = RedisResponseCache(f"redis://{host}:{port}/0", prefix="test:")
+
+    assert cache.get("owner:1", "20:") is None
+
+    cache.set("owner:1", b"page\r\n1", "20:")
+    cache.set("article:1", b"article")
+
+    assert cache.get("owner:1", "20:") == b"page\r\n1"
+    assert resp_server.store[b"test:article:1"] == {b"": b"article"}
+
+    cache.delete("owner:1", "article:1")
+
+    assert cache.get("owner:1", "20:") is None
+    assert resp_server.store == {}
+    assert b"EXPIRE" in resp_server.commands
+
+
+def test_redis_cache_unavailable_misses(resp_server):
+    host, port = resp_server.server_address
+    resp_server.shutdown()
+    resp_server.server_close()
+    cache = RedisResponseCache(f"redis://{host}:{port}/0")
+
+    cache.set("a", b"a")
+    cache.delete("a")
+
+    assert cache.get("a") is None
+
+
+def test_resp_client_raises_error_replies(resp_server):
+    host, port = resp_server.server_address
+    client = RespClient(f"redis://{host}:{port}")
+
+    with pytest.raises(ConnectionError, match="unknown command"):
+        client.execute("FLUSHALL")
+
+    assert client.execute("DEL", "missing") == 0
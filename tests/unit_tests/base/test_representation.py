@@ -0,0 +1,47 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from app.base.representation import Representation
+
+
+def make_record(updated_at: datetime) -> SimpleNamespace:
+    return SimpleNamespace(id=1, updated_at=updated_at)
+
+
+def test_record_etag_follows_updates():
+    updated_at = datetime(2024, 12, 1, 10, 0, 0, 1, tzinfo=UTC)
+    first = Representation.of_record(make_record(updated_at), bytes)
+
+    same = Representation.of_record(make_record(updated_at), bytes)
+    updated = Representation.of_record(
+        make_record(updated_at.replace(microsecond=2)), bytes
+    )
+    renamed = Representation.of_record(make_record(updated_at), bytes, "editor")
+
+    assert first.etag == same.etag
+    assert len({first.etag, updated.etag, renamed.etag}) == 3
+    assert first.last_modified == updated_at
+
+
+def test_content_etag():
+    assert (
+        Representation.of_content(b"[]").etag == Representation.of_content(b"[]").etag
+    )
+    assert (
+        Representation.of_content(b"[]").etag != Representation.of_content(b"{}").etag
+    )
+
+
+def test_pack_round_trip():
+    updated_at = datetime(2024, 12, 1, 10, 0, 0, 1, tzinfo=UTC)
+    body = b'{"body":"line\\nbreak"}\n'
+
+    for representation in (
+        Representation.of_record(make_record(updated_at), lambda: body),
+        Representation.of_content(body),
+    ):
+        unpacked = Representation.unpack(representation.pack())
+
+        assert unpacked.etag == representation.etag
+        assert unpacked.last_modified == representation.last_modified
+        assert unpacked.encode() == body
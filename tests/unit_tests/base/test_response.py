@@ -0,0 +1,157 @@
+import gzip
+import json
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask, request
+
+from app.articles.dto import ArticleReadDTO
+from app.base.representation import Representation
+from app.base.dto import ExportFormat
+from app.base.response import (
+    ExportStreamResponse,
+    JsonArrayStreamResponse,
+    conditional_response,
+)
+
+
+def make_article(id_: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=id_,
+        title=f"Article {id_}",
+        body="Body",
+        owner_id=1,
+        created_at=datetime(2024, 12, 1, tzinfo=UTC),
+    )
+
+
+def test_json_array_stream_response_emits_chunks(test_app: Flask):
+    chunks = [[make_article(1), make_article(2)], [], [make_article(3)]]
+
+    @test_app.get("/articles")
+    def articles():
+        return JsonArrayStreamResponse(ArticleReadDTO, iter(chunks))
+
+    response = test_app.test_client().get("/articles", buffered=False)
+    parts = list(response.response)
+    response.close()
+
+    assert parts[0] == b"["
+    assert parts[-1] == b"]"
+    assert len(parts) == 4
+    assert [a["id"] for a in json.loads(b"".join(parts))] == [1, 2, 3]
+
+
+def test_json_array_stream_response_without_rows(test_app: Flask):
+    @test_app.get("/articles")
+    def articles():
+        return JsonArrayStreamResponse(ArticleReadDTO, iter([]))
+
+    response = test_app.test_client().get("/articles")
+
+    assert response.get_json() == []
+    assert response.mimetype == "application/json"
+
+
+@pytest.fixture
+def article_app(test_app: Flask) -> tuple[Flask, MagicMock]:
+    encode = MagicMock(return_value=b'{"id":1}')
+    updated_at = datetime(2024, 12, 1, 10, 30, 15, 123456, tzinfo=UTC)
+
+    @test_app.get("/articles/1")
+    def article():
+        return conditional_response(Representation("abc", updated_at, encode))
+
+    return test_app, encode
+
+
+def test_conditional_response_sends_validators(article_app):
+    app, encode = article_app
+
+    response = app.test_client().get("/articles/1")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"id": 1}
+    assert response.headers["ETag"] == 'W/"abc"'
+    assert response.headers["Last-Modified"] == "Sun, 01 Dec 2024 10:30:15 GMT"
+    assert response.headers["Cache-Control"] == "no-cache"
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"If-None-Match": 'W/"abc"'},
+        {"If-None-Match": '"other", "abc"'},
+        {"If-Modified-Since": "Sun, 01 Dec 2024 10:30:15 GMT"},
+    ],
+)
+def test_conditional_response_not_modified(article_app, headers: dict):
+    app, encode = article_app
+
+    response = app.test_client().get("/articles/1", headers=headers)
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == 'W/"abc"'
+    encode.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"If-None-Match": 'W/"other"'},
+        {"If-Modified-Since": "Sun, 01 Dec 2024 10:30:14 GMT"},
+        # The ETag wins over the date
+        {
+            "If-None-Match": 'W/"other"',
+            "If-Modified-Since": "Sun, 01 Dec 2024 10:30:15 GMT",
+        },
+    ],
+)
+def test_conditional_response_modified(article_app, headers: dict):
+    app, encode = article_app
+
+    response = app.test_client().get("/articles/1", headers=headers)
+
+    assert response.status_code == 200
+    encode.assert_called_once()
+
+
+@pytest.fixture
+def export_app(test_app: Flask) -> Flask:
+    chunks = [[make_article(1), make_article(2)], [make_article(3)]]
+
+    @test_app.get("/articles/export")
+    def articles():
+        export_format = ExportFormat(request.args.get("format", "ndjson"))
+        return ExportStreamResponse(
+            ArticleReadDTO, iter(chunks), export_format, "articles"
+        )
+
+    return test_app
+
+
+def test_export_stream_response_ndjson(export_app: Flask):
+    response = export_app.test_client().get("/articles/export")
+
+    assert response.mimetype == "application/x-ndjson"
+    assert response.content_encoding is None
+    assert response.headers["Content-Disposition"] == (
+        'attachment; filename="articles.ndjson"'
+    )
+    assert [json.loads(line)["id"] for line in response.data.splitlines()] == [1, 2, 3]
+
+
+def test_export_stream_response_csv_gzip(export_app: Flask):
+    response = export_app.test_client().get(
+        "/articles/export?format=csv", headers={"Accept-Encoding": "gzip, br"}
+    )
+    lines = gzip.decompress(response.data).decode().splitlines()
+
+    assert response.mimetype == "text/csv"
+    assert response.content_encoding == "gzip"
+    assert "Accept-Encoding" in response.vary
+    assert lines[0] == "title,body,id,owner_id,created_at"
+    assert [line.split(",")[2] for line in lines[1:]] == ["1", "2", "3"]
@@ -0,0 +1,83 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, literal, select
+
+from app.articles.dto import ArticleReadDTO, ArticlesPageReadDTO
+from app.base.serialization import dump_trusted, dump_trusted_csv, dump_trusted_lines
+from app.db.pagination import Page
+from app.rbac.dto import RolesWithPermsListReadDTO
+from app.users.dto import UsersPageReadDTO
+
+
+def make_article(id_: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=id_,
+        title=f"Article {id_}",
+        body="Body",
+        owner_id=1,
+        created_at=datetime(2024, 12, 1, 10, 30, tzinfo=UTC),
+    )
+
+
+def test_dump_trusted_matches_validated_dto():
+    page = Page([make_article(1), make_article(2)], "next")
+
+    assert dump_trusted(ArticlesPageReadDTO, page) == (
+        ArticlesPageReadDTO.model_validate(page).model_dump_json().encode()
+    )
+
+
+def test_dump_trusted_applies_before_validators():
+    role = SimpleNamespace(name="editor")
+    user = SimpleNamespace(id=1, username="andry", email="andry@mail.com", role=role)
+    page = Page([user], None)
+
+    assert dump_trusted(UsersPageReadDTO, page) == (
+        UsersPageReadDTO.model_validate(page).model_dump_json().encode()
+    )
+
+
+def test_dump_trusted_root_model_with_nested_collections():
+    permission = SimpleNamespace(id=1, name="articles.can_create")
+    roles = [SimpleNamespace(id=1, name="admin", permissions=(permission,))]
+
+    assert dump_trusted(RolesWithPermsListReadDTO, roles) == (
+        b'[{"id":1,"name":"admin","permissions":[{"id":1,"name":"articles.can_create"}]}]'
+    )
+
+
+def test_dump_trusted_core_row():
+    article = make_article(1)
+    article.created_at = article.created_at.replace(tzinfo=None)  # sqlite drops it
+    query = select(
+        *(literal(getattr(article, name)).label(name) for name in vars(article))
+    )
+
+    with create_engine("sqlite://").connect() as connection:
+        row = connection.execute(query).one()
+
+    assert dump_trusted(ArticleReadDTO, row) == dump_trusted(ArticleReadDTO, article)
+
+
+def test_dump_trusted_lines():
+    lines = dump_trusted_lines(ArticleReadDTO, [make_article(1), make_article(2)])
+
+    assert lines.splitlines() == [
+        dump_trusted(ArticleReadDTO, make_article(1)),
+        dump_trusted(ArticleReadDTO, make_article(2)),
+    ]
+    assert lines.endswith(b"\n")
+
+
+def test_dump_trusted_csv():
+    article = make_article(1)
+    article.body = 'Body, with "quotes"\nand lines'
+
+    csv = dump_trusted_csv(ArticleReadDTO, [article], header=True)
+
+    assert csv == (
+        b"title,body,id,owner_id,created_at\r\n"
+        b'Article 1,"Body, with ""quotes""\nand lines",1,1,2024-12-01T10:30:00Z\r\n'
+    )
+    assert dump_trusted_csv(ArticleReadDTO, []) == b""
@@ -0,0 +1,31 @@
+from app.base.version import ChangeVersion, CompositeVersion
+
+
+def test_version_is_unknown_until_advanced():
+    version = ChangeVersion()
+
+    assert version.current == 0
+
+    version.advance_to(5)
+    assert version.current == 5
+
+
+def test_advance_to_never_moves_backwards():
+    version = ChangeVersion()
+    version.advance_to(10)
+
+    version.advance_to(9)
+    assert version.current == 10
+
+    version.advance_to(11)
+    assert version.current == 11
+
+
+def test_composite_version_follows_latest():
+    first, second = ChangeVersion(), ChangeVersion()
+    composite = CompositeVersion(first, second)
+
+    first.advance_to(3)
+    second.advance_to(7)
+
+    assert composite.current == 7
@@ -0,0 +1,26 @@
+from datetime import UTC, datetime
+
+from app.db.copy import CopyStream, copy_line
+
+
+def test_copy_line_escapes_values():
+    line = copy_line(
+        ["a\tb\nc\\d\r", None, True, b"\x00\xff", 7, datetime(2024, 12, 1, tzinfo=UTC)]
+    )
+
+    assert line == (
+        "a\\tb\\nc\\\\d\\r\t\\N\tt\t\\\\x00ff\t7\t2024-12-01T00:00:00+00:00\n"
+    )
+
+
+def test_copy_stream_reads_rows_in_chunks():
+    rows = ((i, f"row {i}") for i in range(100))
+    stream = CopyStream(rows)
+
+    chunks = []
+    while chunk := stream.read(64):
+        assert len(chunk) <= 64
+        chunks.append(chunk)
+
+    assert b"".join(chunks) == b"".join(f"{i}\trow {i}\n".encode() for i in range(100))
+    assert stream.rows == 100
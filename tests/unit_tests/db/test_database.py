@@ -0,0 +1,107 @@
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+import pytest
+
+from app.db.database import Database
+
+
+@pytest.fixture
+def sessions() -> list[MagicMock]:
+    return []
+
+
+@pytest.fixture
+def session_maker(sessions: list[MagicMock]) -> MagicMock:
+    def make_session() -> MagicMock:
+        sessions.append(MagicMock(is_active=True))
+        return sessions[-1]
+
+    return MagicMock(side_effect=make_session)
+
+
+@pytest.fixture
+def db(session_maker: MagicMock) -> Database:
+    with (
+        patch("app.db.database.create_engine"),
+        patch("app.db.database.sessionmaker", return_value=session_maker),
+    ):
+        yield Database(MagicMock(DATABASE_URL="postgresql://"))
+
+
+@pytest.fixture
+def app(db: Database) -> Flask:
+    app = Flask(__name__)
+    db.init_app(app)
+
+    @app.get("/ok")
+    def ok():
+        with db.session() as first, db.session() as second:
+            assert first is second
+        return "ok", 200
+
+    @app.get("/bad")
+    def bad():
+        with db.session():
+            pass
+        return "bad", 400
+
+    return app
+
+
+def test_session_without_unit_of_work_is_short_lived(
+    db: Database, session_maker: MagicMock
+):
+    with db.session():
+        pass
+    with db.session():
+        pass
+
+    assert session_maker.call_count == 2
+
+
+def test_unit_of_work_shares_session_and_commits(
+    db: Database, session_maker: MagicMock
+):
+    with db.unit_of_work():
+        with db.session() as first, db.session() as second:
+            assert first is second
+
+    assert session_maker.call_count == 1
+    first.commit.assert_called_once()
+    first.close.assert_called_once()
+
+
+def test_unit_of_work_rolls_back_on_error(db: Database):
+    with pytest.raises(RuntimeError):
+        with db.unit_of_work():
+            with db.session() as session:
+                raise RuntimeError
+
+    session.rollback.assert_called_once()
+    session.commit.assert_not_called()
+
+
+def test_unit_of_work_is_lazy(db: Database, session_maker: MagicMock):
+    with db.unit_of_work():
+        pass
+
+    session_maker.assert_not_called()
+
+
+def test_request_commits_on_success(app: Flask, sessions: list[MagicMock]):
+    response = app.test_client().get("/ok")
+
+    assert response.status_code == 200
+    assert len(sessions) == 1
+    sessions[0].commit.assert_called_once()
+    sessions[0].close.assert_called_once()
+
+
+def test_request_rolls_back_on_error_status(app: Flask, sessions: list[MagicMock]):
+    response = app.test_client().get("/bad")
+
+    assert response.status_code == 400
+    sessions[0].rollback.assert_called_once()
+    sessions[0].commit.assert_not_called()
+    sessions[0].close.assert_called_once()
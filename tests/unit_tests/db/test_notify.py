@@ -0,0 +1,67 @@
+import os
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.db.notify import NotificationListener
+
+
+class FakeConnection:
+    """Stands in for a psycopg2 connection, readable once, then dropped."""
+
+    def __init__(self, channel: str, payload: str) -> None:
+        self._read, write = os.pipe()
+        os.write(write, b"x")
+        os.close(write)
+        self.notifies = [SimpleNamespace(channel=channel, payload=payload)]
+        self.cursor = MagicMock()
+        self.polls = 0
+        self.closed = False
+
+    def fileno(self) -> int:
+        return self._read
+
+    def poll(self) -> None:
+        self.polls += 1
+        if self.polls > 1:
+            raise ConnectionError("connection dropped")
+
+    def close(self) -> None:
+        os.close(self._read)
+        self.closed = True
+
+
+def test_listener_dispatches_payloads_and_signals_reconnect():
+    received = []
+    done = threading.Event()
+    connections: list[FakeConnection] = []
+
+    def connect() -> FakeConnection:
+        connections.append(FakeConnection("rbac_changes", "7"))
+        return connections[-1]
+
+    def handler(payload: str | None) -> None:
+        received.append(payload)
+        if len(received) == 4:
+            done.set()
+
+    listener = NotificationListener(connect, poll_timeout=0.01, retry_delay=0.01)
+    listener.subscribe("rbac_changes", handler)
+    listener.subscribe("users_changes", MagicMock())
+    listener.start()
+    assert done.wait(timeout=5)
+    listener.stop()
+
+    assert received[:4] == [None, "7", None, "7"]
+    assert all(connection.closed for connection in connections)
+
+
+def test_failing_handler_does_not_stop_others():
+    listener = NotificationListener(MagicMock())
+    failing, working = MagicMock(side_effect=RuntimeError), MagicMock()
+    listener.subscribe("users_changes", failing)
+    listener.subscribe("users_changes", working)
+
+    listener._dispatch("users_changes", "{}")
+
+    working.assert_called_once_with("{}")
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.articles.dto import ArticleReadDTO
+from app.articles.models import Article
+from app.base.dto import PageDTO
+from app.db.exceptions import InvalidCursor
+from app.db.pagination import JsonPage, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 12, 1, 10, 30, 15, 123456, tzinfo=timezone.utc)
+    keys = [Article.created_at, Article.id]
+
+    cursor = encode_cursor([created_at, 42])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, keys) == (created_at, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "%%%",
+        encode_cursor([1]),
+        encode_cursor(["not a date", 1]),
+        encode_cursor(["2024-12-01T00:00:00+00:00", None]),
+    ],
+)
+def test_invalid_cursor(cursor: str):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, [Article.created_at, Article.id])
+
+
+@pytest.mark.parametrize("next_cursor", [None, "abc"])
+def test_json_page_matches_page_dto(next_cursor: str | None):
+    article = ArticleReadDTO(
+        id=1,
+        title="Title",
+        body="Body \u00e9",
+        owner_id=2,
+        created_at=datetime(2024, 12, 1, tzinfo=timezone.utc),
+    )
+    items = article.model_dump_json()
+
+    page = JsonPage(f"[{items}]", next_cursor)
+
+    assert (
+        page.to_json()
+        == PageDTO[ArticleReadDTO](items=[article], next_cursor=next_cursor)
+        .model_dump_json()
+        .encode()
+    )
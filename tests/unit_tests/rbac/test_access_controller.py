@@ -1,14 +1,17 @@
+import threading
 from unittest.mock import MagicMock
 
 from flask import Flask
 import pytest
 
+from app.base.version import ChangeVersion
 from app.rbac.rbac import RoleBasedAccessController
 
 
 class User:
-    def __init__(self, id: int):
+    def __init__(self, id: int, role: str = "editor"):
         self.id = id
+        self.role = role
 
 
 class MockSupportsGetCurrentUser:
@@ -16,8 +19,8 @@ class MockSupportsGetCurrentUser:
         pass
 
 
-class MockSupportsPermissionCheck:
-    def user_has_permission(self, user_id: int, permission: str) -> bool:
+class MockSupportsRolePermissions:
+    def get_permission_names(self, role_name: str) -> frozenset[str]:
         pass
 
 
@@ -28,15 +31,23 @@ def mock_current_user_getter():
 
 @pytest.fixture
 def mock_permission_checker():
-    return MagicMock(MockSupportsPermissionCheck)
+    return MagicMock(MockSupportsRolePermissions)
+
+
+@pytest.fixture
+def rbac_version() -> ChangeVersion:
+    return ChangeVersion()
 
 
 @pytest.fixture
 def access_controller(
     mock_current_user_getter: RoleBasedAccessController,
     mock_permission_checker: MagicMock,
+    rbac_version: ChangeVersion,
 ):
-    return RoleBasedAccessController(mock_current_user_getter, mock_permission_checker)
+    return RoleBasedAccessController(
+        mock_current_user_getter, mock_permission_checker, rbac_version
+    )
 
 
 def test_permission_required_authenticated_and_authorized(
@@ -47,7 +58,9 @@ def test_permission_required_authenticated_and_authorized(
     user = User(id=1)
     permission_name = "users.can_update"
     mock_current_user_getter.get_current_user.return_value = user
-    mock_permission_checker.user_has_permission.return_value = True
+    mock_permission_checker.get_permission_names.return_value = frozenset(
+        {permission_name}
+    )
 
     @access_controller.permission_required(permission_name)
     def mock_route(*args, **kwargs):
@@ -58,9 +71,7 @@ def test_permission_required_authenticated_and_authorized(
     assert result == "ok"
     assert status_code == 200
     mock_current_user_getter.get_current_user.assert_called_once()
-    mock_permission_checker.user_has_permission.assert_called_once_with(
-        user.id, permission_name
-    )
+    mock_permission_checker.get_permission_names.assert_called_once_with(user.role)
 
 
 def test_permission_required_not_authenticated(
@@ -91,7 +102,7 @@ def test_permission_required_not_authorized(
     user = User(id=1)
     permission_name = "articles.can_delete"
     mock_current_user_getter.get_current_user.return_value = user
-    mock_permission_checker.user_has_permission.return_value = False
+    mock_permission_checker.get_permission_names.return_value = frozenset()
 
     @access_controller.permission_required(permission_name)
     def mock_route(*args, **kwargs):
@@ -103,6 +114,89 @@ def test_permission_required_not_authorized(
     assert status_code == 403
     assert response.json == {"error": "Permission denied"}
     mock_current_user_getter.get_current_user.assert_called_once()
-    mock_permission_checker.user_has_permission.assert_called_once_with(
-        user.id, permission_name
+    mock_permission_checker.get_permission_names.assert_called_once_with(user.role)
+
+
+def test_role_permissions_are_cached(
+    access_controller: RoleBasedAccessController,
+    mock_permission_checker: MagicMock,
+):
+    mock_permission_checker.get_permission_names.return_value = frozenset(
+        {"articles.can_create"}
+    )
+
+    assert access_controller.role_has_permission("editor", "articles.can_create")
+    assert not access_controller.role_has_permission("editor", "users.can_delete")
+
+    mock_permission_checker.get_permission_names.assert_called_once_with("editor")
+
+
+def test_role_permissions_cache_invalidated_on_version_change(
+    access_controller: RoleBasedAccessController,
+    mock_permission_checker: MagicMock,
+    rbac_version: ChangeVersion,
+):
+    mock_permission_checker.get_permission_names.return_value = frozenset()
+    assert not access_controller.role_has_permission("editor", "articles.can_create")
+
+    mock_permission_checker.get_permission_names.return_value = frozenset(
+        {"articles.can_create"}
+    )
+    rbac_version.advance_to(rbac_version.current + 1)
+
+    assert access_controller.role_has_permission("editor", "articles.can_create")
+    assert mock_permission_checker.get_permission_names.call_count == 2
+
+
+def test_role_mask_compiled_once_for_all_routes(
+    access_controller: RoleBasedAccessController,
+    mock_current_user_getter: MagicMock,
+    mock_permission_checker: MagicMock,
+):
+    mock_current_user_getter.get_current_user.return_value = User(id=1)
+    mock_permission_checker.get_permission_names.return_value = frozenset(
+        {"articles.can_create", "articles.can_update"}
     )
+
+    @access_controller.permission_required("articles.can_create")
+    def create_route():
+        return "created", 201
+
+    @access_controller.permission_required("articles.can_update")
+    def update_route():
+        return "updated", 200
+
+    assert create_route() == ("created", 201)
+    assert update_route() == ("updated", 200)
+    mock_permission_checker.get_permission_names.assert_called_once_with("editor")
+
+
+def test_mask_loaded_before_concurrent_change_is_not_cached(
+    access_controller: RoleBasedAccessController,
+    mock_permission_checker: MagicMock,
+    rbac_version: ChangeVersion,
+):
+    loading, change_committed = threading.Event(), threading.Event()
+
+    def load_stale_names(role_name: str) -> frozenset[str]:
+        if role_name == "viewer":
+            return frozenset()
+        loading.set()
+        change_committed.wait(timeout=5)
+        return frozenset({"articles.can_delete"})
+
+    mock_permission_checker.get_permission_names.side_effect = load_stale_names
+    stale_check = threading.Thread(target=access_controller.role_mask, args=("editor",))
+    stale_check.start()
+    assert loading.wait(timeout=5)
+
+    # The permission is revoked and another request already sees the new version
+    rbac_version.advance_to(rbac_version.current + 1)
+    access_controller.role_mask("viewer")
+    change_committed.set()
+    stale_check.join(timeout=5)
+
+    mock_permission_checker.get_permission_names.side_effect = None
+    mock_permission_checker.get_permission_names.return_value = frozenset()
+
+    assert not access_controller.role_has_permission("editor", "articles.can_delete")
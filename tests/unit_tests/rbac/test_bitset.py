@@ -0,0 +1,24 @@
+from app.rbac.bitset import PermissionRegistry
+
+
+def test_each_permission_gets_own_bit():
+    registry = PermissionRegistry()
+
+    create = registry.bit("articles.can_create")
+    delete = registry.bit("articles.can_delete")
+
+    assert create != delete
+    assert create & delete == 0
+    assert registry.bit("articles.can_create") == create
+
+
+def test_mask_contains_only_given_permissions():
+    registry = PermissionRegistry()
+    update_bit = registry.bit("users.can_update")
+
+    mask = registry.mask(["articles.can_create", "articles.can_delete"])
+
+    assert mask & registry.bit("articles.can_create")
+    assert mask & registry.bit("articles.can_delete")
+    assert not mask & update_bit
+    assert registry.mask([]) == 0
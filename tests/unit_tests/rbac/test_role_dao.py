@@ -67,14 +67,14 @@ def test_create_role(
 ):
     mock_session = MagicMock()
     role_dao._sf.return_value.__enter__.return_value = mock_session
-
-    mock_session.add.return_value = None
-    mock_session.commit.return_value = None
+    mock_session.scalars.return_value.one.return_value = mock_role
 
     result = role_dao.create(**mock_role_create_data)
 
-    mock_session.add.assert_called_once()
-    mock_session.commit.assert_called_once()
+    (stmt,), _ = mock_session.scalars.call_args
+    assert str(stmt).startswith("INSERT INTO roles (name) VALUES (:name) RETURNING")
+    mock_session.commit.assert_not_called()
+    mock_session.refresh.assert_not_called()
     assert result.name == mock_role.name
 
 
@@ -92,7 +92,7 @@ def test_add_permission_success(role_dao: RoleDAO):
     mock_session.merge.assert_any_call(role)
     mock_session.merge.assert_any_call(permission)
     mock_session.refresh.assert_called_once_with(role, attribute_names=["permissions"])
-    mock_session.commit.assert_called_once()
+    mock_session.flush.assert_called_once()
 
 
 def test_remove_permission_success(role_dao: RoleDAO):
@@ -110,4 +110,4 @@ def test_remove_permission_success(role_dao: RoleDAO):
     mock_session.merge.assert_any_call(role)
     mock_session.merge.assert_any_call(permission)
     mock_session.refresh.assert_called_once_with(role, attribute_names=["permissions"])
-    mock_session.commit.assert_called_once()
+    mock_session.flush.assert_called_once()
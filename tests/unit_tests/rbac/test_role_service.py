@@ -3,6 +3,8 @@ from unittest.mock import MagicMock
 import pytest
 from sqlalchemy.exc import IntegrityError
 
+from app.base.version import ChangeVersion
+from app.rbac import RBAC_CHANGES_CHANNEL
 from app.rbac.exceptions import PermissionNotFound, RoleNotFound, RoleAlreadyExists
 from app.rbac.services.role import RoleService
 from app.rbac.dao.role import RoleDAO
@@ -15,6 +17,7 @@ def role_service() -> RoleService:
         role_dao=MagicMock(RoleDAO),
         perm_dao=MagicMock(PermissionDAO),
         base_roles=set(),
+        rbac_version=MagicMock(ChangeVersion),
         default_role="viewer",
     )
 
@@ -113,37 +116,43 @@ def test_update_role_success(
         mock_role_read.id,
         **mock_role_create_data,
     )
+    role_service._role_dao.publish_change.assert_called_once_with(
+        RBAC_CHANGES_CHANNEL, role_service._rbac_version
+    )
 
 
 def test_update_role_not_found(role_service: RoleService, mock_role_create_data: dict):
     role_id = 999
-    role_service._role_dao.get_one.return_value = None
+    role_service._role_dao.update.return_value = None
 
     with pytest.raises(RoleNotFound):
         role_service.update_role(role_id, mock_role_create_data)
 
-    role_service._role_dao.get_one.assert_called_once_with(
-        role_id, load_permissions=True
-    )
+    role_service._role_dao.get_one.assert_not_called()
+    role_service._role_dao.publish_change.assert_not_called()
 
 
 def test_delete_role_success(role_service: RoleService):
     role_id = 1
-    role_service._role_dao.get_one.return_value = MagicMock(id=role_id)
+    role_service._role_dao.delete.return_value = MagicMock(id=role_id)
 
     role_service.delete_role(role_id)
 
     role_service._role_dao.delete.assert_called_once_with(role_id)
+    role_service._role_dao.publish_change.assert_called_once_with(
+        RBAC_CHANGES_CHANNEL, role_service._rbac_version
+    )
 
 
 def test_delete_role_not_found(role_service: RoleService):
     role_id = 999
-    role_service._role_dao.get_one.return_value = None
+    role_service._role_dao.delete.return_value = None
 
     with pytest.raises(RoleNotFound):
         role_service.delete_role(role_id)
 
-    role_service._role_dao.get_one.assert_called_once_with(role_id)
+    role_service._role_dao.get_one.assert_not_called()
+    role_service._role_dao.publish_change.assert_not_called()
 
 
 def test_get_role_permissions_success(
@@ -211,3 +220,41 @@ def test_assign_permission_not_found(
         load_permissions=True,
     )
     role_service._perm_dao.get_one.assert_called_once_with(permission_id)
+    role_service._role_dao.publish_change.assert_not_called()
+
+
+def test_assign_permission_publishes_change(
+    role_service: RoleService, mock_role_read: MagicMock
+):
+    mock_role_read.permissions = [{"id": 3, "name": "users.can_delete"}]
+    role_service._role_dao.get_one.return_value = mock_role_read
+    role_service._role_dao.add_permission.return_value = mock_role_read
+
+    role_service.assign_permission_to_role(mock_role_read.id, 3)
+
+    role_service._role_dao.publish_change.assert_called_once_with(
+        RBAC_CHANGES_CHANNEL, role_service._rbac_version
+    )
+
+
+def test_remove_permission_publishes_change(
+    role_service: RoleService, mock_role_read: MagicMock
+):
+    mock_role_read.permissions = []
+    role_service._role_dao.get_one.return_value = mock_role_read
+    role_service._role_dao.remove_permission.return_value = mock_role_read
+
+    role_service.remove_permission_from_role(mock_role_read.id, 3)
+
+    role_service._role_dao.publish_change.assert_called_once_with(
+        RBAC_CHANGES_CHANNEL, role_service._rbac_version
+    )
+
+
+def test_get_permission_names(role_service: RoleService):
+    role_service._role_dao.get_permission_names.return_value = {"users.can_create"}
+
+    result = role_service.get_permission_names("admin")
+
+    assert result == frozenset({"users.can_create"})
+    role_service._role_dao.get_permission_names.assert_called_once_with("admin")
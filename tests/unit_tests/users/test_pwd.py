@@ -0,0 +1,106 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.users.exceptions import PwdHashingOverloaded
+from app.users.config import PwdSettings
+from app.users.pwd import Argon2idScheme, BcryptScheme, PwdHasher
+
+
+FAKE_BCRYPT_HASH = b"$2b$04$" + b"x" * 53
+
+
+@pytest.fixture
+def hasher() -> PwdHasher:
+    return PwdHasher(BcryptScheme(rounds=4), workers=1, max_pending=1)
+
+
+@pytest.fixture
+def argon2_scheme() -> Argon2idScheme:
+    pytest.importorskip("argon2")
+    return Argon2idScheme(time_cost=1, memory_cost=8, parallelism=1)
+
+
+def test_hash_and_verify(hasher: PwdHasher):
+    pwd_hash = hasher.hash("secret password")
+
+    assert pwd_hash.startswith(b"$2b$04$")
+    assert hasher.verify("secret password", pwd_hash)
+    assert not hasher.verify("wrong password", pwd_hash)
+
+
+def test_overloaded_when_all_slots_taken(hasher: PwdHasher):
+    release = threading.Event()
+    started = threading.Barrier(3)
+
+    def slow_checkpw(*args) -> bool:
+        release.wait(timeout=5)
+        return True
+
+    def verify_in_background() -> None:
+        started.wait()
+        hasher.verify("pwd", FAKE_BCRYPT_HASH)
+
+    with patch("app.users.pwd.bcrypt.checkpw", slow_checkpw):
+        threads = [threading.Thread(target=verify_in_background) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        started.wait()
+
+        deadline = time.monotonic() + 5
+        while hasher._slots._value:
+            assert time.monotonic() < deadline, "background hashes took no slots"
+            time.sleep(0.001)
+
+        with pytest.raises(PwdHashingOverloaded):
+            hasher.verify("pwd", FAKE_BCRYPT_HASH)
+
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    assert hasher._slots._value == 2
+
+
+def test_needs_rehash_when_cost_changes(hasher: PwdHasher):
+    pwd_hash = hasher.hash("secret password")
+
+    assert not hasher.needs_rehash(pwd_hash)
+
+    hasher.scheme = BcryptScheme(rounds=5)
+    assert hasher.needs_rehash(pwd_hash)
+
+
+def test_legacy_scheme_hash_verifies_and_needs_rehash(argon2_scheme: Argon2idScheme):
+    bcrypt_scheme = BcryptScheme(rounds=4)
+    hasher = PwdHasher(argon2_scheme, legacy_schemes=(bcrypt_scheme,))
+    old_hash = bcrypt_scheme.hash("secret password")
+
+    assert hasher.verify("secret password", old_hash)
+    assert hasher.needs_rehash(old_hash)
+
+    new_hash = hasher.hash("secret password")
+    assert new_hash.startswith(b"$argon2id$")
+    assert hasher.verify("secret password", new_hash)
+    assert not hasher.verify("wrong password", new_hash)
+    assert not hasher.needs_rehash(new_hash)
+
+
+def test_from_settings_keeps_bcrypt_for_verification(argon2_scheme: Argon2idScheme):
+    settings = PwdSettings(
+        PWD_HASH_SCHEME="argon2id",
+        PWD_ARGON2_TIME_COST=1,
+        PWD_ARGON2_MEMORY_COST=8,
+        PWD_ARGON2_PARALLELISM=1,
+    )
+
+    hasher = PwdHasher.from_settings(settings)
+
+    assert hasher.scheme.name == "argon2id"
+    assert hasher.verify("pwd", BcryptScheme(rounds=4).hash("pwd"))
+
+
+def test_unknown_hash_format_fails_verification(hasher: PwdHasher):
+    assert not hasher.verify("pwd", b"plain text")
@@ -1,9 +1,11 @@
+from types import SimpleNamespace
 from unittest.mock import patch
 
 from flask.testing import FlaskClient
 import pytest
 from flask import Flask, json
 
+from app.base.representation import Representation
 from app.users.exceptions import UserEmailAlreadyExists, UsernameAlreadyExists
 from app.users.services import UserService
 
@@ -40,7 +42,7 @@ def test_get_users_list_without_search(user_service: UserService, client: FlaskC
     mock_users = [{"id": 1, "name": "user1"}, {"id": 2, "name": "user2"}]
     mock_users_json = json.dumps(mock_users)
 
-    user_service.get_all_users.return_value = mock_users_json
+    user_service.get_all_users.return_value = mock_users_json.encode()
 
     response = client.get("/users")
 
@@ -58,13 +60,15 @@ def test_get_users_list_with_search(
 
     mock_users = [mock_user]
     mock_users_json = json.dumps(mock_users)
-    user_service.search_users_by_name.return_value = mock_users_json
+    user_service.search_users_by_name.return_value = mock_users_json.encode()
 
     response = client.get(f"/users?name={search_q}")
 
     assert response.status_code == 200
     assert response.json == mock_users
-    user_service.search_users_by_name.assert_called_once_with(search_q)
+    user_service.search_users_by_name.assert_called_once_with(
+        search_q, {"name": search_q}
+    )
 
 
 @patch("app.users.routes.user_service")
@@ -74,14 +78,17 @@ def test_get_user_by_id(
     mock_user: dict,
     mock_user_json: str,
 ):
-    user_service.get_user_by_id.return_value = mock_user_json
+    user_service.get_user.return_value = Representation(
+        "etag", None, lambda: mock_user_json.encode()
+    )
 
     response = client.get("/users/1")
 
     assert response.status_code == 200
     assert response.json == mock_user
+    assert response.headers["ETag"] == 'W/"etag"'
 
-    user_service.get_user_by_id.assert_called_once_with(1)
+    user_service.get_user.assert_called_once_with(1)
 
 
 @patch("app.users.routes.user_service")
@@ -159,3 +166,17 @@ def test_create_user_username_already_exists(
 
     assert response.status_code == 400
     assert response.json == {"error": "Username already exists"}
+
+
+@patch("app.users.routes.user_service")
+def test_export_users(user_service: UserService, client: FlaskClient):
+    user = SimpleNamespace(
+        id=1, username="andry", email="andry@example.com", role="viewer"
+    )
+    user_service.export_users.return_value = iter([[user]])
+
+    response = client.get("/users/export")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert json.loads(response.data) == vars(user)
@@ -1,9 +1,14 @@
+import json
+from datetime import UTC, datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
 from sqlalchemy.exc import IntegrityError
 
-from app.users.dto import UserLoginDTO
+from app.base.version import ChangeVersion
+from app.db.pagination import Page
+from app.users import USERS_CHANGES_CHANNEL
+from app.users.dto import UserLoginDTO, UserReadDTO
 from app.users.exceptions import (
     InvalidPassword,
     UserEmailAlreadyExists,
@@ -18,7 +23,7 @@ from app.users.dao import UserDAO
 def user_service() -> UserService:
     mock_dao = MagicMock(UserDAO)
     mock_role_getter = MagicMock(default_role_id=1)
-    return UserService(mock_dao, mock_role_getter)
+    return UserService(mock_dao, mock_role_getter, MagicMock(ChangeVersion))
 
 
 @pytest.fixture
@@ -56,6 +61,25 @@ def test_get_user_by_id_success(user_service: UserService, mock_user_read: Magic
     user_service._dao.get_one.assert_called_once_with(mock_user_read.id)
 
 
+def test_get_user_not_encoded_until_sent(user_service: UserService):
+    updated_at = datetime(2024, 12, 1, tzinfo=UTC)
+    user = MagicMock(id=1, username="andry", email="andry@example.com")
+    user.updated_at = updated_at
+    user.role.name = "viewer"
+    user_service._dao.get_one.return_value = user
+
+    with patch("app.users.services.dump_trusted") as dump:
+        representation = user_service.get_user(1)
+
+        dump.assert_not_called()
+
+    assert representation.last_modified == updated_at
+    assert json.loads(representation.encode())["role"] == "viewer"
+
+    user.role.name = "editor"
+    assert user_service.get_user(1).etag != representation.etag
+
+
 def test_get_user_by_id_not_found(user_service: UserService):
     user_id = 999
     user_service._dao.get_one.return_value = None
@@ -71,14 +95,15 @@ def test_get_all_users_success(user_service: UserService) -> None:
         MagicMock(id=1, username="user1", email="user1@example.com", role="viewer"),
         MagicMock(id=2, username="user2", email="user2@example.com", role="viewer"),
     ]
-    user_service._dao.get_all.return_value = mock_users
+    user_service._dao.get_page.return_value = Page(mock_users, None)
 
-    result = user_service.get_all_users()
+    result = json.loads(user_service.get_all_users({}))
 
-    assert len(result.root) == 2
-    assert result.root[0].username == mock_users[0].username
-    assert result.root[1].username == mock_users[1].username
-    user_service._dao.get_all.assert_called_once()
+    assert len(result["items"]) == 2
+    assert result["items"][0]["username"] == mock_users[0].username
+    assert result["items"][1]["username"] == mock_users[1].username
+    assert result["next_cursor"] is None
+    user_service._dao.get_page.assert_called_once_with(20, None, UserReadDTO)
 
 
 def test_search_users_by_name_success(user_service: UserService) -> None:
@@ -87,14 +112,31 @@ def test_search_users_by_name_success(user_service: UserService) -> None:
         MagicMock(id=1, username="testuser1", email="test1@email.com", role="viewer"),
         MagicMock(id=2, username="testuser2", email="test@2email.com", role="viewer"),
     ]
-    user_service._dao.search_by_name.return_value = mock_users
+    user_service._dao.search_by_name.return_value = Page(mock_users, "cursor")
+
+    result = json.loads(
+        user_service.search_users_by_name(search_name, {"cursor": "abc"})
+    )
+
+    assert len(result["items"]) == 2
+    assert result["items"][0]["username"] == "testuser1"
+    assert result["items"][1]["username"] == "testuser2"
+    assert result["next_cursor"] == "cursor"
+    user_service._dao.search_by_name.assert_called_once_with(
+        search_name, 20, "abc", UserReadDTO
+    )
+
+
+def test_search_users_by_name_fuzzy(user_service: UserService) -> None:
+    user_service._dao.search_by_name_fuzzy.return_value = Page([], None)
 
-    result = user_service.search_users_by_name(search_name)
+    result = json.loads(user_service.search_users_by_name("andyr", {"fuzzy": "1"}))
 
-    assert len(result.root) == 2
-    assert result.root[0].username == "testuser1"
-    assert result.root[1].username == "testuser2"
-    user_service._dao.search_by_name.assert_called_once_with(search_name)
+    assert result["items"] == []
+    user_service._dao.search_by_name_fuzzy.assert_called_once_with(
+        "andyr", 20, None, UserReadDTO
+    )
+    user_service._dao.search_by_name.assert_not_called()
 
 
 def test_create_user_success(
@@ -106,6 +148,7 @@ def test_create_user_success(
 
     assert result.username == mock_user_read.username
     assert result.email == mock_user_read.email
+    assert user_service._dao.create.call_args.args == (UserReadDTO,)
 
 
 def test_create_user_email_exists(
@@ -149,68 +192,90 @@ def test_update_user_success(
 
     assert result.username == mock_user_read.username
     assert result.email == mock_user_read.email
+    assert user_service._dao.update.call_args.args == (mock_user_read.id, UserReadDTO)
+    user_service._dao.get_one.assert_not_called()
 
 
 def test_update_user_not_found(
     user_service: UserService, mock_user_create_data: dict
 ) -> None:
-    user_service._dao.get_one.return_value = None
+    user_service._dao.update.return_value = None
 
     with pytest.raises(UserNotFound):
         user_service.update_user(999, mock_user_create_data)
 
+    user_service._dao.publish_change.assert_not_called()
+
 
 def test_delete_user_success(user_service: UserService) -> None:
     user_id = 1
-    user_service._dao.get_one.return_value = MagicMock(id=1)
-    user_service._dao.delete.return_value = None
+    user_service._dao.delete.return_value = MagicMock(id=1)
 
     user_service.delete_user(user_id)
 
     user_service._dao.delete.assert_called_once_with(user_id)
+    user_service._dao.publish_change.assert_called_once_with(
+        USERS_CHANGES_CHANNEL, user_service._users_version
+    )
 
 
 def test_delete_user_not_found(user_service: UserService) -> None:
-    user_service._dao.get_one.return_value = None
+    user_service._dao.delete.return_value = None
 
     with pytest.raises(UserNotFound):
         user_service.delete_user(999)
 
+    user_service._dao.get_one.assert_not_called()
+    user_service._dao.publish_change.assert_not_called()
 
-@pytest.mark.parametrize(
-    "permission_name, is_access_granted",
-    (
-        ["articles.can_edit", True],
-        ["users.can_delete", False],
-    ),
-)
-def test_user_has_permission(
-    permission_name: str,
-    is_access_granted: bool,
-    user_service: UserService,
-    mock_user_read: MagicMock,
+
+def test_create_users_in_bulk(
+    user_service: UserService, mock_user_read: MagicMock, mock_user_create_data: dict
 ) -> None:
-    mock_role = MagicMock()
-    perm_edit = MagicMock()
-    perm_edit.name = "articles.can_edit"
-    perm_delete = MagicMock()
-    perm_delete.name = "articles.can_delete"
-    mock_role.permissions = [perm_edit, perm_delete]
+    user_service._dao.bulk_create.return_value = [mock_user_read]
 
-    mock_user_read.role = mock_role
-    user_service._dao.get_with_permissions.return_value = mock_user_read
+    result = user_service.create_users([{**mock_user_create_data, "role_id": None}])
 
-    result = user_service.user_has_permission(mock_user_read.id, permission_name)
+    assert result[0].username == mock_user_read.username
+    (rows, projection), _ = user_service._dao.bulk_create.call_args
+    assert projection is UserReadDTO
+    assert rows[0]["role_id"] == 1
+    assert "password" not in rows[0]
 
-    assert result == is_access_granted
-    user_service._dao.get_with_permissions.assert_called_once_with(mock_user_read.id)
 
+def test_create_users_field_exists(
+    user_service: UserService, mock_user_create_data: dict
+) -> None:
+    user_service._dao.bulk_create.side_effect = IntegrityError(
+        "Duplicate entry", None, "users_username_key"
+    )
 
-def test_user_has_permission_not_found(user_service: UserService) -> None:
-    user_service._dao.get_with_permissions.return_value = None
+    with pytest.raises(UsernameAlreadyExists):
+        user_service.create_users([mock_user_create_data])
+
+
+def test_update_users_not_found(
+    user_service: UserService, mock_user_read: MagicMock, mock_user_create_data: dict
+) -> None:
+    user_service._dao.bulk_update.return_value = [mock_user_read]
 
     with pytest.raises(UserNotFound):
-        user_service.user_has_permission(999, "articles.can_edit")
+        user_service.update_users(
+            {1: mock_user_create_data, 999: mock_user_create_data}
+        )
+
+    user_service._dao.publish_change.assert_not_called()
+
+
+def test_delete_users_publishes_change_once(user_service: UserService) -> None:
+    user_service._dao.bulk_delete.return_value = [MagicMock(), MagicMock()]
+
+    user_service.delete_users([1, 2])
+
+    user_service._dao.bulk_delete.assert_called_once_with([1, 2])
+    user_service._dao.publish_change.assert_called_once_with(
+        USERS_CHANGES_CHANNEL, user_service._users_version
+    )
 
 
 def test_get_by_credentials_success(
@@ -219,7 +284,10 @@ def test_get_by_credentials_success(
     creds = {"email": "andrymyzik@gmail.com", "password": "1234567890"}
     user_service._dao.get_by_email.return_value = mock_user_read
 
-    with patch.object(UserLoginDTO, "verify_pwd", return_value=None) as mock_pwd_check:
+    with (
+        patch.object(UserLoginDTO, "verify_pwd", return_value=None) as mock_pwd_check,
+        patch.object(UserLoginDTO, "upgraded_pwd_hash", return_value=None),
+    ):
         result = user_service.get_by_credentials(creds)
 
         mock_pwd_check.assert_called_once_with(mock_user_read.password_hash)
@@ -227,6 +295,24 @@ def test_get_by_credentials_success(
     assert result.username == mock_user_read.username
     assert result.email == mock_user_read.email
     user_service._dao.get_by_email.assert_called_once_with(creds["email"])
+    user_service._dao.update.assert_not_called()
+
+
+def test_get_by_credentials_upgrades_outdated_hash(
+    user_service: UserService, mock_user_read: MagicMock
+):
+    creds = {"email": "andrymyzik@gmail.com", "password": "1234567890"}
+    user_service._dao.get_by_email.return_value = mock_user_read
+
+    with (
+        patch.object(UserLoginDTO, "verify_pwd", return_value=None),
+        patch.object(UserLoginDTO, "upgraded_pwd_hash", return_value=b"new hash"),
+    ):
+        user_service.get_by_credentials(creds)
+
+    user_service._dao.update.assert_called_once_with(
+        mock_user_read.id, password_hash=b"new hash"
+    )
 
 
 def test_get_by_credentials_email_not_found(user_service: UserService) -> None: